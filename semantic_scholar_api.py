@@ -3,12 +3,359 @@ Semantic Scholar API Client
 Módulo para buscar artículos científicos usando la API oficial de Semantic Scholar
 """
 
+import copy
 import requests
+import threading
 import time
 from datetime import datetime
 import csv
 import os
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from collections.abc import Mapping
+from typing import List, Dict, Deque, Iterable, Iterator, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+
+from semantic_scholar_metrics import MetricasCliente
+from semantic_scholar_rate_limit import RateLimiter, parsear_retry_after
+from semantic_scholar_retry import (
+    ERRORES_TRANSITORIOS, CircuitBreaker, CircuitoAbierto, ErrorConexion, ErrorHTTP, ErrorLimiteTasa,
+    ErrorNoEncontrado, ErrorServidor, PoliticaReintentos, ResultadoParcial, error_http
+)
+
+
+# La búsqueda por relevancia (/paper/search) no pagina más allá de 1000 resultados
+MAX_RESULTADOS_RELEVANCIA = 1000
+
+# El endpoint POST /paper/batch acepta hasta 500 IDs por petición
+MAX_IDS_POR_LOTE = 500
+
+# Campos pedidos por defecto a cada endpoint
+CAMPOS_BUSQUEDA = [
+    'paperId', 'title', 'abstract', 'authors', 'year', 
+    'citationCount', 'url', 'venue', 'publicationDate',
+    'publicationTypes', 'fieldsOfStudy'
+]
+CAMPOS_AUTOR = [
+    'paperId', 'title', 'abstract', 'authors', 'year', 
+    'citationCount', 'url', 'venue', 'publicationDate'
+]
+# Incluye las listas completas de referencias y citas; procesar_articulo las descarta,
+# así que solo tiene sentido pedirlas leyendo la respuesta cruda
+CAMPOS_DETALLE = CAMPOS_BUSQUEDA + ['references', 'citations']
+
+# Conjuntos de campos predefinidos, utilizables en cualquier parámetro `campos`
+PRESETS_CAMPOS = {
+    'ids-only': ['paperId'],
+    'metadata': [
+        'paperId', 'title', 'authors', 'year', 'citationCount', 'url', 'venue',
+        'publicationDate', 'publicationTypes', 'fieldsOfStudy'
+    ],
+    'full': CAMPOS_BUSQUEDA,
+}
+
+# Campos de la API que necesita cada columna de salida (artículo normalizado, CSV o almacén)
+CAMPOS_POR_COLUMNA = {
+    'numero': [],
+    'fecha_extraccion': [],
+    'titulo': ['title'],
+    'enlace': ['url'],
+    'autores_info': ['authors', 'venue', 'year'],
+    'resumen': ['abstract'],
+    'citado_por': ['citationCount'],
+    'versiones': [],
+    'year': ['year'],
+    'venue': ['venue'],
+    'campos_estudio': ['fieldsOfStudy'],
+    'paper_id': [],
+    'citation_count': ['citationCount'],
+    'publication_date': ['publicationDate'],
+    'publication_types': ['publicationTypes'],
+}
+
+# Columnas de los CSV exportados (separados por |)
+COLUMNAS_CSV = [
+    'numero', 'titulo', 'autores_info', 'enlace', 'resumen', 
+    'citado_por', 'year', 'venue', 'campos_estudio', 'paper_id',
+    'citation_count', 'publication_date', 'publication_types',
+    'fecha_extraccion'
+]
+
+
+def rango_años(año_desde: Optional[int] = None, año_hasta: Optional[int] = None) -> Optional[str]:
+    """
+    Construye el filtro de años con la sintaxis de la API ('2020-2024', '2020-', '-2024')
+    
+    Args:
+        año_desde: Año mínimo de publicación (opcional)
+        año_hasta: Año máximo de publicación (opcional)
+        
+    Returns:
+        Cadena del rango, o None si no se especificó ningún límite
+    """
+    if año_desde is None and año_hasta is None:
+        return None
+    desde = año_desde if año_desde is not None else ''
+    hasta = año_hasta if año_hasta is not None else ''
+    return f"{desde}-{hasta}"
+
+
+def resolver_campos(campos, defecto: Optional[List[str]] = None) -> List[str]:
+    """
+    Calcula la lista mínima de `fields` a pedir a la API
+    
+    Acepta el nombre de un preset ('ids-only', 'metadata', 'full'), una lista de
+    columnas de salida (p. ej. COLUMNAS_CSV o un subconjunto como ['titulo', 'year'])
+    o una lista de campos de la API, que se pasan tal cual. paperId siempre se incluye.
+    
+    Args:
+        campos: Preset, columnas o campos (None = usar `defecto`)
+        defecto: Campos a usar si `campos` es None (default: CAMPOS_BUSQUEDA)
+        
+    Returns:
+        Lista de campos de la API sin duplicados
+    """
+    if campos is None:
+        campos = defecto if defecto is not None else CAMPOS_BUSQUEDA
+    if isinstance(campos, str):
+        if campos not in PRESETS_CAMPOS:
+            raise ValueError(f"Preset de campos desconocido: {campos} (opciones: {', '.join(PRESETS_CAMPOS)})")
+        campos = PRESETS_CAMPOS[campos]
+    
+    resultado = ['paperId']
+    for campo in campos:
+        for campo_api in CAMPOS_POR_COLUMNA.get(campo, [campo]):
+            if campo_api not in resultado:
+                resultado.append(campo_api)
+    return resultado
+
+
+# Rutas de la API sin ID y sub-recursos que pueden seguir al ID de un paper o autor
+_RUTAS_FIJAS = {
+    '/paper/search', '/paper/search/bulk', '/paper/search/match', '/paper/autocomplete',
+    '/paper/batch', '/author/search', '/author/batch'
+}
+_SUBRECURSOS = {
+    'paper': ('references', 'citations', 'authors'),
+    'author': ('papers',),
+}
+
+# Segmentos fijos de otras rutas; cualquier otro segmento es un ID
+_SEGMENTOS_FIJOS = {
+    'paper', 'author', 'search', 'bulk', 'batch', 'match', 'papers',
+    'references', 'citations', 'authors', 'autocomplete'
+}
+
+
+def plantilla_endpoint(ruta: str) -> str:
+    """
+    Reemplaza los IDs de una ruta por un marcador para agrupar peticiones por endpoint
+    
+    Ej: '/paper/649def34f8be52c8b66281af98ae884c09aef38b' -> '/paper/{id}'
+        '/paper/DOI:10.1038/nature14539/citations' -> '/paper/{id}/citations'
+    
+    Los IDs externos pueden contener '/' (DOI, ARXIV, URL), así que en las rutas
+    de /paper/ y /author/ todo lo que hay entre el recurso y un sub-recurso
+    conocido es un único ID.
+    
+    Args:
+        ruta: Ruta relativa a base_url
+        
+    Returns:
+        Ruta con los IDs sustituidos por {id}
+    """
+    ruta = '/' + ruta.strip('/')
+    if ruta in _RUTAS_FIJAS:
+        return ruta
+
+    recurso, _, resto = ruta[1:].partition('/')
+    if recurso in _SUBRECURSOS and resto:
+        for subrecurso in _SUBRECURSOS[recurso]:
+            if resto.endswith('/' + subrecurso):
+                return f"/{recurso}/{{id}}/{subrecurso}"
+        return f"/{recurso}/{{id}}"
+
+    partes = [p if p in _SEGMENTOS_FIJOS else '{id}' for p in ruta.split('/') if p]
+    return '/' + '/'.join(partes)
+
+
+# Filtros que cada endpoint aplica en el servidor (parámetro de la API);
+# el resto se aplican localmente con FiltrosBusqueda.cumple()
+FILTROS_SERVIDOR = {
+    '/paper/search': {'year', 'publicationDateOrYear', 'minCitationCount', 'venue',
+                      'fieldsOfStudy', 'publicationTypes', 'openAccessPdf'},
+    '/paper/search/bulk': {'year', 'publicationDateOrYear', 'minCitationCount', 'venue',
+                           'fieldsOfStudy', 'publicationTypes', 'openAccessPdf'},
+    '/author/{id}/papers': {'year'},
+}
+
+# Campos del paper que necesita cada filtro para aplicarse localmente
+CAMPOS_POR_FILTRO = {
+    'year': ['year'],
+    'publicationDateOrYear': ['publicationDate', 'year'],
+    'minCitationCount': ['citationCount'],
+    'venue': ['venue'],
+    'fieldsOfStudy': ['fieldsOfStudy'],
+    'publicationTypes': ['publicationTypes'],
+    'openAccessPdf': ['openAccessPdf'],
+}
+
+
+class FiltrosBusqueda:
+    """
+    Filtros de búsqueda que se envían como parámetros de la API
+
+    Cada endpoint aplica en el servidor los filtros que admite (FILTROS_SERVIDOR);
+    los demás se comprueban localmente sobre los papers crudos con cumple(),
+    pidiendo los campos necesarios (campos_locales()).
+    """
+
+    def __init__(self, año_desde: Optional[int] = None, año_hasta: Optional[int] = None,
+                 fecha_desde: Optional[str] = None, fecha_hasta: Optional[str] = None,
+                 min_citas: Optional[int] = None, venues: Optional[List[str]] = None,
+                 campos_estudio: Optional[List[str]] = None, tipos_publicacion: Optional[List[str]] = None,
+                 solo_acceso_abierto: bool = False):
+        """
+        Crea los filtros (todos opcionales)
+
+        Args:
+            año_desde: Año mínimo de publicación
+            año_hasta: Año máximo de publicación
+            fecha_desde: Fecha mínima de publicación ('AAAA-MM-DD', 'AAAA-MM' o 'AAAA')
+            fecha_hasta: Fecha máxima de publicación (mismo formato)
+            min_citas: Número mínimo de citas
+            venues: Revistas o congresos admitidos, ej: ['Nature', 'NeurIPS']
+            campos_estudio: Campos de estudio admitidos, ej: ['Computer Science']
+            tipos_publicacion: Tipos admitidos, ej: ['JournalArticle', 'Review']
+            solo_acceso_abierto: Solo papers con PDF de acceso abierto
+        """
+        self.año_desde = año_desde
+        self.año_hasta = año_hasta
+        self.fecha_desde = fecha_desde
+        self.fecha_hasta = fecha_hasta
+        self.min_citas = min_citas
+        self.venues = list(venues or [])
+        self.campos_estudio = list(campos_estudio or [])
+        self.tipos_publicacion = list(tipos_publicacion or [])
+        self.solo_acceso_abierto = solo_acceso_abierto
+
+    def con_años(self, año_desde: Optional[int], año_hasta: Optional[int]) -> 'FiltrosBusqueda':
+        """Copia de los filtros con otro rango de años"""
+        copia = copy.copy(self)
+        copia.año_desde, copia.año_hasta = año_desde, año_hasta
+        return copia
+
+    def _todos(self) -> Dict[str, str]:
+        """Todos los filtros activos con el nombre y formato de parámetro de la API"""
+        params = {}
+        rango = rango_años(self.año_desde, self.año_hasta)
+        if rango:
+            params['year'] = rango
+        if self.fecha_desde or self.fecha_hasta:
+            params['publicationDateOrYear'] = f"{self.fecha_desde or ''}:{self.fecha_hasta or ''}"
+        if self.min_citas:
+            params['minCitationCount'] = str(self.min_citas)
+        if self.venues:
+            params['venue'] = ','.join(self.venues)
+        if self.campos_estudio:
+            params['fieldsOfStudy'] = ','.join(self.campos_estudio)
+        if self.tipos_publicacion:
+            params['publicationTypes'] = ','.join(self.tipos_publicacion)
+        if self.solo_acceso_abierto:
+            params['openAccessPdf'] = ''
+        return params
+
+    def parametros(self, endpoint: str) -> Dict[str, str]:
+        """
+        Parámetros de query string para los filtros que el endpoint aplica en el servidor
+
+        Args:
+            endpoint: Plantilla del endpoint, ej: '/paper/search' (ver plantilla_endpoint())
+
+        Returns:
+            Diccionario para añadir a los params de la petición
+        """
+        soportados = FILTROS_SERVIDOR.get(endpoint, set())
+        return {nombre: valor for nombre, valor in self._todos().items() if nombre in soportados}
+
+    def locales(self, endpoint: str) -> List[str]:
+        """Filtros activos que el endpoint no puede aplicar (nombres de parámetro de la API)"""
+        soportados = FILTROS_SERVIDOR.get(endpoint, set())
+        return [nombre for nombre in self._todos() if nombre not in soportados]
+
+    def campos_locales(self, endpoint: str) -> List[str]:
+        """Campos de la API que hay que pedir para aplicar localmente los filtros restantes"""
+        return [campo for nombre in self.locales(endpoint) for campo in CAMPOS_POR_FILTRO[nombre]]
+
+    def cumple(self, paper: Optional[Dict], endpoint: Optional[str] = None) -> bool:
+        """
+        Comprueba localmente un paper crudo de la API
+
+        Args:
+            paper: Paper tal como lo devuelve la API
+            endpoint: Si se indica, solo se comprueban los filtros que ese endpoint
+                no aplica en el servidor; si no, todos
+
+        Returns:
+            True si el paper pasa los filtros
+        """
+        if not paper:
+            return False
+        nombres = self.locales(endpoint) if endpoint else self._todos()
+        for nombre in nombres:
+            if nombre == 'year':
+                year = paper.get('year')
+                if year is None or (self.año_desde is not None and year < self.año_desde) \
+                        or (self.año_hasta is not None and year > self.año_hasta):
+                    return False
+            elif nombre == 'publicationDateOrYear':
+                fecha = paper.get('publicationDate') or (str(paper['year']) if paper.get('year') else None)
+                # Las fechas ISO se comparan como texto; un límite parcial ('2020-05')
+                # se compara con el mismo número de caracteres de la fecha
+                if fecha is None or (self.fecha_desde and fecha[:len(self.fecha_desde)] < self.fecha_desde) \
+                        or (self.fecha_hasta and fecha[:len(self.fecha_hasta)] > self.fecha_hasta):
+                    return False
+            elif nombre == 'minCitationCount':
+                if (paper.get('citationCount') or 0) < self.min_citas:
+                    return False
+            elif nombre == 'venue':
+                if (paper.get('venue') or '').lower() not in {venue.lower() for venue in self.venues}:
+                    return False
+            elif nombre == 'fieldsOfStudy':
+                if not set(paper.get('fieldsOfStudy') or []) & set(self.campos_estudio):
+                    return False
+            elif nombre == 'publicationTypes':
+                if not set(paper.get('publicationTypes') or []) & set(self.tipos_publicacion):
+                    return False
+            elif nombre == 'openAccessPdf':
+                if not paper.get('openAccessPdf'):
+                    return False
+        return True
+
+    def __bool__(self) -> bool:
+        return bool(self._todos())
+
+
+def combinar_filtros(filtros: Optional[FiltrosBusqueda], año_desde: Optional[int] = None,
+                     año_hasta: Optional[int] = None) -> FiltrosBusqueda:
+    """
+    Une los parámetros año_desde/año_hasta de los métodos de búsqueda con un FiltrosBusqueda
+
+    Args:
+        filtros: Filtros explícitos (opcional)
+        año_desde: Año mínimo de publicación (opcional, prevalece sobre filtros)
+        año_hasta: Año máximo de publicación (opcional, prevalece sobre filtros)
+
+    Returns:
+        FiltrosBusqueda a aplicar
+    """
+    if filtros is None:
+        return FiltrosBusqueda(año_desde, año_hasta)
+    if año_desde is None and año_hasta is None:
+        return filtros
+    return filtros.con_años(año_desde if año_desde is not None else filtros.año_desde,
+                            año_hasta if año_hasta is not None else filtros.año_hasta)
 
 
 class SemanticScholarAPI:
@@ -17,14 +364,44 @@ class SemanticScholarAPI:
     Documentación: https://api.semanticscholar.org/
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, pool_size: int = 10, timeout: float = 30,
+                 base_url: str = "https://api.semanticscholar.org/graph/v1",
+                 rate_limiter: Optional[RateLimiter] = None, max_reintentos_429: int = 3,
+                 cache=None, cache_memoria=None, registros_compactos: bool = False,
+                 reintentos: Optional[PoliticaReintentos] = None, circuito: Optional[CircuitBreaker] = None,
+                 fixtures=None, metricas: Optional[MetricasCliente] = None, autores=None,
+                 ruta_cache_autores: Optional[str] = None):
         """
         Inicializa el cliente de la API
         
         Args:
             api_key: API key opcional para mayor límite de rate (recomendado)
+            pool_size: Número máximo de conexiones keep-alive reutilizables
+            timeout: Tiempo máximo de espera por petición en segundos
+            base_url: URL base de la API (útil para apuntar a un servidor local)
+            rate_limiter: Limitador compartido (default: uno propio según la API key)
+            max_reintentos_429: Reintentos ante errores transitorios (429, 5xx, conexión)
+                si no se pasa una política propia en `reintentos`
+            cache: Caché de respuestas opcional (ej: semantic_scholar_cache.CacheDisco)
+            cache_memoria: Caché LRU en memoria con agrupación de peticiones simultáneas
+                (ej: semantic_scholar_cache.CacheMemoria), consultada antes que `cache`
+            registros_compactos: Devolver objetos Articulo (con __slots__) en lugar de
+                diccionarios; ocupan mucha menos memoria en lotes grandes
+            reintentos: Política de reintentos con backoff (default: PoliticaReintentos
+                con max_reintentos_429 reintentos)
+            circuito: Circuit breaker (default: uno propio; puede compartirse entre clientes)
+            fixtures: Grabación/reproducción de respuestas en disco
+                (ej: semantic_scholar_fixtures.FixturesHTTP); en modo 'reproducir' no se usa la red
+            metricas: Métricas y hooks por petición (default: unas propias; pueden
+                compartirse entre clientes). Ver semantic_scholar_metrics
+            autores: Resolución de nombres de autor con caché y fijaciones que usa
+                buscar_por_autor (ej: semantic_scholar_authors.AutoresSemanticScholar;
+                default: una propia, creada en la primera búsqueda por autor)
+            ruta_cache_autores: Archivo SQLite para la resolución de autores propia
+                (None = en memoria, no se escribe nada en disco)
         """
-        self.base_url = "https://api.semanticscholar.org/graph/v1"
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
         self.headers = {
             'User-Agent': 'GoogleAcademicoScraper/1.0',
         }
@@ -34,163 +411,505 @@ class SemanticScholarAPI:
             
         # Límites de rate (con API key: 100 req/s, sin API key: 1 req/s)
         self.rate_limit_delay = 0.1 if api_key else 1.1
+        self.rate_limiter = rate_limiter or RateLimiter(tasa=1 / self.rate_limit_delay)
+        self.max_reintentos_429 = max_reintentos_429
+        self.reintentos = reintentos or PoliticaReintentos(max_reintentos=max_reintentos_429)
+        self.circuito = circuito or CircuitBreaker()
+        self.reintentos_realizados = 0
+        self.metricas = metricas if metricas is not None else MetricasCliente()
+        self.fixtures = fixtures
+        self.autores = autores
+        self.ruta_cache_autores = ruta_cache_autores
+        self._autores_propio = False
+        self.cache = cache
+        self.cache_memoria = cache_memoria
+        self.registros_compactos = registros_compactos
+        
+        # Papers que no se pudieron normalizar (se conservan los últimos 1000)
+        self.articulos_con_error = 0
+        self.errores_procesado: Deque[Dict] = deque(maxlen=1000)
+        
+        # Pool de conexiones compartido: cada hilo usa su propia Session pero
+        # todas montan el mismo adaptador, así las conexiones se reutilizan
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self._local = threading.local()
+        self._sesiones: List[requests.Session] = []
+        self._lock = threading.Lock()
+        self._cerrado = False
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """
+        Cierra todas las sesiones y libera las conexiones del pool
+        """
+        with self._lock:
+            if self._cerrado:
+                return
+            self._cerrado = True
+            sesiones, self._sesiones = self._sesiones, []
+        
+        for sesion in sesiones:
+            sesion.close()
+        self._adapter.close()
+        if self._autores_propio:
+            self.autores.cerrar()
+    
+    def _sesion(self) -> requests.Session:
+        """
+        Obtiene la Session del hilo actual, creándola si no existe
+        
+        Returns:
+            Session con los headers del cliente y el pool compartido montado
+        """
+        sesion = getattr(self._local, 'sesion', None)
+        if sesion is None:
+            with self._lock:
+                if self._cerrado:
+                    raise RuntimeError("El cliente de Semantic Scholar está cerrado")
+                sesion = requests.Session()
+                sesion.headers.update(self.headers)
+                sesion.mount('https://', self._adapter)
+                sesion.mount('http://', self._adapter)
+                self._sesiones.append(sesion)
+            self._local.sesion = sesion
+        elif self._cerrado:
+            raise RuntimeError("El cliente de Semantic Scholar está cerrado")
+        return sesion
+    
+    def _get(self, ruta: str, params: Optional[Dict] = None) -> Dict:
+        """
+        Realiza una petición GET reutilizando las conexiones del pool
+        
+        Args:
+            ruta: Ruta del endpoint relativa a base_url (ej: '/paper/search')
+            params: Parámetros de la query string
+            
+        Returns:
+            Respuesta JSON decodificada
+        """
+        return self._request('GET', ruta, params)
+    
+    def _post(self, ruta: str, params: Optional[Dict] = None, cuerpo: Optional[Dict] = None):
+        """
+        Realiza una petición POST con cuerpo JSON reutilizando las conexiones del pool
+        
+        Args:
+            ruta: Ruta del endpoint relativa a base_url (ej: '/paper/batch')
+            params: Parámetros de la query string
+            cuerpo: Cuerpo JSON de la petición
+            
+        Returns:
+            Respuesta JSON decodificada
+        """
+        return self._request('POST', ruta, params, cuerpo)
+    
+    def _request(self, metodo: str, ruta: str, params: Optional[Dict] = None, cuerpo: Optional[Dict] = None):
+        """
+        Punto único por el que pasan todas las peticiones HTTP del cliente
+        
+        Con cache_memoria configurada, las peticiones idénticas simultáneas se
+        agrupan en una sola y las repetidas se sirven desde memoria.
+        
+        Args:
+            metodo: Método HTTP ('GET' o 'POST')
+            ruta: Ruta del endpoint relativa a base_url
+            params: Parámetros de la query string
+            cuerpo: Cuerpo JSON de la petición (opcional)
+            
+        Returns:
+            Respuesta JSON decodificada
+        """
+        if self.cache_memoria is None:
+            return self._request_http(metodo, ruta, params, cuerpo)
+        
+        calculada = []
+        
+        def calcular():
+            calculada.append(True)
+            return self._request_http(metodo, ruta, params, cuerpo)
+        
+        clave = self.cache_memoria.clave(metodo, ruta, params, cuerpo)
+        data = self.cache_memoria.obtener_o_calcular(clave, calcular)
+        if not calculada:
+            self._registrar_sin_red(metodo, ruta, params, 'memoria')
+        return data
+    
+    def _registrar_sin_red(self, metodo: str, ruta: str, params: Optional[Dict], origen: str):
+        """Cuenta una respuesta servida sin red ('disco', 'memoria' o 'fixture') y avisa a los hooks"""
+        endpoint = plantilla_endpoint(ruta)
+        evento = {'metodo': metodo, 'ruta': ruta, 'endpoint': endpoint, 'params': params,
+                  'intento': 0, 'origen': origen}
+        self.metricas.notificar_antes(evento)
+        self.metricas.registrar_cache(endpoint, origen)
+        evento.update(estado=200, duracion=0.0, bytes_enviados=0, bytes_recibidos=0,
+                      espera_limitador=0.0, error=None)
+        self.metricas.notificar_despues(evento)
+    
+    def _request_http(self, metodo: str, ruta: str, params: Optional[Dict] = None, cuerpo: Optional[Dict] = None):
+        """
+        Resuelve una petición desde la caché en disco o desde la red
+        
+        Si hay caché configurada y la respuesta está vigente se devuelve sin
+        tocar la red ni consumir rate limit. Antes de cada intento se consulta
+        el circuit breaker y se adquiere un token del rate limiter. Los errores
+        transitorios se reintentan según la política de reintentos: tras un 429
+        la pausa la impone el limitador (que reduce la tasa y respeta el
+        Retry-After); tras un 5xx o un fallo de conexión se espera un backoff
+        exponencial con jitter.
+        
+        Con fixtures en modo 'reproducir' la respuesta sale siempre del disco; en
+        modo 'grabar' se guarda cada respuesta obtenida (y los errores definitivos).
+        
+        Cada intento queda registrado en self.metricas (estado, latencia, bytes,
+        espera en el limitador) y pasa por sus hooks antes y después de enviarse.
+        
+        Args:
+            metodo: Método HTTP ('GET' o 'POST')
+            ruta: Ruta del endpoint relativa a base_url
+            params: Parámetros de la query string
+            cuerpo: Cuerpo JSON de la petición (opcional)
+            
+        Returns:
+            Respuesta JSON decodificada
+            
+        Raises:
+            ErrorSemanticScholar: ErrorNoEncontrado, ErrorLimiteTasa, ErrorServidor,
+                ErrorHTTP, ErrorConexion o CircuitoAbierto (ver semantic_scholar_retry)
+        """
+        if self.fixtures is not None and self.fixtures.reproduciendo:
+            data = self.fixtures.reproducir(metodo, ruta, params, cuerpo)
+            self._registrar_sin_red(metodo, ruta, params, 'fixture')
+            return data
+        
+        clave = None
+        if self.cache is not None:
+            clave = self.cache.clave(metodo, ruta, params, cuerpo)
+            data = self.cache.obtener(clave)
+            if data is not None:
+                if self.fixtures is not None:
+                    self.fixtures.grabar(metodo, ruta, params, cuerpo, 200, data)
+                self._registrar_sin_red(metodo, ruta, params, 'disco')
+                return data
+        
+        url = f"{self.base_url}{ruta}"
+        endpoint = plantilla_endpoint(ruta)
+        intento = 0
+        while True:
+            try:
+                self.circuito.antes(ruta)
+            except CircuitoAbierto as e:
+                self.metricas.registrar_error(endpoint, e)
+                raise
+            # Si el intento termina con una excepción inesperada (un hook, un cuerpo
+            # corrupto...) se cuenta como fallo: así la sonda del estado semiabierto
+            # del circuito nunca queda pendiente para siempre
+            resuelto = False
+            try:
+                espera = self.rate_limiter.adquirir()
+                self.metricas.registrar_espera_limitador(espera)
+                evento = {'metodo': metodo, 'ruta': ruta, 'endpoint': endpoint, 'params': params,
+                          'intento': intento, 'origen': 'red'}
+                self.metricas.notificar_antes(evento)
+            
+                response = None
+                inicio = time.perf_counter()
+                try:
+                    response = self._sesion().request(metodo, url, params=params, json=cuerpo,
+                                                      timeout=self.timeout)
+                except requests.exceptions.RequestException as e:
+                    # Conexión rechazada o cortada, timeout, cuerpo truncado o mal codificado...
+                    error = ErrorConexion(f"{metodo} {ruta}: {e}", ruta=ruta)
+                else:
+                    error = None
+                    if response.status_code >= 400:
+                        error = error_http(response.status_code, ruta, response.text, response)
+                        if response.status_code == 429:
+                            self.rate_limiter.registrar_limite(
+                                parsear_retry_after(response.headers.get('Retry-After'))
+                            )
+                    else:
+                        try:
+                            data = response.json()
+                        except ValueError as e:
+                            # Cuerpo truncado o que no es JSON (p. ej. la página HTML de un proxy)
+                            error = ErrorConexion(f"{metodo} {ruta}: respuesta que no es JSON: {e}", ruta=ruta)
+                duracion = time.perf_counter() - inicio
+            
+                estado = response.status_code if response is not None else None
+                enviados = len(response.request.body or b'') if response is not None else 0
+                recibidos = len(response.content) if response is not None else 0
+                self.metricas.registrar_peticion(metodo, endpoint, estado, duracion, enviados, recibidos)
+                evento.update(estado=estado, duracion=duracion, bytes_enviados=enviados, bytes_recibidos=recibidos,
+                              espera_limitador=espera, error=error)
+                self.metricas.notificar_despues(evento)
+                if error is None:
+                    self.circuito.registrar_exito()
+                    resuelto = True
+                    break
+            
+                if isinstance(error, (ErrorServidor, ErrorConexion)):
+                    self.circuito.registrar_fallo()
+                else:
+                    self.circuito.registrar_exito()
+                resuelto = True
+            finally:
+                if not resuelto:
+                    self.circuito.registrar_fallo()
+            if not self.reintentos.debe_reintentar(error, intento, metodo, ruta):
+                error.intentos = intento + 1
+                self.metricas.registrar_error(endpoint, error)
+                if self.fixtures is not None and isinstance(error, ErrorHTTP) \
+                        and not isinstance(error, ERRORES_TRANSITORIOS):
+                    try:
+                        detalle = response.json()
+                    except ValueError:
+                        detalle = {'error': response.text}
+                    self.fixtures.grabar(metodo, ruta, params, cuerpo, error.codigo, detalle)
+                raise error
+            pausa = 0.0
+            if not isinstance(error, ErrorLimiteTasa):
+                pausa = self.reintentos.espera(intento)
+                time.sleep(pausa)
+            self.metricas.registrar_reintento(endpoint, error, pausa)
+            intento += 1
+            with self._lock:
+                self.reintentos_realizados += 1
+        
+        self.rate_limiter.registrar_exito()
+        if self.fixtures is not None:
+            self.fixtures.grabar(metodo, ruta, params, cuerpo, response.status_code, data)
+        
+        if clave is not None:
+            self.cache.guardar(clave, ruta, data)
+        return data
         
     def buscar_articulos(self, query: str, num_resultados: int = 10, campos: Optional[List[str]] = None, 
-                        año_desde: Optional[int] = None, año_hasta: Optional[int] = None) -> List[Dict]:
+                        año_desde: Optional[int] = None, año_hasta: Optional[int] = None,
+                        filtros: Optional[FiltrosBusqueda] = None) -> List[Dict]:
         """
         Busca artículos científicos por término de búsqueda
         
         Args:
             query: Término de búsqueda
-            num_resultados: Número de resultados a retornar (máximo 100)
-            campos: Lista de campos a incluir en la respuesta
+            num_resultados: Número de resultados a retornar (máximo 1000, se pagina de 100 en 100)
+            campos: Campos a pedir: lista de campos de la API, columnas de salida o
+                preset ('ids-only', 'metadata', 'full'); ver resolver_campos()
             año_desde: Año mínimo de publicación (opcional)
             año_hasta: Año máximo de publicación (opcional)
+            filtros: Filtros aplicados por el servidor (citas, venue, campos de estudio, ...)
             
         Returns:
-            Lista de diccionarios con información de los artículos
-        """
-        if campos is None:
-            campos = [
-                'paperId', 'title', 'abstract', 'authors', 'year', 
-                'citationCount', 'url', 'venue', 'publicationDate',
-                'publicationTypes', 'fieldsOfStudy'
-            ]
-        
-        # Limitar número de resultados
-        num_resultados = min(num_resultados, 100)
-        
-        # Construir query con filtros de año si se especifican
-        query_final = query
-        if año_desde is not None or año_hasta is not None:
-            if año_desde is not None and año_hasta is not None:
-                query_final += f" year:{año_desde}-{año_hasta}"
-            elif año_desde is not None:
-                query_final += f" year:{año_desde}-"
-            elif año_hasta is not None:
-                query_final += f" year:-{año_hasta}"
-        
-        params = {
-            'query': query_final,
-            'limit': num_resultados,
-            'fields': ','.join(campos)
-        }
-        
+            ResultadoParcial (una lista) con los artículos; si una petición falla tras
+            agotar los reintentos conserva los ya descargados y el error en `errores`
+        """
+        articulos = ResultadoParcial()
         try:
-            response = requests.get(
-                f"{self.base_url}/paper/search",
-                headers=self.headers,
-                params=params,
-                timeout=30
-            )
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            # Procesar y normalizar resultados
-            articulos = []
-            if 'data' in data:
-                for paper in data['data']:
-                    articulo = self._procesar_articulo(paper)
-                    if articulo:
-                        articulos.append(articulo)
-            
-            # Respetar límites de rate
-            time.sleep(self.rate_limit_delay)
-            
+            for articulo in self.iterar_articulos(query, num_resultados, campos, año_desde, año_hasta,
+                                                  filtros=filtros):
+                articulos.append(articulo)
             return articulos
             
         except requests.exceptions.RequestException as e:
             print(f"Error al buscar artículos: {e}")
-            return []
+            articulos.errores.append(e)
+            return articulos
         except Exception as e:
             print(f"Error inesperado: {e}")
-            return []
+            articulos.errores.append(e)
+            return articulos
+    
+    def iterar_articulos(self, query: str, max_resultados: Optional[int] = None,
+                         campos: Optional[List[str]] = None, año_desde: Optional[int] = None,
+                         año_hasta: Optional[int] = None, tamaño_pagina: int = 100,
+                         prefetch: bool = False, filtros: Optional[FiltrosBusqueda] = None) -> Iterator[Dict]:
+        """
+        Recorre los resultados de búsqueda página a página, de forma perezosa
+        
+        Solo se mantiene en memoria la página actual (y la siguiente si prefetch
+        está activo). Se puede cortar en cualquier momento con break o islice.
+        La búsqueda por relevancia de la API devuelve como máximo 1000 resultados.
+        
+        Args:
+            query: Término de búsqueda
+            max_resultados: Máximo de artículos a devolver (None = todos los disponibles)
+            campos: Campos a pedir: lista de campos de la API, columnas de salida o
+                preset ('ids-only', 'metadata', 'full'); ver resolver_campos()
+            año_desde: Año mínimo de publicación (opcional)
+            año_hasta: Año máximo de publicación (opcional)
+            tamaño_pagina: Artículos por petición (máximo 100)
+            prefetch: Pedir la siguiente página en segundo plano mientras se consume la actual
+            filtros: Filtros aplicados por el servidor (citas, venue, campos de estudio, ...)
+            
+        Yields:
+            Diccionarios normalizados con información de cada artículo
+        """
+        campos = resolver_campos(campos)
+        params_filtros = combinar_filtros(filtros, año_desde, año_hasta).parametros("/paper/search")
+        
+        tamaño_pagina = max(1, min(tamaño_pagina, 100))
+        limite_total = MAX_RESULTADOS_RELEVANCIA
+        if max_resultados is not None:
+            limite_total = min(max_resultados, limite_total)
+        if limite_total <= 0:
+            return
+        
+        def pedir_pagina(offset: int) -> Dict:
+            params = {
+                'query': query,
+                'offset': offset,
+                'limit': min(tamaño_pagina, limite_total - offset),
+                'fields': ','.join(campos),
+                **params_filtros
+            }
+            return self._get("/paper/search", params)
+        
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            pagina = pedir_pagina(0)
+            emitidos = 0
+            while True:
+                siguiente = pagina.get('next')
+                if siguiente is not None and siguiente >= limite_total:
+                    siguiente = None
+                
+                futura = None
+                if executor is not None and siguiente is not None:
+                    futura = executor.submit(pedir_pagina, siguiente)
+                
+                for articulo in self.normalizar_pagina(pagina.get('data') or [], campos, "/paper/search"):
+                    if articulo:
+                        yield articulo
+                        emitidos += 1
+                        if emitidos >= limite_total:
+                            return
+                
+                if siguiente is None:
+                    return
+                pagina = futura.result() if futura is not None else pedir_pagina(siguiente)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
     
     def buscar_por_autor(self, autor: str, num_resultados: int = 10, 
-                        año_desde: Optional[int] = None, año_hasta: Optional[int] = None) -> List[Dict]:
+                        año_desde: Optional[int] = None, año_hasta: Optional[int] = None,
+                        filtros: Optional[FiltrosBusqueda] = None) -> List[Dict]:
         """
         Busca artículos de un autor específico
         
+        El nombre se resuelve con `self.autores` (AutoresSemanticScholar): repetir un
+        nombre no vuelve a consultar /author/search y una fijación hecha con
+        autores.fijar() elige entre homónimos.
+        
         Args:
             autor: Nombre del autor
             num_resultados: Número de resultados a retornar
             año_desde: Año mínimo de publicación (opcional)
             año_hasta: Año máximo de publicación (opcional)
+            filtros: Filtros adicionales (los que el endpoint no admite se aplican localmente)
             
         Returns:
-            Lista de artículos del autor
+            ResultadoParcial (una lista) con los artículos del autor; si una petición
+            falla conserva los ya descargados y el error en `errores`
         """
-        # Primero buscar el autor
+        articulos = ResultadoParcial()
+        # Primero resolver el autor (caché de nombres y fijaciones de AutoresSemanticScholar)
         try:
-            response = requests.get(
-                f"{self.base_url}/author/search",
-                headers=self.headers,
-                params={'query': autor, 'limit': 1},
-                timeout=30
-            )
-            
-            response.raise_for_status()
-            data = response.json()
+            author_id = self._resolutor_autores().resolver(autor)
             
-            if not data.get('data'):
+            if author_id is None:
                 print(f"No se encontró el autor: {autor}")
-                return []
-            
-            author_id = data['data'][0]['authorId']
-            time.sleep(self.rate_limit_delay)
-            
-            # Obtener papers del autor
-            campos = [
-                'paperId', 'title', 'abstract', 'authors', 'year', 
-                'citationCount', 'url', 'venue', 'publicationDate'
-            ]
-            
-            # Preparar parámetros con filtros de año
-            params = {
-                'limit': min(num_resultados, 100),
-                'fields': ','.join(campos)
-            }
-            
-            # Agregar filtros de año si se especifican
-            if año_desde is not None or año_hasta is not None:
-                if año_desde is not None and año_hasta is not None:
-                    params['year'] = f"{año_desde}-{año_hasta}"
-                elif año_desde is not None:
-                    params['year'] = f"{año_desde}-"
-                elif año_hasta is not None:
-                    params['year'] = f"-{año_hasta}"
+                return articulos
             
-            response = requests.get(
-                f"{self.base_url}/author/{author_id}/papers",
-                headers=self.headers,
-                params=params,
-                timeout=30
-            )
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            # Procesar resultados
-            articulos = []
-            if 'data' in data:
-                for paper in data['data']:
-                    articulo = self._procesar_articulo(paper)
-                    if articulo:
-                        articulos.append(articulo)
+            # Obtener papers del autor (paginando si pide más de una página)
+            for articulo in self.iterar_papers_autor(author_id, num_resultados, CAMPOS_AUTOR,
+                                                     año_desde, año_hasta, filtros=filtros):
+                articulos.append(articulo)
             
-            time.sleep(self.rate_limit_delay)
             return articulos
             
         except requests.exceptions.RequestException as e:
             print(f"Error al buscar por autor: {e}")
-            return []
+            articulos.errores.append(e)
+            return articulos
         except Exception as e:
             print(f"Error inesperado: {e}")
-            return []
+            articulos.errores.append(e)
+            return articulos
+    
+    def _resolutor_autores(self):
+        """
+        Devuelve el resolutor de nombres de autor, creando uno propio si no se pasó
+
+        Returns:
+            Objeto con resolver(nombre) -> authorId (AutoresSemanticScholar)
+        """
+        with self._lock:
+            if self.autores is None:
+                # Import diferido: semantic_scholar_authors importa este módulo
+                from semantic_scholar_authors import AutoresSemanticScholar
+                self.autores = AutoresSemanticScholar(self, self.ruta_cache_autores)
+                self._autores_propio = True
+            return self.autores
+    
+    def iterar_papers_autor(self, author_id: str, max_resultados: Optional[int] = None, campos=None,
+                            año_desde: Optional[int] = None, año_hasta: Optional[int] = None,
+                            tamaño_pagina: int = 1000, filtros: Optional[FiltrosBusqueda] = None) -> Iterator[Dict]:
+        """
+        Recorre la lista completa de papers de un autor, página a página
+        
+        Args:
+            author_id: ID del autor en Semantic Scholar
+            max_resultados: Máximo de papers a devolver (None = todos)
+            campos: Campos a pedir (default: CAMPOS_AUTOR); ver resolver_campos()
+            año_desde: Año mínimo de publicación (opcional)
+            año_hasta: Año máximo de publicación (opcional)
+            tamaño_pagina: Papers por petición (máximo 1000)
+            filtros: Filtros adicionales; este endpoint solo aplica el de años en el
+                servidor, el resto se comprueban localmente
+            
+        Yields:
+            Artículos normalizados
+        """
+        endpoint = "/author/{id}/papers"
+        filtros = combinar_filtros(filtros, año_desde, año_hasta)
+        campos = resolver_campos(campos, CAMPOS_AUTOR)
+        filtrar = bool(filtros.locales(endpoint))
+        tamaño_pagina = max(1, min(tamaño_pagina, 1000))
+        params = {'fields': ','.join(resolver_campos(campos + filtros.campos_locales(endpoint))),
+                  **filtros.parametros(endpoint)}
+        
+        offset = 0
+        emitidos = 0
+        while True:
+            limite = tamaño_pagina
+            if max_resultados is not None:
+                if emitidos >= max_resultados:
+                    return
+                if not filtrar:
+                    limite = min(limite, max_resultados - emitidos)
+            data = self._get(f"/author/{author_id}/papers", dict(params, offset=offset, limit=limite))
+            papers = data.get('data') or []
+            if filtrar:
+                papers = [paper for paper in papers if filtros.cumple(paper, endpoint)]
+            for articulo in self.normalizar_pagina(papers, campos, endpoint):
+                if articulo:
+                    yield articulo
+                    emitidos += 1
+                    if max_resultados is not None and emitidos >= max_resultados:
+                        return
+            siguiente = data.get('next')
+            if siguiente is None or not data.get('data'):
+                return
+            offset = siguiente
     
     def buscar_por_titulo(self, titulo: str, num_resultados: int = 10,
-                         año_desde: Optional[int] = None, año_hasta: Optional[int] = None) -> List[Dict]:
+                         año_desde: Optional[int] = None, año_hasta: Optional[int] = None,
+                         filtros: Optional[FiltrosBusqueda] = None) -> List[Dict]:
         """
         Busca artículos por título específico
         
@@ -199,13 +918,15 @@ class SemanticScholarAPI:
             num_resultados: Número de resultados a retornar
             año_desde: Año mínimo de publicación (opcional)
             año_hasta: Año máximo de publicación (opcional)
+            filtros: Filtros aplicados por el servidor (citas, venue, campos de estudio, ...)
             
         Returns:
             Lista de artículos con ese título
         """
         # Usar búsqueda general pero con título entrecomillado para mayor precisión
         query_titulo = f'"{titulo}"'
-        return self.buscar_articulos(query_titulo, num_resultados, año_desde=año_desde, año_hasta=año_hasta)
+        return self.buscar_articulos(query_titulo, num_resultados, año_desde=año_desde, año_hasta=año_hasta,
+                                     filtros=filtros)
     
     def obtener_articulo_por_id(self, paper_id: str, campos: Optional[List[str]] = None) -> Optional[Dict]:
         """
@@ -213,38 +934,169 @@ class SemanticScholarAPI:
         
         Args:
             paper_id: ID del paper en Semantic Scholar
-            campos: Lista de campos a incluir
+            campos: Campos a pedir: lista de campos de la API, columnas de salida o
+                preset ('ids-only', 'metadata', 'full'); ver resolver_campos()
             
         Returns:
-            Diccionario con información del artículo o None si no se encuentra
+            Diccionario con información del artículo o None si el paper no existe (404)
+            
+        Raises:
+            ErrorSemanticScholar: Cualquier otro fallo (5xx o 429 tras los reintentos,
+                conexión, circuito abierto...), para no confundirlo con "no existe"
         """
-        if campos is None:
-            campos = [
-                'paperId', 'title', 'abstract', 'authors', 'year', 
-                'citationCount', 'url', 'venue', 'publicationDate',
-                'publicationTypes', 'fieldsOfStudy', 'references', 'citations'
-            ]
+        campos = resolver_campos(campos)
         
         try:
-            response = requests.get(
-                f"{self.base_url}/paper/{paper_id}",
-                headers=self.headers,
-                params={'fields': ','.join(campos)},
-                timeout=30
-            )
+            paper = self._get(f"/paper/{paper_id}", {'fields': ','.join(campos)})
+        except ErrorNoEncontrado:
+            return None
+        return self._procesar_articulo(paper)
+    
+    def obtener_articulos_por_ids(self, paper_ids: List[str], campos: Optional[List[str]] = None,
+                                  max_workers: int = 4) -> List[Optional[Dict]]:
+        """
+        Obtiene muchos artículos por ID usando el endpoint POST /paper/batch
+        
+        Los IDs se agrupan en lotes de hasta 500 que se piden en paralelo (cada
+        lote consume un solo token del rate limiter).
+        
+        Args:
+            paper_ids: IDs de Semantic Scholar (o con prefijo: 'DOI:...', 'ARXIV:...', etc.)
+            campos: Campos a pedir: lista de campos de la API, columnas de salida o
+                preset ('ids-only', 'metadata', 'full'); ver resolver_campos()
+            max_workers: Número de lotes a pedir simultáneamente
+            
+        Returns:
+            ResultadoParcial (una lista) en el mismo orden que paper_ids, con None para
+            los IDs no encontrados o cuyo lote falló; los errores de lote en `errores`
+        """
+        campos = resolver_campos(campos)
+        
+        paper_ids = list(paper_ids)
+        lotes = [paper_ids[i:i + MAX_IDS_POR_LOTE] for i in range(0, len(paper_ids), MAX_IDS_POR_LOTE)]
+        params = {'fields': ','.join(campos)}
+        
+        resultados = ResultadoParcial()
+        
+        def pedir_lote(lote: List[str]) -> List[Optional[Dict]]:
+            try:
+                papers = self._post("/paper/batch", params, {'ids': lote})
+            except requests.exceptions.RequestException as e:
+                print(f"Error al obtener lote de {len(lote)} artículos: {e}")
+                resultados.errores.append(e)
+                return [None] * len(lote)
+            return self.normalizar_pagina(papers, campos, "/paper/batch")
+        
+        if len(lotes) <= 1 or max_workers <= 1:
+            for lote in lotes:
+                resultados.extend(pedir_lote(lote))
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for articulos_lote in executor.map(pedir_lote, lotes):
+                    resultados.extend(articulos_lote)
+        return resultados
+    
+    def iterar_relacionados(self, paper_id: str, tipo: str = 'references', campos=None,
+                            max_resultados: Optional[int] = None, tamaño_pagina: int = 1000,
+                            filtros: Optional[FiltrosBusqueda] = None) -> Iterator[Dict]:
+        """
+        Recorre las referencias o las citas de un paper tal como las devuelve la API
+        
+        Usa los endpoints paginados /paper/{id}/references y /paper/{id}/citations.
+        Las entradas sin paperId (obras que no están en Semantic Scholar) se omiten.
+        
+        Args:
+            paper_id: ID del paper
+            tipo: 'references' (papers que cita) o 'citations' (papers que lo citan)
+            campos: Campos a pedir de cada paper relacionado (default: 'ids-only')
+            max_resultados: Máximo de papers a devolver (None = todos)
+            tamaño_pagina: Papers por petición (máximo 1000)
+            filtros: Filtros a aplicar; estos endpoints no filtran en el servidor, así
+                que se comprueban localmente (pidiendo los campos que hagan falta)
             
-            response.raise_for_status()
-            paper = response.json()
+        Yields:
+            Diccionarios crudos de la API de cada paper relacionado
+        """
+        if tipo not in ('references', 'citations'):
+            raise ValueError(f"Tipo de relación no soportado: {tipo}")
+        clave = 'citedPaper' if tipo == 'references' else 'citingPaper'
+        campos = resolver_campos(campos if campos is not None else 'ids-only')
+        endpoint = f"/paper/{{id}}/{tipo}"
+        if filtros:
+            campos = resolver_campos(campos + filtros.campos_locales(endpoint))
+        tamaño_pagina = max(1, min(tamaño_pagina, 1000))
+        ruta = f"/paper/{paper_id}/{tipo}"
+        
+        offset = 0
+        emitidos = 0
+        while True:
+            limite = tamaño_pagina
+            if max_resultados is not None:
+                if emitidos >= max_resultados:
+                    return
+                if not filtros:
+                    limite = min(limite, max_resultados - emitidos)
+            data = self._get(ruta, {'offset': offset, 'limit': limite, 'fields': ','.join(campos)})
+            for entrada in data.get('data') or []:
+                paper = (entrada or {}).get(clave)
+                if paper and paper.get('paperId') and (not filtros or filtros.cumple(paper, endpoint)):
+                    yield paper
+                    emitidos += 1
+                    if max_resultados is not None and emitidos >= max_resultados:
+                        return
+            siguiente = data.get('next')
+            if siguiente is None or not data.get('data'):
+                return
+            offset = siguiente
+    
+    def obtener_referencias(self, paper_id: str, max_resultados: Optional[int] = None,
+                            campos=None, filtros: Optional[FiltrosBusqueda] = None) -> List[Dict]:
+        """
+        Obtiene los papers citados por un paper
+        
+        Args:
+            paper_id: ID del paper
+            max_resultados: Máximo de referencias (None = todas)
+            campos: Campos a pedir (default: 'full')
+            filtros: Filtros a aplicar localmente (opcional)
             
-            time.sleep(self.rate_limit_delay)
-            return self._procesar_articulo(paper)
+        Returns:
+            ResultadoParcial (una lista) con los artículos normalizados; si falla a mitad
+            conserva los ya descargados y el error en `errores`
+        """
+        return self._obtener_relacionados(paper_id, 'references', max_resultados, campos, filtros)
+    
+    def obtener_citas(self, paper_id: str, max_resultados: Optional[int] = None,
+                      campos=None, filtros: Optional[FiltrosBusqueda] = None) -> List[Dict]:
+        """
+        Obtiene los papers que citan a un paper
+        
+        Args:
+            paper_id: ID del paper
+            max_resultados: Máximo de citas (None = todas)
+            campos: Campos a pedir (default: 'full')
+            filtros: Filtros a aplicar localmente (opcional)
             
+        Returns:
+            ResultadoParcial (una lista) con los artículos normalizados; si falla a mitad
+            conserva los ya descargados y el error en `errores`
+        """
+        return self._obtener_relacionados(paper_id, 'citations', max_resultados, campos, filtros)
+    
+    def _obtener_relacionados(self, paper_id: str, tipo: str, max_resultados: Optional[int],
+                              campos, filtros: Optional[FiltrosBusqueda] = None) -> List[Dict]:
+        """Implementación común de obtener_referencias() y obtener_citas()"""
+        campos = resolver_campos(campos)
+        papers = []
+        errores = []
+        try:
+            for paper in self.iterar_relacionados(paper_id, tipo, campos, max_resultados, filtros=filtros):
+                papers.append(paper)
         except requests.exceptions.RequestException as e:
-            print(f"Error al obtener artículo {paper_id}: {e}")
-            return None
-        except Exception as e:
-            print(f"Error inesperado: {e}")
-            return None
+            print(f"Error al obtener {tipo} de {paper_id}: {e}")
+            errores.append(e)
+        articulos = self.normalizar_pagina(papers, campos, f"/paper/{{id}}/{tipo}")
+        return ResultadoParcial((articulo for articulo in articulos if articulo), errores)
     
     def _procesar_articulo(self, paper: Dict) -> Dict:
         """
@@ -254,84 +1106,515 @@ class SemanticScholarAPI:
             paper: Datos del artículo de la API
             
         Returns:
-            Diccionario con formato normalizado
+            Diccionario con formato normalizado (o Articulo si registros_compactos está activo)
         """
-        try:
-            # Procesar autores
-            autores = []
-            if paper.get('authors'):
-                autores = [autor.get('name', 'Autor desconocido') for autor in paper['authors']]
-            autores_str = ', '.join(autores[:3])  # Máximo 3 autores
-            if len(paper.get('authors', [])) > 3:
-                autores_str += ' et al.'
-            
-            # Procesar información de publicación
-            venue = paper.get('venue', '')
-            year = paper.get('year', '')
-            pub_info = f"{autores_str}"
-            if venue:
-                pub_info += f" - {venue}"
-            if year:
-                pub_info += f" - {year}"
+        if self.registros_compactos:
+            return procesar_articulo_compacto(paper)
+        return procesar_articulo(paper)
+    
+    def consultar(self, ruta: str, params: Optional[Dict] = None, cuerpo: Optional[Dict] = None):
+        """
+        Petición directa a un endpoint, con caché, rate limit, reintentos y métricas
+        
+        Para los módulos que recorren endpoints sin método propio en el cliente
+        (bulk, autores, títulos...). Con cuerpo se envía un POST; si no, un GET.
+        
+        Args:
+            ruta: Ruta del endpoint relativa a base_url (ej: '/paper/search/bulk')
+            params: Parámetros de la query string
+            cuerpo: Cuerpo JSON (opcional)
             
-            # Procesar citaciones
-            citation_count = paper.get('citationCount', 0)
-            citado_por = f"Citado por {citation_count:,}" if citation_count else "Sin citaciones"
+        Returns:
+            Respuesta JSON decodificada
             
-            # Procesar campos de estudio
-            campos_estudio = []
-            if paper.get('fieldsOfStudy'):
-                campos_estudio = [campo for campo in paper['fieldsOfStudy'] if campo]
+        Raises:
+            ErrorSemanticScholar: Ver _request_http()
+        """
+        if cuerpo is not None:
+            return self._post(ruta, params, cuerpo)
+        return self._get(ruta, params)
+    
+    def pedir_pagina(self, ruta: str, params: Optional[Dict] = None,
+                     campos: Optional[List[str]] = None) -> Tuple[List[Dict], Dict]:
+        """
+        Pide una página de papers y la normaliza
+        
+        Args:
+            ruta: Endpoint que devuelve papers en 'data' (ej: '/paper/search')
+            params: Parámetros de la query string (offset, token, fields...)
+            campos: Campos pedidos (para normalizar_articulos)
             
-            # URL del artículo
-            url = paper.get('url', '')
-            if not url and paper.get('paperId'):
-                url = f"https://www.semanticscholar.org/paper/{paper['paperId']}"
+        Returns:
+            Tupla (artículos normalizados sin los nulos ni los erróneos, respuesta cruda
+            con 'total', 'next', 'token', ...)
+        """
+        data = self._get(ruta, params)
+        articulos = [
+            articulo for articulo in self.normalizar_pagina(data.get('data') or [], campos, ruta)
+            if articulo
+        ]
+        return articulos, data
+    
+    def normalizar_pagina(self, papers: List[Optional[Dict]], campos: Optional[List[str]] = None,
+                          ruta: str = '') -> List[Optional[Dict]]:
+        """
+        Normaliza una página de papers con normalizar_articulos() y registra los errores
+        
+        Args:
+            papers: Lista 'data' de la respuesta
+            campos: Campos pedidos a la API
+            ruta: Endpoint de origen (se guarda con cada error)
             
-            # Procesar campos de forma segura
-            resumen = paper.get('abstract')
-            if resumen is None:
-                resumen = 'Resumen no disponible'
-                
-            pub_date = paper.get('publicationDate')
-            if pub_date is None:
-                pub_date = ''
-                
-            pub_types = paper.get('publicationTypes', [])
-            if pub_types is None:
-                pub_types = []
-                
-            articulo = {
-                'titulo': paper.get('title', 'Título no disponible'),
+        Returns:
+            Artículos en el mismo orden que papers (None en las posiciones nulas o con error)
+        """
+        articulos, errores = normalizar_articulos(papers, campos, self.registros_compactos)
+        if errores:
+            with self._lock:
+                self.articulos_con_error += len(errores)
+                for error in errores:
+                    error['ruta'] = ruta
+                    self.errores_procesado.append(error)
+        return articulos
+
+
+def procesar_articulo(paper: Dict) -> Optional[Dict]:
+    """
+    Procesa un artículo de la API y lo convierte al formato estándar
+    
+    Compartida por el cliente síncrono y el asíncrono.
+    
+    Args:
+        paper: Datos del artículo de la API
+        
+    Returns:
+        Diccionario con formato normalizado (None si el artículo no se pudo procesar)
+    """
+    articulos, errores = normalizar_articulos([paper])
+    if errores:
+        print(f"Error al procesar artículo: {errores[0]['error']}")
+    return articulos[0]
+
+
+class Articulo(Mapping):
+    """
+    Registro compacto de un artículo
+
+    Guarda los campos tal como llegan de la API (year y citation_count como int,
+    autores como tupla de nombres) y calcula los textos de presentación
+    (autores_info, citado_por, versiones, ...) solo cuando se leen. Se comporta
+    como un diccionario de solo lectura con las mismas claves que
+    procesar_articulo(), así funciona con guardar_articulos_csv, imprimir_articulos
+    y los sinks sin cambios.
+    """
+
+    __slots__ = ('paper_id', 'titulo', 'url', 'autores', 'year', 'venue', 'abstract',
+                 'citation_count', 'publication_date', 'tipos_publicacion', 'campos')
+
+    def __init__(self, paper_id: str = '', titulo: Optional[str] = 'Título no disponible', url: str = '',
+                 autores: Tuple[str, ...] = (), year: Optional[int] = None, venue: str = '',
+                 abstract: Optional[str] = None, citation_count: int = 0, publication_date: str = '',
+                 tipos_publicacion: Tuple[str, ...] = (), campos: Tuple[str, ...] = ()):
+        self.paper_id = paper_id
+        self.titulo = titulo
+        self.url = url
+        self.autores = autores
+        self.year = year
+        self.venue = venue
+        self.abstract = abstract
+        self.citation_count = citation_count
+        self.publication_date = publication_date
+        self.tipos_publicacion = tipos_publicacion
+        self.campos = campos
+
+    @classmethod
+    def desde_paper(cls, paper: Dict) -> 'Articulo':
+        """
+        Crea el registro a partir de un paper de la API (lanza excepción si está mal formado)
+
+        Args:
+            paper: Datos del artículo de la API
+
+        Returns:
+            Articulo
+        """
+        return cls(
+            paper.get('paperId') or '',
+            paper.get('title', 'Título no disponible'),
+            paper.get('url') or '',
+            tuple(autor.get('name') or 'Autor desconocido' for autor in paper.get('authors') or ()),
+            paper.get('year') or None,
+            paper.get('venue') or '',
+            paper.get('abstract'),
+            paper.get('citationCount') or 0,
+            paper.get('publicationDate') or '',
+            tuple(paper.get('publicationTypes') or ()),
+            tuple(campo for campo in paper.get('fieldsOfStudy') or () if campo),
+        )
+
+    # Textos de presentación, calculados al leerlos
+
+    @property
+    def enlace(self) -> str:
+        if not self.url and self.paper_id:
+            return f"https://www.semanticscholar.org/paper/{self.paper_id}"
+        return self.url
+
+    @property
+    def autores_info(self) -> str:
+        info = ', '.join(self.autores[:3])
+        if len(self.autores) > 3:
+            info += ' et al.'
+        if self.venue:
+            info += f" - {self.venue}"
+        if self.year:
+            info += f" - {self.year}"
+        return info
+
+    @property
+    def resumen(self) -> str:
+        return 'Resumen no disponible' if self.abstract is None else self.abstract
+
+    @property
+    def citado_por(self) -> str:
+        return f"Citado por {self.citation_count:,}" if self.citation_count else "Sin citaciones"
+
+    @property
+    def versiones(self) -> str:
+        return f"Semantic Scholar ID: {self.paper_id or 'N/A'}"
+
+    # Vista de diccionario (mismas claves y orden que procesar_articulo)
+
+    _CLAVES = {
+        'titulo': lambda a: a.titulo,
+        'enlace': lambda a: a.enlace,
+        'autores_info': lambda a: a.autores_info,
+        'resumen': lambda a: a.resumen,
+        'citado_por': lambda a: a.citado_por,
+        'versiones': lambda a: a.versiones,
+        'year': lambda a: a.year or '',
+        'venue': lambda a: a.venue,
+        'campos_estudio': lambda a: ', '.join(a.campos),
+        'paper_id': lambda a: a.paper_id,
+        'citation_count': lambda a: a.citation_count,
+        'publication_date': lambda a: a.publication_date,
+        'publication_types': lambda a: ', '.join(a.tipos_publicacion),
+    }
+
+    def __getitem__(self, clave: str):
+        try:
+            calcular = self._CLAVES[clave]
+        except KeyError:
+            raise KeyError(clave) from None
+        return calcular(self)
+
+    def __iter__(self):
+        return iter(self._CLAVES)
+
+    def __len__(self) -> int:
+        return len(self._CLAVES)
+
+    def __repr__(self) -> str:
+        return f"Articulo(paper_id={self.paper_id!r}, titulo={self.titulo!r}, year={self.year!r})"
+
+
+def procesar_articulo_compacto(paper: Dict) -> Optional[Articulo]:
+    """
+    Igual que procesar_articulo() pero devuelve un Articulo en lugar de un diccionario
+
+    Args:
+        paper: Datos del artículo de la API
+
+    Returns:
+        Articulo (None si el artículo no se pudo procesar)
+    """
+    articulos, errores = normalizar_articulos([paper], compacto=True)
+    if errores:
+        print(f"Error al procesar artículo: {errores[0]['error']}")
+    return articulos[0]
+
+
+def normalizar_articulos(papers: Iterable[Optional[Dict]], campos: Optional[List[str]] = None,
+                         compacto: bool = False) -> Tuple[List[Optional[Dict]], List[Dict]]:
+    """
+    Normaliza una página completa de papers en una sola pasada
+
+    Es la única implementación de la normalización: procesar_articulo() y
+    procesar_articulo_compacto() la llaman con un solo paper. Decide una sola vez
+    qué campos hay que procesar: los que no se pidieron a la API toman
+    directamente su valor por defecto. Los papers mal formados no se imprimen,
+    se devuelven en `errores`.
+
+    Args:
+        papers: Lista 'data' de la respuesta (los None del endpoint batch se respetan)
+        campos: Campos pedidos a la API (None = asumir que pueden venir todos)
+        compacto: Devolver objetos Articulo en lugar de diccionarios
+
+    Returns:
+        Tupla (artículos, errores). `artículos` tiene la misma longitud que `papers`,
+        con None en las posiciones nulas o con error; cada error es un diccionario
+        con indice, paper_id y error
+    """
+    articulos: List[Optional[Dict]] = []
+    errores: List[Dict] = []
+
+    if compacto:
+        for indice, paper in enumerate(papers):
+            if paper is None:
+                articulos.append(None)
+                continue
+            try:
+                articulos.append(Articulo.desde_paper(paper))
+            except Exception as e:
+                articulos.append(None)
+                errores.append({'indice': indice, 'paper_id': paper.get('paperId'), 'error': repr(e)})
+        return articulos, errores
+
+    pedidos = set(campos) if campos is not None else None
+
+    def pide(campo: str) -> bool:
+        return pedidos is None or campo in pedidos
+
+    con_autores = pide('authors')
+    con_venue = pide('venue')
+    con_year = pide('year')
+    con_citas = pide('citationCount')
+    con_campos = pide('fieldsOfStudy')
+    con_url = pide('url')
+    con_resumen = pide('abstract')
+    con_fecha = pide('publicationDate')
+    con_tipos = pide('publicationTypes')
+
+    for indice, paper in enumerate(papers):
+        if paper is None:
+            articulos.append(None)
+            continue
+        try:
+            get = paper.get
+            paper_id = get('paperId', '')
+
+            autores_info = ''
+            if con_autores:
+                autores = get('authors')
+                if autores:
+                    autores_info = ', '.join([autor.get('name') or 'Autor desconocido' for autor in autores[:3]])
+                    if len(autores) > 3:
+                        autores_info += ' et al.'
+            venue = get('venue', '') if con_venue else ''
+            year = get('year', '') if con_year else ''
+            if venue:
+                autores_info += f" - {venue}"
+            if year:
+                autores_info += f" - {year}"
+
+            citation_count = (get('citationCount') or 0) if con_citas else 0
+
+            url = get('url', '') if con_url else ''
+            if not url and paper_id:
+                url = f"https://www.semanticscholar.org/paper/{paper_id}"
+
+            resumen = get('abstract') if con_resumen else None
+            fecha = get('publicationDate') if con_fecha else None
+            tipos = get('publicationTypes') if con_tipos else None
+            campos_estudio = get('fieldsOfStudy') if con_campos else None
+
+            articulos.append({
+                'titulo': get('title', 'Título no disponible'),
                 'enlace': url,
-                'autores_info': pub_info,
-                'resumen': resumen,
-                'citado_por': citado_por,
-                'versiones': f"Semantic Scholar ID: {paper.get('paperId', 'N/A')}",
+                'autores_info': autores_info,
+                'resumen': 'Resumen no disponible' if resumen is None else resumen,
+                'citado_por': f"Citado por {citation_count:,}" if citation_count else "Sin citaciones",
+                'versiones': f"Semantic Scholar ID: {get('paperId', 'N/A')}",
                 'year': year or '',
                 'venue': venue or '',
-                'campos_estudio': ', '.join(campos_estudio),
-                'paper_id': paper.get('paperId', ''),
+                'campos_estudio': ', '.join([campo for campo in campos_estudio if campo]) if campos_estudio else '',
+                'paper_id': paper_id,
                 'citation_count': citation_count,
-                'publication_date': pub_date,
-                'publication_types': ', '.join(pub_types)
-            }
-            
-            return articulo
-            
+                'publication_date': '' if fecha is None else fecha,
+                'publication_types': ', '.join(tipos) if tipos else '',
+            })
         except Exception as e:
-            print(f"Error al procesar artículo: {e}")
-            return None
+            articulos.append(None)
+            errores.append({'indice': indice, 'paper_id': paper.get('paperId'), 'error': repr(e)})
+
+    return articulos, errores
+
 
+def _safe_strip(value) -> str:
+    """Convierte un valor a texto sin espacios extremos ('' si es None)"""
+    if value is None:
+        return ''
+    return str(value).strip()
 
-def guardar_articulos_csv(articulos: List[Dict], nombre_archivo: Optional[str] = None, query: str = "") -> str:
+
+def fila_csv(articulo: Dict, numero: int, fecha_extraccion: str) -> Dict:
+    """
+    Convierte un artículo normalizado en una fila con las columnas de COLUMNAS_CSV
+    
+    Args:
+        articulo: Diccionario con información del artículo
+        numero: Número secuencial de la fila
+        fecha_extraccion: Timestamp a registrar en la columna fecha_extraccion
+        
+    Returns:
+        Diccionario listo para csv.DictWriter
+    """
+    return {
+        'numero': numero,
+        'titulo': _safe_strip(articulo.get('titulo', '')),
+        'autores_info': _safe_strip(articulo.get('autores_info', '')),
+        'enlace': _safe_strip(articulo.get('enlace', '')),
+        'resumen': _safe_strip(articulo.get('resumen', '')),
+        'citado_por': _safe_strip(articulo.get('citado_por', '')),
+        'year': _safe_strip(articulo.get('year', '')),
+        'venue': _safe_strip(articulo.get('venue', '')),
+        'campos_estudio': _safe_strip(articulo.get('campos_estudio', '')),
+        'paper_id': _safe_strip(articulo.get('paper_id', '')),
+        'citation_count': articulo.get('citation_count', 0),
+        'publication_date': _safe_strip(articulo.get('publication_date', '')),
+        'publication_types': _safe_strip(articulo.get('publication_types', '')),
+        'fecha_extraccion': fecha_extraccion
+    }
+
+
+class EscritorCSV:
+    """
+    Escritor incremental de CSV separados por | con las columnas de COLUMNAS_CSV
+    
+    Escribe cada fila en cuanto llega, así la memoria no depende del número de
+    artículos y, si el proceso se corta, lo ya escrito queda en disco. Vuelca el
+    buffer al archivo cada `filas_por_flush` filas o cada `segundos_por_flush`.
+    
+    Uso:
+        with EscritorCSV("data/resultados.csv", modo='a') as escritor:
+            escritor.escribir_todos(api.iterar_articulos("crispr"))
+    """
+    
+    def __init__(self, ruta: str, modo: str = 'w', filas_por_flush: int = 500,
+                 segundos_por_flush: float = 5.0, fsync: bool = False,
+                 columnas_extra: Optional[List[str]] = None):
+        """
+        Abre el archivo de salida
+        
+        Args:
+            ruta: Ruta del archivo CSV
+            modo: 'w' para crear/sobrescribir, 'a' para añadir a un CSV existente con la misma cabecera
+            filas_por_flush: Filas tras las cuales se vuelca el buffer al archivo
+            segundos_por_flush: Segundos tras los cuales se vuelca el buffer al archivo
+            fsync: Forzar también la escritura física en disco en cada volcado
+            columnas_extra: Columnas añadidas tras las de COLUMNAS_CSV; su valor se toma
+                de la clave del mismo nombre de cada artículo (ej: 'consulta')
+        """
+        if modo not in ('w', 'a'):
+            raise ValueError("modo debe ser 'w' o 'a'")
+        
+        directorio = os.path.dirname(ruta)
+        if directorio and not os.path.exists(directorio):
+            os.makedirs(directorio)
+        
+        self.ruta = os.path.abspath(ruta)
+        self.filas_por_flush = filas_por_flush
+        self.segundos_por_flush = segundos_por_flush
+        self.fsync = fsync
+        self.columnas = COLUMNAS_CSV + list(columnas_extra or [])
+        self.filas_escritas = 0
+        
+        self._archivo = open(ruta, 'w' if modo == 'w' else 'a+', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._archivo, delimiter='|')
+        self._numero = self._filas_existentes() if modo == 'a' else 0
+        if self._numero == 0 and self._archivo.tell() == 0:
+            self._writer.writerow(self.columnas)
+        
+        self._pendientes = 0
+        self._ultimo_flush = time.monotonic()
+        self._segundo_fecha = None
+        self._fecha = ''
+    
+    def _filas_existentes(self) -> int:
+        """Valida la cabecera de un archivo existente y cuenta sus filas de datos"""
+        self._archivo.seek(0)
+        lector = csv.reader(self._archivo, delimiter='|')
+        cabecera = next(lector, None)
+        filas = sum(1 for _ in lector) if cabecera is not None else 0
+        self._archivo.seek(0, os.SEEK_END)
+        if cabecera is not None and cabecera != self.columnas:
+            self._archivo.close()
+            raise ValueError(f"El archivo {self.ruta} no tiene la cabecera esperada: {cabecera}")
+        return filas
+    
+    def _fecha_actual(self) -> str:
+        """Timestamp de extracción, formateado como mucho una vez por segundo"""
+        segundo = int(time.time())
+        if segundo != self._segundo_fecha:
+            self._segundo_fecha = segundo
+            self._fecha = datetime.fromtimestamp(segundo).strftime("%Y-%m-%d %H:%M:%S")
+        return self._fecha
+    
+    def escribir(self, articulo: Dict):
+        """
+        Escribe una fila
+        
+        Args:
+            articulo: Diccionario con información del artículo
+        """
+        self._numero += 1
+        fila = fila_csv(articulo, self._numero, self._fecha_actual())
+        for columna in self.columnas[len(COLUMNAS_CSV):]:
+            fila[columna] = _safe_strip(articulo.get(columna, ''))
+        self._writer.writerow([fila[columna] for columna in self.columnas])
+        self.filas_escritas += 1
+        self._pendientes += 1
+        if (self._pendientes >= self.filas_por_flush or
+                time.monotonic() - self._ultimo_flush >= self.segundos_por_flush):
+            self.flush()
+    
+    def escribir_todos(self, articulos: Iterable[Dict]) -> int:
+        """
+        Escribe todas las filas de un iterable (lista, generador, etc.) a medida que llegan
+        
+        Args:
+            articulos: Artículos a escribir
+            
+        Returns:
+            Número de filas escritas
+        """
+        escritas = 0
+        for articulo in articulos:
+            self.escribir(articulo)
+            escritas += 1
+        return escritas
+    
+    def flush(self):
+        """Vuelca el buffer al archivo"""
+        self._archivo.flush()
+        if self.fsync:
+            os.fsync(self._archivo.fileno())
+        self._pendientes = 0
+        self._ultimo_flush = time.monotonic()
+    
+    def cerrar(self):
+        """Vuelca lo pendiente y cierra el archivo"""
+        if not self._archivo.closed:
+            self.flush()
+            self._archivo.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.cerrar()
+
+
+def guardar_articulos_csv(articulos: Iterable[Dict], nombre_archivo: Optional[str] = None, query: str = "",
+                          append: bool = False) -> str:
     """
     Guarda los artículos en un archivo CSV separado por |
     
     Args:
-        articulos: Lista de diccionarios con información de artículos
+        articulos: Lista (o cualquier iterable, p. ej. iterar_articulos) de artículos
         nombre_archivo: Nombre del archivo CSV (opcional)
         query: Consulta de búsqueda para incluir en el nombre del archivo
+        append: Añadir al final de un CSV existente en lugar de sobrescribirlo
         
     Returns:
         str: Ruta del archivo creado
@@ -356,42 +1639,8 @@ def guardar_articulos_csv(articulos: List[Dict], nombre_archivo: Optional[str] =
     # Guardar en la carpeta data
     ruta_completa = os.path.join(data_dir, nombre_archivo)
     
-    with open(ruta_completa, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = [
-            'numero', 'titulo', 'autores_info', 'enlace', 'resumen', 
-            'citado_por', 'year', 'venue', 'campos_estudio', 'paper_id',
-            'citation_count', 'publication_date', 'publication_types',
-            'fecha_extraccion'
-        ]
-        
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, delimiter='|')
-        writer.writeheader()
-        
-        fecha_actual = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        for i, articulo in enumerate(articulos, 1):
-            # Función auxiliar para limpiar campos de forma segura
-            def safe_strip(value):
-                if value is None:
-                    return ''
-                return str(value).strip()
-            
-            row = {
-                'numero': i,
-                'titulo': safe_strip(articulo.get('titulo', '')),
-                'autores_info': safe_strip(articulo.get('autores_info', '')),
-                'enlace': safe_strip(articulo.get('enlace', '')),
-                'resumen': safe_strip(articulo.get('resumen', '')),
-                'citado_por': safe_strip(articulo.get('citado_por', '')),
-                'year': safe_strip(articulo.get('year', '')),
-                'venue': safe_strip(articulo.get('venue', '')),
-                'campos_estudio': safe_strip(articulo.get('campos_estudio', '')),
-                'paper_id': safe_strip(articulo.get('paper_id', '')),
-                'citation_count': articulo.get('citation_count', 0),
-                'publication_date': safe_strip(articulo.get('publication_date', '')),
-                'publication_types': safe_strip(articulo.get('publication_types', '')),
-                'fecha_extraccion': fecha_actual
-            }
-            writer.writerow(row)
+    with EscritorCSV(ruta_completa, modo='a' if append else 'w') as escritor:
+        escritor.escribir_todos(articulos)
     
     return os.path.abspath(ruta_completa)
 
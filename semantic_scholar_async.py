@@ -0,0 +1,408 @@
+"""
+Cliente asíncrono para la API de Semantic Scholar
+Misma interfaz que SemanticScholarAPI pero con asyncio, para mantener muchas peticiones en vuelo
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+try:
+    import aiohttp
+except ImportError:  # dependencia opcional, solo necesaria para el cliente asíncrono
+    aiohttp = None
+
+from semantic_scholar_api import (
+    CAMPOS_AUTOR, MAX_RESULTADOS_RELEVANCIA, FiltrosBusqueda, combinar_filtros,
+    normalizar_articulos, plantilla_endpoint, procesar_articulo, resolver_campos
+)
+from semantic_scholar_authors import CAMPOS_CANDIDATO_AUTOR, MAX_CANDIDATOS_AUTOR, elegir_autor, normalizar_nombre
+from semantic_scholar_metrics import MetricasCliente
+from semantic_scholar_rate_limit import RateLimiter, parsear_retry_after
+from semantic_scholar_retry import (
+    CircuitBreaker, CircuitoAbierto, ErrorConexion, ErrorLimiteTasa, ErrorNoEncontrado, ErrorSemanticScholar,
+    ErrorServidor, PoliticaReintentos, ResultadoParcial, error_http
+)
+
+
+class AsyncSemanticScholarAPI:
+    """
+    Cliente asíncrono para la API de Semantic Scholar
+
+    Uso:
+        async with AsyncSemanticScholarAPI(api_key, max_concurrencia=20) as api:
+            resultados = await asyncio.gather(*(api.buscar_articulos(q) for q in consultas))
+    """
+
+    def __init__(self, api_key: Optional[str] = None, max_concurrencia: int = 10, timeout: float = 30,
+                 base_url: str = "https://api.semanticscholar.org/graph/v1",
+                 rate_limiter: Optional[RateLimiter] = None, max_reintentos_429: int = 3,
+                 reintentos: Optional[PoliticaReintentos] = None, circuito: Optional[CircuitBreaker] = None,
+                 metricas: Optional[MetricasCliente] = None):
+        """
+        Inicializa el cliente de la API
+
+        Args:
+            api_key: API key opcional para mayor límite de rate (recomendado)
+            max_concurrencia: Máximo de peticiones simultáneas en vuelo
+            timeout: Tiempo máximo de espera por petición en segundos
+            base_url: URL base de la API (útil para apuntar a un servidor local)
+            rate_limiter: Limitador compartido (puede ser el mismo que usa un cliente síncrono)
+            max_reintentos_429: Reintentos ante errores transitorios (429, 5xx, conexión)
+                si no se pasa una política propia en `reintentos`
+            reintentos: Política de reintentos con backoff (ver semantic_scholar_retry)
+            circuito: Circuit breaker (puede ser el mismo que usa un cliente síncrono)
+            metricas: Métricas y hooks por petición (pueden ser las de un cliente síncrono)
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncSemanticScholarAPI requiere aiohttp: pip install aiohttp")
+
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_concurrencia = max_concurrencia
+        self.headers = {
+            'User-Agent': 'GoogleAcademicoScraper/1.0',
+        }
+
+        if api_key:
+            self.headers['x-api-key'] = api_key
+
+        # Mismos límites por defecto que el cliente síncrono
+        self.rate_limit_delay = 0.1 if api_key else 1.1
+        self.rate_limiter = rate_limiter or RateLimiter(tasa=1 / self.rate_limit_delay)
+        self.max_reintentos_429 = max_reintentos_429
+        self.reintentos = reintentos or PoliticaReintentos(max_reintentos=max_reintentos_429)
+        self.circuito = circuito or CircuitBreaker()
+        self.reintentos_realizados = 0
+        self.metricas = metricas if metricas is not None else MetricasCliente()
+
+        # Papers que no se pudieron normalizar (se conservan los últimos 1000)
+        self.articulos_con_error = 0
+        self.errores_procesado: Deque[Dict] = deque(maxlen=1000)
+
+        # Nombre de autor normalizado -> authorId (None si no hubo candidatos)
+        self._autores: Dict[str, Optional[str]] = {}
+
+        self._semaforo = asyncio.Semaphore(max_concurrencia)
+        self._sesion_http: Optional['aiohttp.ClientSession'] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Cierra la sesión HTTP y sus conexiones"""
+        if self._sesion_http is not None:
+            await self._sesion_http.close()
+            self._sesion_http = None
+
+    def _sesion(self) -> 'aiohttp.ClientSession':
+        """Crea la sesión la primera vez (debe hacerse dentro del event loop)"""
+        if self._sesion_http is None:
+            self._sesion_http = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrencia),
+            )
+        return self._sesion_http
+
+    async def _request(self, metodo: str, ruta: str, params: Optional[Dict] = None,
+                       cuerpo: Optional[Dict] = None):
+        """
+        Punto único por el que pasan todas las peticiones HTTP del cliente
+
+        Args:
+            metodo: Método HTTP ('GET' o 'POST')
+            ruta: Ruta del endpoint relativa a base_url
+            params: Parámetros de la query string
+            cuerpo: Cuerpo JSON de la petición (opcional)
+
+        Returns:
+            Respuesta JSON decodificada
+
+        Raises:
+            ErrorSemanticScholar: Error tipado tras agotar los reintentos (ver semantic_scholar_retry)
+        """
+        url = f"{self.base_url}{ruta}"
+        endpoint = plantilla_endpoint(ruta)
+        enviados = len(json.dumps(cuerpo).encode('utf-8')) if cuerpo is not None else 0
+        async with self._semaforo:
+            intento = 0
+            while True:
+                try:
+                    self.circuito.antes(ruta)
+                except CircuitoAbierto as e:
+                    self.metricas.registrar_error(endpoint, e)
+                    raise
+                # Si el intento termina con una excepción inesperada (un hook, una
+                # cancelación...) se cuenta como fallo: así la sonda
+                # del estado semiabierto del circuito nunca queda pendiente para siempre
+                resuelto = False
+                try:
+                    espera = await self.rate_limiter.adquirir_async()
+                    self.metricas.registrar_espera_limitador(espera)
+                    evento = {'metodo': metodo, 'ruta': ruta, 'endpoint': endpoint, 'params': params,
+                              'intento': intento, 'origen': 'red'}
+                    self.metricas.notificar_antes(evento)
+
+                    estado, contenido, error = None, b'', None
+                    inicio = time.perf_counter()
+                    try:
+                        async with self._sesion().request(metodo, url, params=params, json=cuerpo) as response:
+                            estado = response.status
+                            contenido = await response.read()
+                            if response.status >= 400:
+                                error = error_http(response.status, ruta, contenido.decode('utf-8', 'replace'))
+                                if response.status == 429:
+                                    self.rate_limiter.registrar_limite(
+                                        parsear_retry_after(response.headers.get('Retry-After'))
+                                    )
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        # Conexión rechazada o cortada, timeout, cuerpo truncado...
+                        error = ErrorConexion(f"{metodo} {ruta}: {e!r}", ruta=ruta)
+                    duracion = time.perf_counter() - inicio
+                    if error is None:
+                        try:
+                            data = json.loads(contenido)
+                        except ValueError as e:
+                            # Cuerpo truncado o que no es JSON (p. ej. la página HTML de un proxy)
+                            error = ErrorConexion(f"{metodo} {ruta}: respuesta que no es JSON: {e}", ruta=ruta)
+
+                    self.metricas.registrar_peticion(metodo, endpoint, estado, duracion, enviados, len(contenido))
+                    evento.update(estado=estado, duracion=duracion, bytes_enviados=enviados,
+                                  bytes_recibidos=len(contenido), espera_limitador=espera, error=error)
+                    self.metricas.notificar_despues(evento)
+                    if error is None:
+                        self.circuito.registrar_exito()
+                        resuelto = True
+                        break
+
+                    if isinstance(error, (ErrorServidor, ErrorConexion)):
+                        self.circuito.registrar_fallo()
+                    else:
+                        self.circuito.registrar_exito()
+                    resuelto = True
+                finally:
+                    if not resuelto:
+                        self.circuito.registrar_fallo()
+                if not self.reintentos.debe_reintentar(error, intento, metodo, ruta):
+                    error.intentos = intento + 1
+                    self.metricas.registrar_error(endpoint, error)
+                    raise error
+                pausa = 0.0
+                if not isinstance(error, ErrorLimiteTasa):
+                    pausa = self.reintentos.espera(intento)
+                    await asyncio.sleep(pausa)
+                self.metricas.registrar_reintento(endpoint, error, pausa)
+                intento += 1
+                self.reintentos_realizados += 1
+
+        self.rate_limiter.registrar_exito()
+        return data
+
+    def _normalizar_pagina(self, papers: List[Optional[Dict]], campos: Optional[List[str]] = None,
+                           ruta: str = '') -> List[Optional[Dict]]:
+        """
+        Normaliza una página de papers con normalizar_articulos() y registra los errores
+
+        Args:
+            papers: Lista 'data' de la respuesta
+            campos: Campos pedidos a la API
+            ruta: Endpoint de origen (se guarda con cada error)
+
+        Returns:
+            Artículos en el mismo orden que papers (None en las posiciones nulas o con error)
+        """
+        articulos, errores = normalizar_articulos(papers, campos)
+        self.articulos_con_error += len(errores)
+        for error in errores:
+            error['ruta'] = ruta
+            self.errores_procesado.append(error)
+        return articulos
+
+    async def buscar_articulos(self, query: str, num_resultados: int = 10, campos: Optional[List[str]] = None,
+                               año_desde: Optional[int] = None, año_hasta: Optional[int] = None,
+                               filtros: Optional[FiltrosBusqueda] = None) -> List[Dict]:
+        """
+        Busca artículos científicos por término de búsqueda
+
+        Las páginas necesarias (de 100 en 100) se piden en paralelo.
+
+        Args:
+            query: Término de búsqueda
+            num_resultados: Número de resultados a retornar (máximo 1000)
+            campos: Campos a pedir: lista de campos de la API, columnas de salida o
+                preset ('ids-only', 'metadata', 'full'); ver resolver_campos()
+            año_desde: Año mínimo de publicación (opcional)
+            año_hasta: Año máximo de publicación (opcional)
+            filtros: Filtros aplicados por el servidor (citas, venue, campos de estudio, ...)
+
+        Returns:
+            ResultadoParcial (una lista) con los artículos; si alguna página falla tras
+            agotar los reintentos conserva las demás y los errores en `errores`
+        """
+        campos = resolver_campos(campos)
+        params_filtros = combinar_filtros(filtros, año_desde, año_hasta).parametros("/paper/search")
+
+        num_resultados = min(num_resultados, MAX_RESULTADOS_RELEVANCIA)
+        if num_resultados <= 0:
+            return ResultadoParcial()
+
+        def params_pagina(offset: int) -> Dict:
+            return {
+                'query': query,
+                'offset': offset,
+                'limit': min(100, num_resultados - offset),
+                'fields': ','.join(campos),
+                **params_filtros
+            }
+
+        articulos = ResultadoParcial()
+        try:
+            primera = await self._request('GET', "/paper/search", params_pagina(0))
+        except ErrorSemanticScholar as e:
+            articulos.errores.append(e)
+            return articulos
+
+        # El resto de páginas en paralelo; una que falla no descarta las demás
+        offsets = range(100, min(num_resultados, primera.get('total', 0)), 100)
+        paginas = [primera] + await asyncio.gather(
+            *(self._request('GET', "/paper/search", params_pagina(offset)) for offset in offsets),
+            return_exceptions=True
+        )
+        for pagina in paginas:
+            if isinstance(pagina, BaseException):
+                articulos.errores.append(pagina)
+                continue
+            articulos.extend(
+                articulo for articulo in self._normalizar_pagina(pagina.get('data') or [], campos, "/paper/search")
+                if articulo
+            )
+        del articulos[num_resultados:]
+        return articulos
+
+    async def resolver_autor(self, nombre: str) -> Optional[str]:
+        """
+        Traduce un nombre a authorId con la misma heurística que AutoresSemanticScholar
+
+        Los candidatos se piden a /author/search y se elige con elegir_autor().
+        Cada nombre se resuelve una sola vez por cliente (caché en memoria); las
+        fijaciones manuales solo existen en AutoresSemanticScholar.
+
+        Args:
+            nombre: Nombre del autor
+
+        Returns:
+            authorId, o None si no hay candidatos
+        """
+        clave = normalizar_nombre(nombre)
+        if clave not in self._autores:
+            data = await self._request('GET', "/author/search", {
+                'query': nombre, 'limit': MAX_CANDIDATOS_AUTOR, 'fields': ','.join(CAMPOS_CANDIDATO_AUTOR)
+            })
+            self._autores[clave] = elegir_autor(nombre, data.get('data') or [])
+        return self._autores[clave]
+
+    async def buscar_por_autor(self, autor: str, num_resultados: int = 10,
+                               año_desde: Optional[int] = None, año_hasta: Optional[int] = None,
+                               filtros: Optional[FiltrosBusqueda] = None) -> List[Dict]:
+        """
+        Busca artículos de un autor específico
+
+        El nombre se resuelve con resolver_autor() y los papers se piden página a
+        página (hasta 1000 por petición) hasta reunir num_resultados.
+
+        Args:
+            autor: Nombre del autor
+            num_resultados: Número de resultados a retornar
+            año_desde: Año mínimo de publicación (opcional)
+            año_hasta: Año máximo de publicación (opcional)
+            filtros: Filtros adicionales; este endpoint solo aplica el de años en el
+                servidor, el resto se comprueban localmente
+
+        Returns:
+            ResultadoParcial (una lista) con los artículos del autor; si una petición
+            falla tras agotar los reintentos conserva las páginas anteriores y el
+            error queda en `errores`
+        """
+        articulos = ResultadoParcial()
+        try:
+            author_id = await self.resolver_autor(autor)
+
+            if author_id is None:
+                print(f"No se encontró el autor: {autor}")
+                return articulos
+
+            endpoint = "/author/{id}/papers"
+            filtros = combinar_filtros(filtros, año_desde, año_hasta)
+            filtrar = bool(filtros.locales(endpoint))
+            params = {'fields': ','.join(resolver_campos(CAMPOS_AUTOR + filtros.campos_locales(endpoint))),
+                      **filtros.parametros(endpoint)}
+
+            offset = 0
+            while len(articulos) < num_resultados:
+                limite = 1000 if filtrar else min(num_resultados - len(articulos), 1000)
+                data = await self._request('GET', f"/author/{author_id}/papers",
+                                           dict(params, offset=offset, limit=limite))
+                papers = data.get('data') or []
+                if filtrar:
+                    papers = [paper for paper in papers if filtros.cumple(paper, endpoint)]
+                articulos.extend(
+                    articulo for articulo in self._normalizar_pagina(papers, CAMPOS_AUTOR, endpoint) if articulo
+                )
+                siguiente = data.get('next')
+                if siguiente is None or not data.get('data'):
+                    break
+                offset = siguiente
+        except ErrorSemanticScholar as e:
+            articulos.errores.append(e)
+        del articulos[num_resultados:]
+        return articulos
+
+    async def buscar_por_titulo(self, titulo: str, num_resultados: int = 10,
+                                año_desde: Optional[int] = None, año_hasta: Optional[int] = None,
+                                filtros: Optional[FiltrosBusqueda] = None) -> List[Dict]:
+        """
+        Busca artículos por título específico
+
+        Args:
+            titulo: Título del artículo (puede ser parcial)
+            num_resultados: Número de resultados a retornar
+            año_desde: Año mínimo de publicación (opcional)
+            año_hasta: Año máximo de publicación (opcional)
+            filtros: Filtros aplicados por el servidor (citas, venue, campos de estudio, ...)
+
+        Returns:
+            Lista de artículos con ese título
+        """
+        query_titulo = f'"{titulo}"'
+        return await self.buscar_articulos(query_titulo, num_resultados, año_desde=año_desde, año_hasta=año_hasta,
+                                           filtros=filtros)
+
+    async def obtener_articulo_por_id(self, paper_id: str, campos: Optional[List[str]] = None) -> Optional[Dict]:
+        """
+        Obtiene un artículo específico por su ID de Semantic Scholar
+
+        Args:
+            paper_id: ID del paper en Semantic Scholar
+            campos: Campos a pedir: lista de campos de la API, columnas de salida o
+                preset ('ids-only', 'metadata', 'full'); ver resolver_campos()
+
+        Returns:
+            Diccionario con información del artículo o None si el paper no existe (404)
+
+        Raises:
+            ErrorSemanticScholar: Cualquier otro fallo (5xx o 429 tras los reintentos,
+                conexión, circuito abierto...), para no confundirlo con "no existe"
+        """
+        campos = resolver_campos(campos)
+
+        try:
+            paper = await self._request('GET', f"/paper/{paper_id}", {'fields': ','.join(campos)})
+        except ErrorNoEncontrado:
+            return None
+        return procesar_articulo(paper)
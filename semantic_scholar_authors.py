@@ -0,0 +1,285 @@
+"""
+Autores de Semantic Scholar
+Resolución de nombres a authorId con caché (opcionalmente persistente) y fijación manual,
+bibliografías completas paginadas y metadatos por lotes con /author/batch
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+from semantic_scholar_api import SemanticScholarAPI
+
+
+# El endpoint POST /author/batch acepta hasta 1000 IDs por petición
+MAX_IDS_AUTOR_POR_LOTE = 1000
+
+# Campos pedidos para cada candidato y en los metadatos por lotes
+CAMPOS_CANDIDATO_AUTOR = ['authorId', 'name', 'affiliations', 'paperCount', 'citationCount', 'hIndex']
+
+# Candidatos pedidos a /author/search por nombre
+MAX_CANDIDATOS_AUTOR = 10
+
+# Archivo de caché que usa la línea de comandos (en la API la persistencia es opcional)
+RUTA_CACHE_AUTORES = os.path.join("data", "autores_semantic_scholar.sqlite")
+
+
+def normalizar_nombre(nombre: str) -> str:
+    """
+    Normaliza un nombre de autor para usarlo como clave de caché
+
+    Quita acentos y puntuación, pasa a minúsculas y colapsa espacios:
+    'José  García-López' y 'jose garcia lopez' comparten clave.
+
+    Args:
+        nombre: Nombre tal como lo escribe el usuario
+
+    Returns:
+        Nombre normalizado
+    """
+    sin_acentos = unicodedata.normalize('NFKD', nombre).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(re.sub(r'[^\w\s]', ' ', sin_acentos.lower()).split())
+
+
+def elegir_autor(nombre: str, candidatos: List[Dict]) -> Optional[str]:
+    """
+    Elige el authorId que corresponde a un nombre entre los candidatos de /author/search
+
+    Prefiere el candidato con más papers entre los que tienen exactamente el
+    mismo nombre normalizado; si ninguno coincide, el primero de la API. Es la
+    heurística común del cliente síncrono y del asíncrono.
+
+    Args:
+        nombre: Nombre del autor
+        candidatos: Candidatos en el orden de relevancia de la API
+
+    Returns:
+        authorId, o None si no hay candidatos
+    """
+    if not candidatos:
+        return None
+    clave = normalizar_nombre(nombre)
+    exactos = [c for c in candidatos if normalizar_nombre(c.get('name') or '') == clave]
+    if exactos:
+        return max(exactos, key=lambda c: c.get('paperCount') or 0)['authorId']
+    return candidatos[0]['authorId']
+
+
+class AutoresSemanticScholar:
+    """
+    Operaciones sobre autores con caché de resolución de nombres
+
+    La búsqueda de candidatos de cada nombre se guarda en SQLite (con TTL), así
+    repetir un nombre no cuesta ninguna petición. Con fijar() se elige a mano el
+    autor correcto entre homónimos y esa elección prevalece sobre la heurística.
+    Por defecto la base vive en memoria y se pierde al cerrar; con `ruta_cache`
+    se guarda en un archivo y se comparte entre ejecuciones.
+    """
+
+    def __init__(self, api: SemanticScholarAPI, ruta_cache: Optional[str] = None,
+                 ttl_candidatos: float = 30 * 24 * 3600, max_candidatos: int = MAX_CANDIDATOS_AUTOR):
+        """
+        Inicializa el gestor de autores
+
+        Args:
+            api: Cliente de Semantic Scholar
+            ruta_cache: Archivo SQLite donde persistir los candidatos y las fijaciones
+                (None = solo en memoria; ej: RUTA_CACHE_AUTORES)
+            ttl_candidatos: Segundos que se reutilizan los candidatos de un nombre
+            max_candidatos: Candidatos a pedir por nombre
+        """
+        if ruta_cache:
+            directorio = os.path.dirname(ruta_cache)
+            if directorio and not os.path.exists(directorio):
+                os.makedirs(directorio)
+
+        self.api = api
+        self.ruta_cache = ruta_cache
+        self.ttl_candidatos = ttl_candidatos
+        self.max_candidatos = max_candidatos
+
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta_cache or ':memory:', check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS candidatos (nombre TEXT PRIMARY KEY, datos TEXT, expira REAL)"
+        )
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS fijados (nombre TEXT PRIMARY KEY, author_id TEXT)"
+        )
+        self._conexion.commit()
+
+    def candidatos(self, nombre: str, refrescar: bool = False) -> List[Dict]:
+        """
+        Devuelve todos los autores que coinciden con un nombre
+
+        Args:
+            nombre: Nombre del autor
+            refrescar: Ignorar la caché y volver a preguntar a la API
+
+        Returns:
+            Lista de candidatos (authorId, name, affiliations, paperCount, citationCount, hIndex)
+            en el orden de relevancia de la API
+        """
+        clave = normalizar_nombre(nombre)
+        if not refrescar:
+            with self._lock:
+                fila = self._conexion.execute(
+                    "SELECT datos, expira FROM candidatos WHERE nombre = ?", (clave,)
+                ).fetchone()
+            if fila and fila[1] >= time.time():
+                return json.loads(fila[0])
+
+        data = self.api.consultar("/author/search", {
+            'query': nombre, 'limit': self.max_candidatos, 'fields': ','.join(CAMPOS_CANDIDATO_AUTOR)
+        })
+        candidatos = data.get('data') or []
+        with self._lock:
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO candidatos (nombre, datos, expira) VALUES (?, ?, ?)",
+                (clave, json.dumps(candidatos, ensure_ascii=False), time.time() + self.ttl_candidatos)
+            )
+            self._conexion.commit()
+        return candidatos
+
+    def fijar(self, nombre: str, author_id: Optional[str]):
+        """
+        Fija el authorId que debe usarse para un nombre (None elimina la fijación)
+
+        Args:
+            nombre: Nombre del autor
+            author_id: ID elegido, normalmente uno de candidatos(nombre)
+        """
+        clave = normalizar_nombre(nombre)
+        with self._lock:
+            if author_id is None:
+                self._conexion.execute("DELETE FROM fijados WHERE nombre = ?", (clave,))
+            else:
+                self._conexion.execute(
+                    "INSERT OR REPLACE INTO fijados (nombre, author_id) VALUES (?, ?)", (clave, str(author_id))
+                )
+            self._conexion.commit()
+
+    def resolver(self, nombre: str) -> Optional[str]:
+        """
+        Traduce un nombre a authorId
+
+        Usa la fijación si existe; si no, elige entre los candidatos con
+        elegir_autor().
+
+        Args:
+            nombre: Nombre del autor
+
+        Returns:
+            authorId, o None si no hay candidatos
+        """
+        clave = normalizar_nombre(nombre)
+        with self._lock:
+            fila = self._conexion.execute("SELECT author_id FROM fijados WHERE nombre = ?", (clave,)).fetchone()
+        if fila:
+            return fila[0]
+
+        return elegir_autor(nombre, self.candidatos(nombre))
+
+    def iterar_papers(self, autor: str, max_resultados: Optional[int] = None, campos=None,
+                      año_desde: Optional[int] = None, año_hasta: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Recorre la bibliografía completa de un autor (sin el tope de 100 de buscar_por_autor)
+
+        Args:
+            autor: authorId o nombre (se resuelve con resolver())
+            max_resultados: Máximo de papers (None = todos)
+            campos: Campos a pedir; ver resolver_campos()
+            año_desde: Año mínimo de publicación (opcional)
+            año_hasta: Año máximo de publicación (opcional)
+
+        Yields:
+            Artículos normalizados
+        """
+        author_id = autor if autor.isdigit() else self.resolver(autor)
+        if author_id is None:
+            return
+        yield from self.api.iterar_papers_autor(author_id, max_resultados, campos, año_desde, año_hasta)
+
+    def bibliografias(self, autores: Iterable[str], max_resultados: Optional[int] = None, campos=None,
+                      año_desde: Optional[int] = None, año_hasta: Optional[int] = None,
+                      max_workers: int = 4) -> Dict[str, List[Dict]]:
+        """
+        Descarga las bibliografías de varios autores en paralelo
+
+        Args:
+            autores: authorIds o nombres
+            max_resultados: Máximo de papers por autor (None = todos)
+            campos: Campos a pedir; ver resolver_campos()
+            año_desde: Año mínimo de publicación (opcional)
+            año_hasta: Año máximo de publicación (opcional)
+            max_workers: Autores descargados simultáneamente
+
+        Returns:
+            Diccionario autor -> lista de artículos (vacía si no se resolvió o falló;
+            si falla a mitad se conserva lo descargado)
+        """
+        def descargar(autor: str) -> List[Dict]:
+            articulos = []
+            try:
+                for articulo in self.iterar_papers(autor, max_resultados, campos, año_desde, año_hasta):
+                    articulos.append(articulo)
+            except requests.exceptions.RequestException as e:
+                print(f"Error al obtener la bibliografía de {autor}: {e}")
+            return articulos
+
+        autores = list(dict.fromkeys(autores))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(autores, executor.map(descargar, autores)))
+
+    def obtener_autores(self, author_ids: List[str], campos: Optional[List[str]] = None,
+                        max_workers: int = 4) -> List[Optional[Dict]]:
+        """
+        Obtiene metadatos de muchos autores con POST /author/batch
+
+        Args:
+            author_ids: IDs de autor
+            campos: Campos de autor a pedir (default: CAMPOS_CANDIDATO_AUTOR)
+            max_workers: Lotes pedidos simultáneamente
+
+        Returns:
+            Lista en el mismo orden que author_ids, con None para los no encontrados
+            o cuyo lote falló
+        """
+        campos = campos or CAMPOS_CANDIDATO_AUTOR
+        author_ids = [str(author_id) for author_id in author_ids]
+        lotes = [author_ids[i:i + MAX_IDS_AUTOR_POR_LOTE]
+                 for i in range(0, len(author_ids), MAX_IDS_AUTOR_POR_LOTE)]
+        params = {'fields': ','.join(campos)}
+
+        def pedir_lote(lote: List[str]) -> List[Optional[Dict]]:
+            try:
+                return self.api.consultar("/author/batch", params, {'ids': lote})
+            except requests.exceptions.RequestException as e:
+                print(f"Error al obtener lote de {len(lote)} autores: {e}")
+                return [None] * len(lote)
+
+        resultados: List[Optional[Dict]] = []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(lotes)))) as executor:
+            for autores_lote in executor.map(pedir_lote, lotes):
+                resultados.extend(autores_lote)
+        return resultados
+
+    def cerrar(self):
+        """Cierra la caché (en memoria se descarta)"""
+        with self._lock:
+            self._conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cerrar()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Ejecución por lotes de búsquedas en Semantic Scholar
+Lee un archivo de consultas y las ejecuta en paralelo con un único cliente y rate limiter
+"""
+
+import argparse
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from typing import Dict, Iterator, List, Optional
+
+from semantic_scholar_api import SemanticScholarAPI, guardar_articulos_csv
+from semantic_scholar_metrics import percentil
+from semantic_scholar_sinks import SinkCSV
+
+# Artículos de una consulta que se escriben de una vez en el CSV combinado (una página de la API)
+FILAS_POR_ESCRITURA = 100
+
+
+def _entero_o_none(valor) -> Optional[int]:
+    """Convierte a int, o None si el valor está vacío"""
+    if valor is None or str(valor).strip() == '':
+        return None
+    return int(valor)
+
+
+def _consulta(query: str, año_desde=None, año_hasta=None, num_resultados=None) -> Dict:
+    """Construye el diccionario normalizado de una consulta"""
+    return {
+        'query': query.strip(),
+        'año_desde': _entero_o_none(año_desde),
+        'año_hasta': _entero_o_none(año_hasta),
+        'num_resultados': _entero_o_none(num_resultados) or 10,
+    }
+
+
+def cargar_consultas(ruta: str) -> List[Dict]:
+    """
+    Lee un archivo de consultas
+
+    Formatos admitidos según la extensión:
+        .txt   una consulta por línea: `query | 2020-2024 | 50` (rango y número opcionales)
+        .csv   columnas query, año_desde, año_hasta, num_resultados (separador , o |)
+        .jsonl un objeto por línea con las mismas claves
+
+    Las líneas vacías y las que empiezan por # se ignoran.
+
+    Args:
+        ruta: Ruta del archivo
+
+    Returns:
+        Lista de diccionarios con query, año_desde, año_hasta y num_resultados
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    consultas = []
+
+    with open(ruta, encoding='utf-8') as archivo:
+        if extension == '.csv':
+            cabecera = archivo.readline()
+            archivo.seek(0)
+            delimitador = '|' if '|' in cabecera else ','
+            for fila in csv.DictReader(archivo, delimiter=delimitador):
+                if fila.get('query', '').strip():
+                    consultas.append(_consulta(
+                        fila['query'], fila.get('año_desde'), fila.get('año_hasta'), fila.get('num_resultados')
+                    ))
+            return consultas
+
+        for linea in archivo:
+            linea = linea.strip()
+            if not linea or linea.startswith('#'):
+                continue
+
+            if extension in ('.jsonl', '.ndjson'):
+                datos = json.loads(linea)
+                consultas.append(_consulta(
+                    datos['query'], datos.get('año_desde'), datos.get('año_hasta'), datos.get('num_resultados')
+                ))
+                continue
+
+            partes = [parte.strip() for parte in linea.split('|')]
+            año_desde = año_hasta = num_resultados = None
+            if len(partes) > 1 and partes[1]:
+                desde, _, hasta = partes[1].partition('-')
+                año_desde, año_hasta = desde, hasta if _ else desde
+            if len(partes) > 2:
+                num_resultados = partes[2]
+            consultas.append(_consulta(partes[0], año_desde, año_hasta, num_resultados))
+
+    return consultas
+
+
+def ejecutar_lote(api: SemanticScholarAPI, consultas: List[Dict], max_workers: int = 4,
+                  archivo_combinado: Optional[str] = None) -> Dict:
+    """
+    Ejecuta todas las consultas en paralelo compartiendo el cliente (y su rate limiter)
+
+    Args:
+        api: Cliente de Semantic Scholar compartido por todos los hilos
+        consultas: Consultas devueltas por cargar_consultas()
+        max_workers: Número de consultas simultáneas
+        archivo_combinado: Ruta de un único CSV con todos los resultados (con una
+            columna extra `consulta`); si es None se escribe un CSV por consulta con
+            guardar_articulos_csv en data/
+
+    Los artículos se escriben a medida que llegan, sin acumular los resultados
+    de una consulta en memoria.
+
+    Returns:
+        Resumen con totales, errores, throughput, percentiles de latencia y detalle por consulta
+    """
+    sink = SinkCSV(archivo_combinado, columnas_extra=['consulta']) if archivo_combinado else None
+    lock_sink = threading.Lock()
+
+    def ejecutar(indice: int, consulta: Dict) -> Dict:
+        resultado = {'indice': indice, 'query': consulta['query'], 'articulos': 0, 'error': None, 'archivo': None}
+        inicio = time.perf_counter()
+
+        def recorrer() -> Iterator[Dict]:
+            # Los artículos pasan al CSV a medida que llegan; si la consulta falla a
+            # mitad, lo ya descargado queda escrito y el error en su resultado
+            try:
+                for articulo in api.iterar_articulos(consulta['query'], consulta['num_resultados'],
+                                                     año_desde=consulta['año_desde'],
+                                                     año_hasta=consulta['año_hasta']):
+                    resultado['articulos'] += 1
+                    yield articulo
+            except Exception as e:
+                # Cualquier fallo (red, artículo mal formado, bug) se queda en su consulta:
+                # un error no debe tumbar el lote entero ni perder el resumen
+                resultado['error'] = str(e) or type(e).__name__
+
+        try:
+            articulos = recorrer()
+            if sink is not None:
+                # Una página cada vez, etiquetada con su consulta para poder separar el CSV
+                while True:
+                    pagina = [dict(articulo, consulta=consulta['query'])
+                              for articulo in islice(articulos, FILAS_POR_ESCRITURA)]
+                    if not pagina:
+                        break
+                    with lock_sink:
+                        sink.escribir_lote(pagina)
+                        sink.flush()
+            else:
+                primero = next(articulos, None)
+                if primero is not None:
+                    resultado['archivo'] = guardar_articulos_csv(chain([primero], articulos),
+                                                                 query=f"{indice:04d}_{consulta['query']}")
+        except Exception as e:
+            resultado['error'] = resultado['error'] or f"Error al guardar: {e}"
+        resultado['latencia'] = time.perf_counter() - inicio
+        return resultado
+
+    inicio = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            resultados = list(executor.map(ejecutar, range(1, len(consultas) + 1), consultas))
+    finally:
+        if sink is not None:
+            sink.cerrar()
+    duracion = time.perf_counter() - inicio
+
+    latencias = [r['latencia'] for r in resultados]
+    total_articulos = sum(r['articulos'] for r in resultados)
+    return {
+        'consultas': len(resultados),
+        'errores': sum(1 for r in resultados if r['error']),
+        'articulos': total_articulos,
+        'duracion_s': duracion,
+        'consultas_por_s': len(resultados) / duracion if duracion else 0.0,
+        'articulos_por_s': total_articulos / duracion if duracion else 0.0,
+        'latencia_p50_s': percentil(latencias, 50),
+        'latencia_p95_s': percentil(latencias, 95),
+        'latencia_p99_s': percentil(latencias, 99),
+        'archivo_combinado': os.path.abspath(archivo_combinado) if archivo_combinado else None,
+        'detalle': resultados,
+    }
+
+
+def imprimir_resumen(resumen: Dict):
+    """
+    Muestra el resumen de un lote de forma legible
+
+    Args:
+        resumen: Diccionario devuelto por ejecutar_lote()
+    """
+    print(f"\n{'='*60}")
+    print("📊 RESUMEN DEL LOTE")
+    print(f"{'='*60}")
+    print(f"Consultas:        {resumen['consultas']} ({resumen['errores']} con error)")
+    print(f"Artículos:        {resumen['articulos']}")
+    print(f"Duración:         {resumen['duracion_s']:.2f} s")
+    print(f"Throughput:       {resumen['consultas_por_s']:.2f} consultas/s, "
+          f"{resumen['articulos_por_s']:.1f} artículos/s")
+    print(f"Latencia p50/p95/p99: {resumen['latencia_p50_s']:.3f} / "
+          f"{resumen['latencia_p95_s']:.3f} / {resumen['latencia_p99_s']:.3f} s")
+    if resumen['archivo_combinado']:
+        print(f"📁 Archivo: {resumen['archivo_combinado']}")
+    for detalle in resumen['detalle']:
+        if detalle['error']:
+            print(f"❌ [{detalle['indice']}] {detalle['query']}: {detalle['error']}")
+
+
+def main():
+    """Punto de entrada por línea de comandos"""
+    parser = argparse.ArgumentParser(description="Ejecuta un archivo de consultas contra Semantic Scholar")
+    parser.add_argument('consultas', help="Archivo .txt, .csv o .jsonl con las consultas")
+    parser.add_argument('--workers', type=int, default=4, help="Consultas simultáneas (default: 4)")
+    parser.add_argument('--combinado', help="Escribir todos los resultados en un único CSV")
+    parser.add_argument('--api-key', default=os.environ.get('SEMANTIC_SCHOLAR_API_KEY'),
+                        help="API key (default: variable SEMANTIC_SCHOLAR_API_KEY)")
+    args = parser.parse_args()
+
+    consultas = cargar_consultas(args.consultas)
+    print(f"🚀 Ejecutando {len(consultas)} consultas con {args.workers} workers...")
+    with SemanticScholarAPI(args.api_key, pool_size=max(10, args.workers)) as api:
+        resumen = ejecutar_lote(api, consultas, args.workers, args.combinado)
+    imprimir_resumen(resumen)
+
+
+if __name__ == "__main__":
+    main()
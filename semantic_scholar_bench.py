@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Benchmarks del cliente de Semantic Scholar
+Se ejecutan contra el servidor local de semantic_scholar_fake_server, sin red.
+Con --linea-base comparan los resultados con una ejecución anterior y terminan
+con código 1 si alguna métrica empeora más que el umbral
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import cycle, islice
+from typing import Callable, Dict, List, Sequence
+
+import requests
+
+from semantic_scholar_api import (
+    Articulo, EscritorCSV, SemanticScholarAPI, normalizar_articulos, procesar_articulo
+)
+from semantic_scholar_fake_server import ServidorFalso, generar_paper, paper_id_sintetico
+from semantic_scholar_metrics import percentil
+from semantic_scholar_rate_limit import RateLimiter
+
+
+# Tamaños de carga de los micro-benchmarks
+TAMAÑOS_CARGA = (10000, 100000, 1000000)
+
+# Papers distintos que se generan; las cargas mayores los reutilizan en bucle
+# para que el tiempo de generación y la memoria de la entrada no cuenten
+_PAPERS_BASE = 10000
+
+# Tamaño de página con el que llegan los papers (como /paper/search/bulk)
+_TAMAÑO_PAGINA = 1000
+
+# Empeoramiento relativo tolerado respecto a la línea base
+UMBRAL_REGRESION = 0.20
+
+
+def _sin_limite() -> RateLimiter:
+    """Limitador con tasa prácticamente infinita para medir solo el cliente"""
+    return RateLimiter(tasa=1e9, capacidad=1e9)
+
+
+def benchmark_conexiones(num_peticiones: int = 300) -> Dict[str, float]:
+    """
+    Compara una conexión nueva por petición (requests.get) con el pool keep-alive del cliente
+
+    Args:
+        num_peticiones: Número de búsquedas por ID a realizar en cada modo
+
+    Returns:
+        Diccionario con milisegundos por petición de cada modo y el ahorro relativo
+    """
+    with ServidorFalso() as servidor:
+        ids = [paper_id_sintetico(i % servidor.total_papers) for i in range(num_peticiones)]
+        params = {'fields': 'paperId,title'}
+
+        inicio = time.perf_counter()
+        for paper_id in ids:
+            response = requests.get(f"{servidor.base_url}/paper/{paper_id}", params=params, timeout=30)
+            response.raise_for_status()
+            response.json()
+        sin_pool = (time.perf_counter() - inicio) / num_peticiones * 1000
+
+        with SemanticScholarAPI(base_url=servidor.base_url, rate_limiter=_sin_limite()) as api:
+            inicio = time.perf_counter()
+            for paper_id in ids:
+                api.consultar(f"/paper/{paper_id}", params)
+            con_pool = (time.perf_counter() - inicio) / num_peticiones * 1000
+
+    return {
+        'ms_por_peticion_sin_pool': sin_pool,
+        'ms_por_peticion_con_pool': con_pool,
+        'ahorro_relativo': 1 - con_pool / sin_pool,
+    }
+
+
+def benchmark_registros(num_articulos: int = 100000) -> Dict[str, float]:
+    """
+    Compara los diccionarios de procesar_articulo() con los registros compactos Articulo
+
+    Mide la memoria retenida por la lista de registros y el tiempo de construirlos
+    y de leer solo los campos crudos (paper_id, year, citation_count), que es lo que
+    consumen la mayoría de procesos por lotes.
+
+    Args:
+        num_articulos: Número de papers sintéticos a normalizar
+
+    Returns:
+        Diccionario con bytes por registro y microsegundos por registro de cada modo
+    """
+    papers = [generar_paper(i) for i in range(num_articulos)]
+    resultado = {}
+
+    for nombre, normalizar in (('dict', procesar_articulo), ('articulo', Articulo.desde_paper)):
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        registros = [normalizar(paper) for paper in papers]
+        construccion = time.perf_counter() - inicio
+        memoria = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        inicio = time.perf_counter()
+        for registro in registros:
+            registro['paper_id'], registro['year'], registro['citation_count']
+        lectura = time.perf_counter() - inicio
+        del registros
+
+        resultado[f'bytes_por_registro_{nombre}'] = memoria / num_articulos
+        resultado[f'us_construccion_{nombre}'] = construccion / num_articulos * 1e6
+        resultado[f'us_lectura_{nombre}'] = lectura / num_articulos * 1e6
+
+    resultado['ahorro_memoria'] = 1 - resultado['bytes_por_registro_articulo'] / resultado['bytes_por_registro_dict']
+    return resultado
+
+
+def percentiles(valores: Sequence[float], cuantiles: Sequence[int] = (50, 95, 99)) -> Dict[str, float]:
+    """
+    Varios percentiles a la vez (ver semantic_scholar_metrics.percentil)
+
+    Args:
+        valores: Muestras
+        cuantiles: Percentiles a calcular (0-100)
+
+    Returns:
+        Diccionario 'p50' -> valor, ...
+    """
+    ordenados = sorted(valores)
+    return {f"p{q}": percentil(ordenados, q) for q in cuantiles}
+
+
+def _paginas_sinteticas(num_articulos: int) -> List[List[Dict]]:
+    """Páginas de papers crudos que suman num_articulos (reutilizando _PAPERS_BASE papers)"""
+    base = [generar_paper(i) for i in range(min(num_articulos, _PAPERS_BASE))]
+    paginas_base = [base[i:i + _TAMAÑO_PAGINA] for i in range(0, len(base), _TAMAÑO_PAGINA)]
+    paginas = []
+    restantes = num_articulos
+    for pagina in cycle(paginas_base):
+        if restantes <= 0:
+            return paginas
+        paginas.append(pagina[:restantes])
+        restantes -= len(paginas[-1])
+    return paginas
+
+
+def benchmark_normalizacion(num_articulos: int = 100000) -> Dict[str, float]:
+    """
+    Mide normalizar_articulos() página a página, como llega la respuesta de la API
+
+    Args:
+        num_articulos: Papers a normalizar (las páginas se reutilizan para cargas grandes)
+
+    Returns:
+        Diccionario con articulos_por_s, us_por_articulo y mb_pico (memoria máxima
+        asignada durante la normalización, sin contar la entrada)
+    """
+    paginas = _paginas_sinteticas(num_articulos)
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    for pagina in paginas:
+        normalizar_articulos(pagina)
+    duracion = time.perf_counter() - inicio
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'articulos_por_s': num_articulos / duracion,
+        'us_por_articulo': duracion / num_articulos * 1e6,
+        'mb_pico': pico / 2 ** 20,
+    }
+
+
+def benchmark_csv(num_articulos: int = 100000) -> Dict[str, float]:
+    """
+    Mide la escritura en streaming de artículos normalizados con EscritorCSV
+
+    Args:
+        num_articulos: Filas a escribir (los artículos se reutilizan en bucle)
+
+    Returns:
+        Diccionario con filas_por_s, us_por_fila, mb_archivo y mb_pico
+    """
+    base = [procesar_articulo(generar_paper(i)) for i in range(min(num_articulos, _PAPERS_BASE))]
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "bench.csv")
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        with EscritorCSV(ruta) as escritor:
+            escritor.escribir_todos(islice(cycle(base), num_articulos))
+        duracion = time.perf_counter() - inicio
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        tamaño = os.path.getsize(ruta)
+    return {
+        'filas_por_s': num_articulos / duracion,
+        'us_por_fila': duracion / num_articulos * 1e6,
+        'mb_archivo': tamaño / 2 ** 20,
+        'mb_pico': pico / 2 ** 20,
+    }
+
+
+def _medir_llamadas(llamada: Callable[[int], object], num_llamadas: int, concurrencia: int) -> Dict[str, float]:
+    """Ejecuta llamada(i) num_llamadas veces con `concurrencia` hilos y resume las latencias"""
+    def cronometrar(i: int) -> float:
+        inicio = time.perf_counter()
+        llamada(i)
+        return (time.perf_counter() - inicio) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrencia) as executor:
+        # Calentamiento: abre las conexiones del pool antes de medir
+        list(executor.map(llamada, range(concurrencia)))
+        inicio = time.perf_counter()
+        latencias = list(executor.map(cronometrar, range(num_llamadas)))
+    duracion = time.perf_counter() - inicio
+
+    resultado = {'llamadas_por_s': num_llamadas / duracion}
+    resultado.update({f"ms_{clave}": valor for clave, valor in percentiles(latencias).items()})
+    return resultado
+
+
+def benchmark_extremo_a_extremo(num_llamadas: int = 500, concurrencia: int = 8,
+                                latencia_servidor: float = 0.0) -> Dict[str, Dict[str, float]]:
+    """
+    Throughput y latencia (p50/p95/p99) de búsqueda y lookup contra el servidor local
+
+    Cada llamada de búsqueda pide 100 resultados (una página) y cada lookup un
+    paper por ID, ambas con normalización incluida.
+
+    Args:
+        num_llamadas: Llamadas de cada tipo
+        concurrencia: Hilos que llaman a la vez
+        latencia_servidor: Retardo simulado por respuesta en el servidor (segundos)
+
+    Returns:
+        Diccionario 'busqueda'/'lookup' -> llamadas_por_s, ms_p50, ms_p95, ms_p99
+    """
+    with ServidorFalso(total_papers=10000, latencia=latencia_servidor) as servidor, \
+            SemanticScholarAPI(base_url=servidor.base_url, rate_limiter=_sin_limite(),
+                               pool_size=concurrencia) as api:
+        return {
+            'busqueda': _medir_llamadas(
+                lambda i: api.buscar_articulos(f"consulta {i}", 100), num_llamadas, concurrencia
+            ),
+            'lookup': _medir_llamadas(
+                lambda i: api.obtener_articulo_por_id(paper_id_sintetico(i % servidor.total_papers)),
+                num_llamadas, concurrencia
+            ),
+        }
+
+
+def ejecutar_suite(tamaños: Sequence[int] = TAMAÑOS_CARGA, num_llamadas: int = 500,
+                   concurrencia: int = 8) -> Dict[str, float]:
+    """
+    Ejecuta todos los benchmarks comparables con una línea base
+
+    Args:
+        tamaños: Cargas de los micro-benchmarks de normalización y CSV
+        num_llamadas: Llamadas de cada tipo en el benchmark extremo a extremo
+        concurrencia: Hilos del benchmark extremo a extremo
+
+    Returns:
+        Métricas planas 'grupo.métrica' -> valor
+    """
+    metricas: Dict[str, float] = {}
+    for tamaño in tamaños:
+        print(f"  normalización y CSV con {tamaño:,} artículos...")
+        for clave, valor in benchmark_normalizacion(tamaño).items():
+            metricas[f"normalizacion_{tamaño}.{clave}"] = valor
+        for clave, valor in benchmark_csv(tamaño).items():
+            metricas[f"csv_{tamaño}.{clave}"] = valor
+    print(f"  extremo a extremo: {num_llamadas} llamadas con {concurrencia} hilos...")
+    for grupo, valores in benchmark_extremo_a_extremo(num_llamadas, concurrencia).items():
+        for clave, valor in valores.items():
+            metricas[f"{grupo}.{clave}"] = valor
+    return metricas
+
+
+def _mayor_es_mejor(metrica: str) -> bool:
+    """Las métricas de throughput terminan en _por_s; en el resto (tiempo, memoria) menos es mejor"""
+    return metrica.endswith('_por_s')
+
+
+def comparar_con_linea_base(metricas: Dict[str, float], linea_base: Dict[str, float],
+                            umbral: float = UMBRAL_REGRESION) -> List[Dict]:
+    """
+    Compara métricas con una línea base
+
+    Solo se comparan las métricas presentes en ambas. El tamaño del CSV generado
+    no es de rendimiento y se ignora.
+
+    Args:
+        metricas: Resultado de ejecutar_suite()
+        linea_base: Métricas de una ejecución anterior
+        umbral: Empeoramiento relativo tolerado (0.2 = 20 %)
+
+    Returns:
+        Lista de comparaciones (metrica, base, actual, cambio, regresion) en orden de métrica;
+        `cambio` es positivo cuando la métrica empeora
+    """
+    comparaciones = []
+    for metrica in sorted(set(metricas) & set(linea_base)):
+        if metrica.endswith('.mb_archivo'):
+            continue
+        base, actual = linea_base[metrica], metricas[metrica]
+        if not base:
+            continue
+        cambio = (actual - base) / base
+        if _mayor_es_mejor(metrica):
+            cambio = -cambio
+        comparaciones.append({
+            'metrica': metrica, 'base': base, 'actual': actual,
+            'cambio': cambio, 'regresion': cambio > umbral,
+        })
+    return comparaciones
+
+
+def guardar_linea_base(metricas: Dict[str, float], ruta: str) -> str:
+    """
+    Guarda las métricas como línea base (con la fecha y la versión de Python)
+
+    Returns:
+        Ruta absoluta del archivo creado
+    """
+    directorio = os.path.dirname(ruta)
+    if directorio and not os.path.exists(directorio):
+        os.makedirs(directorio)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump({
+            'fecha': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'maquina': platform.machine(),
+            'metricas': metricas,
+        }, archivo, indent=2, sort_keys=True)
+    return os.path.abspath(ruta)
+
+
+def cargar_linea_base(ruta: str) -> Dict[str, float]:
+    """Lee las métricas de una línea base guardada con guardar_linea_base()"""
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)['metricas']
+
+
+def _imprimir_clasicos():
+    """Benchmarks comparativos (pool de conexiones y registros compactos)"""
+    print("⏱️  BENCHMARK DE CONEXIONES (servidor local)")
+    print("-" * 50)
+    resultado = benchmark_conexiones()
+    print(f"Sin pool (requests.get):  {resultado['ms_por_peticion_sin_pool']:.3f} ms/petición")
+    print(f"Con pool (keep-alive):    {resultado['ms_por_peticion_con_pool']:.3f} ms/petición")
+    print(f"Ahorro por petición:      {resultado['ahorro_relativo']:.1%}")
+
+    print("\n⏱️  BENCHMARK DE REGISTROS (dict vs Articulo)")
+    print("-" * 50)
+    resultado = benchmark_registros()
+    for modo in ('dict', 'articulo'):
+        print(f"{modo:<9} {resultado[f'bytes_por_registro_{modo}']:8.0f} bytes/registro  "
+              f"{resultado[f'us_construccion_{modo}']:6.2f} µs construcción  "
+              f"{resultado[f'us_lectura_{modo}']:6.2f} µs lectura")
+    print(f"Ahorro de memoria:        {resultado['ahorro_memoria']:.1%}")
+
+
+def main():
+    """Punto de entrada por línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmarks del cliente de Semantic Scholar (sin red)")
+    parser.add_argument('--tamaños', type=int, nargs='+', default=list(TAMAÑOS_CARGA),
+                        help="Cargas de los micro-benchmarks (default: 10000 100000 1000000)")
+    parser.add_argument('--llamadas', type=int, default=500, help="Llamadas de búsqueda y de lookup")
+    parser.add_argument('--concurrencia', type=int, default=8, help="Hilos del benchmark extremo a extremo")
+    parser.add_argument('--linea-base', default=os.path.join("data", "bench_linea_base.json"),
+                        help="JSON con la línea base a comparar")
+    parser.add_argument('--guardar-linea-base', action='store_true',
+                        help="Guardar los resultados como nueva línea base")
+    parser.add_argument('--umbral', type=float, default=UMBRAL_REGRESION,
+                        help="Empeoramiento relativo tolerado (default: 0.20)")
+    parser.add_argument('--comparativos', action='store_true',
+                        help="Ejecutar también los benchmarks de conexiones y registros")
+    args = parser.parse_args()
+
+    if args.comparativos:
+        _imprimir_clasicos()
+        print()
+
+    print("⏱️  SUITE DE BENCHMARKS")
+    print("-" * 50)
+    metricas = ejecutar_suite(args.tamaños, args.llamadas, args.concurrencia)
+    for metrica, valor in metricas.items():
+        print(f"{metrica:<45} {valor:14,.2f}")
+
+    codigo = 0
+    if args.guardar_linea_base:
+        print(f"\n📁 Línea base guardada en {guardar_linea_base(metricas, args.linea_base)}")
+    elif os.path.exists(args.linea_base):
+        comparaciones = comparar_con_linea_base(metricas, cargar_linea_base(args.linea_base), args.umbral)
+        regresiones = [c for c in comparaciones if c['regresion']]
+        print(f"\n📊 Comparación con {args.linea_base} (umbral {args.umbral:.0%})")
+        for c in comparaciones:
+            marca = "❌" if c['regresion'] else "  "
+            print(f"{marca} {c['metrica']:<45} {c['base']:12,.2f} -> {c['actual']:12,.2f} "
+                  f"({-c['cambio']:+.1%})")
+        if regresiones:
+            print(f"\n❌ {len(regresiones)} métricas empeoraron más de un {args.umbral:.0%}")
+            codigo = 1
+        else:
+            print("\n✅ Sin regresiones")
+    else:
+        print(f"\nℹ️  No hay línea base en {args.linea_base} (usa --guardar-linea-base)")
+    sys.exit(codigo)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Búsqueda masiva (bulk) en Semantic Scholar
+Usa /paper/search/bulk con token de continuación para recorrer corpus de decenas de miles de artículos
+"""
+
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from semantic_scholar_api import FiltrosBusqueda, SemanticScholarAPI, combinar_filtros, resolver_campos
+
+
+class BusquedaMasiva:
+    """
+    Recorre todos los resultados de una consulta con el endpoint bulk
+
+    El endpoint devuelve hasta 1000 artículos por página y un `token` para pedir
+    la siguiente. Tras volcar cada página al sink se guarda el token en un
+    archivo de estado, así una ejecución interrumpida continúa donde quedó.
+    """
+
+    def __init__(self, api: SemanticScholarAPI, query: str, campos: Optional[List[str]] = None,
+                 orden: Optional[str] = None, año_desde: Optional[int] = None,
+                 año_hasta: Optional[int] = None, ruta_estado: Optional[str] = None,
+                 filtros: Optional[FiltrosBusqueda] = None):
+        """
+        Inicializa la búsqueda
+
+        Args:
+            api: Cliente de Semantic Scholar a utilizar
+            query: Consulta (admite la sintaxis booleana del endpoint bulk)
+            campos: Campos a pedir: lista de campos de la API, columnas de salida o
+                preset ('ids-only', 'metadata', 'full'); ver resolver_campos()
+            orden: Orden del servidor, ej: 'citationCount:desc', 'publicationDate:asc'
+            año_desde: Año mínimo de publicación (opcional)
+            año_hasta: Año máximo de publicación (opcional)
+            ruta_estado: Archivo JSON donde guardar el token para reanudar (opcional)
+            filtros: Filtros aplicados por el servidor (citas, venue, campos de estudio, ...)
+        """
+        self.api = api
+        self.query = query
+        self.campos = resolver_campos(campos)
+        self.orden = orden
+        self.año_desde = año_desde
+        self.año_hasta = año_hasta
+        self.ruta_estado = ruta_estado
+        self.filtros = combinar_filtros(filtros, año_desde, año_hasta)
+        self.total: Optional[int] = None
+
+    def _params(self, token: Optional[str]) -> Dict:
+        """Construye los parámetros de una petición de página"""
+        params = {'query': self.query, 'fields': ','.join(self.campos)}
+        if self.orden:
+            params['sort'] = self.orden
+        params.update(self.filtros.parametros("/paper/search/bulk"))
+        if token:
+            params['token'] = token
+        return params
+
+    def iterar_paginas(self, token: Optional[str] = None) -> Iterator[Tuple[List[Dict], Optional[str]]]:
+        """
+        Recorre las páginas del endpoint bulk
+
+        Args:
+            token: Token de continuación desde el que empezar (None = desde el principio)
+
+        Yields:
+            Tuplas (artículos normalizados de la página, token de la siguiente página o None)
+        """
+        while True:
+            articulos, data = self.api.pedir_pagina("/paper/search/bulk", self._params(token), self.campos)
+            if self.total is None:
+                self.total = data.get('total')
+
+            token = data.get('token')
+            yield articulos, token
+            if not token:
+                return
+
+    def iterar_articulos(self, max_resultados: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Recorre los artículos uno a uno (sin estado persistente)
+
+        Args:
+            max_resultados: Máximo de artículos a devolver (None = todos)
+
+        Yields:
+            Diccionarios normalizados con información de cada artículo
+        """
+        emitidos = 0
+        for articulos, _ in self.iterar_paginas():
+            for articulo in articulos:
+                if max_resultados is not None and emitidos >= max_resultados:
+                    return
+                yield articulo
+                emitidos += 1
+
+    def ejecutar(self, sink, max_resultados: Optional[int] = None, reanudar: bool = True) -> int:
+        """
+        Vuelca todos los resultados al sink, guardando el progreso tras cada página
+
+        Los sinks de archivo se abren en modo append: una ejecución nueva escribe a
+        continuación de lo que ya hubiera. Solo al reanudar se descarta lo escrito
+        después de la última posición guardada (una página a medias antes del corte).
+
+        Args:
+            sink: Destino con la interfaz de semantic_scholar_sinks (SinkCSV, SinkJSONL, SinkSQLite)
+            max_resultados: Máximo de artículos a escribir en total (None = todos)
+            reanudar: Continuar desde el archivo de estado si existe y corresponde a esta consulta
+
+        Returns:
+            Número total de artículos escritos (incluyendo los de ejecuciones previas)
+        """
+        estado = self._cargar_estado(max_resultados) if reanudar else None
+        if estado is not None and estado.get('terminado'):
+            print(f"ℹ️ La búsqueda masiva '{self.query}' ya estaba completa")
+            return estado['escritos']
+
+        if estado is not None:
+            token = estado['token']
+            escritos = estado['escritos']
+            posicion_inicial = estado.get('posicion_inicial')
+            if estado.get('posicion') is not None:
+                sink.restaurar(estado['posicion'])
+            print(f"🔄 Reanudando búsqueda masiva '{self.query}' ({escritos} artículos ya guardados)")
+        else:
+            token = None
+            escritos = 0
+            posicion_inicial = sink.posicion()
+
+        for articulos, siguiente in self.iterar_paginas(token):
+            if max_resultados is not None:
+                articulos = articulos[:max(0, max_resultados - escritos)]
+            sink.escribir_lote(articulos)
+            escritos += len(articulos)
+            sink.flush()
+
+            terminado = not siguiente or (max_resultados is not None and escritos >= max_resultados)
+            self._guardar_estado({
+                'query': self.query,
+                'params': self._params(None),
+                'max_resultados': max_resultados,
+                'posicion_inicial': posicion_inicial,
+                'token': siguiente,
+                'escritos': escritos,
+                'posicion': sink.posicion(),
+                'terminado': terminado,
+            })
+            if terminado:
+                break
+
+        return escritos
+
+    def _cargar_estado(self, max_resultados: Optional[int] = None) -> Optional[Dict]:
+        """
+        Lee el estado guardado si pertenece a esta misma consulta
+
+        Se comparan todos los parámetros de la petición (consulta, campos, orden y
+        filtros) y el límite de resultados: el token de continuación solo es válido
+        para exactamente la misma búsqueda, así cambiar cualquier filtro empieza de
+        cero, y un estado 'terminado' con otro límite no se da por completo.
+
+        Args:
+            max_resultados: Límite de la ejecución actual
+        """
+        if not self.ruta_estado or not os.path.exists(self.ruta_estado):
+            return None
+        with open(self.ruta_estado, encoding='utf-8') as archivo:
+            estado = json.load(archivo)
+        misma_consulta = (
+            estado.get('params') == self._params(None) and
+            estado.get('max_resultados') == max_resultados
+        )
+        return estado if misma_consulta else None
+
+    def _guardar_estado(self, estado: Dict):
+        """Escribe el estado de forma atómica (archivo temporal + rename)"""
+        if not self.ruta_estado:
+            return
+        directorio = os.path.dirname(self.ruta_estado)
+        if directorio and not os.path.exists(directorio):
+            os.makedirs(directorio)
+        temporal = f"{self.ruta_estado}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(estado, archivo, ensure_ascii=False)
+        os.replace(temporal, self.ruta_estado)
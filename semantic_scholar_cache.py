@@ -0,0 +1,342 @@
+"""
+Caché de respuestas de la API de Semantic Scholar
+Caché persistente en SQLite con TTL por endpoint y expulsión LRU por tamaño total,
+y caché LRU en memoria que agrupa peticiones idénticas simultáneas (single-flight)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from semantic_scholar_api import plantilla_endpoint
+
+
+# TTL por defecto (segundos) según el endpoint: las búsquedas cambian más
+# a menudo que los metadatos de un paper concreto
+TTL_POR_ENDPOINT = {
+    '/paper/search': 24 * 3600,
+    '/paper/search/bulk': 24 * 3600,
+    '/paper/search/match': 7 * 24 * 3600,
+    '/paper/{id}': 7 * 24 * 3600,
+    '/paper/batch': 7 * 24 * 3600,
+    '/paper/{id}/references': 7 * 24 * 3600,
+    '/paper/{id}/citations': 24 * 3600,
+    '/author/search': 30 * 24 * 3600,
+    '/author/{id}': 7 * 24 * 3600,
+    '/author/batch': 7 * 24 * 3600,
+    '/author/{id}/papers': 24 * 3600,
+}
+
+
+def clave_peticion(metodo: str, ruta: str, params: Optional[Dict] = None, cuerpo: Optional[Dict] = None) -> str:
+    """
+    Calcula la clave de caché de una petición
+
+    Los parámetros se ordenan y la lista de `fields` se normaliza (sin duplicados
+    y ordenada), así 'title,year' y 'year,title' comparten entrada.
+
+    Args:
+        metodo: Método HTTP
+        ruta: Ruta relativa a base_url
+        params: Parámetros de la query string
+        cuerpo: Cuerpo JSON de la petición
+
+    Returns:
+        Hash SHA-256 en hexadecimal
+    """
+    normalizados = {}
+    for clave, valor in (params or {}).items():
+        if clave == 'fields' and valor:
+            valor = ','.join(sorted(set(str(valor).split(','))))
+        normalizados[clave] = str(valor)
+    contenido = json.dumps([metodo.upper(), ruta, normalizados, cuerpo], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+class CacheDisco:
+    """
+    Caché persistente de respuestas JSON en un archivo SQLite
+
+    Cada entrada expira según el TTL de su endpoint. Cuando el tamaño total
+    supera `max_bytes` se eliminan las entradas usadas hace más tiempo.
+    Es segura para usarse desde varios hilos del mismo cliente.
+    """
+
+    def __init__(self, ruta: str = os.path.join("data", "cache_semantic_scholar.sqlite"),
+                 max_bytes: int = 512 * 1024 * 1024, ttl_por_endpoint: Optional[Dict[str, float]] = None,
+                 ttl_defecto: float = 24 * 3600):
+        """
+        Abre (o crea) la caché
+
+        Args:
+            ruta: Archivo SQLite donde guardar las respuestas
+            max_bytes: Tamaño máximo total de las respuestas almacenadas
+            ttl_por_endpoint: TTL en segundos por plantilla de endpoint (se combina con TTL_POR_ENDPOINT)
+            ttl_defecto: TTL para endpoints que no aparecen en la tabla
+        """
+        directorio = os.path.dirname(ruta)
+        if directorio and not os.path.exists(directorio):
+            os.makedirs(directorio)
+
+        self.ruta = ruta
+        self.max_bytes = max_bytes
+        self.ttl_por_endpoint = dict(TTL_POR_ENDPOINT)
+        self.ttl_por_endpoint.update(ttl_por_endpoint or {})
+        self.ttl_defecto = ttl_defecto
+
+        self.aciertos = 0
+        self.fallos = 0
+
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS respuestas ("
+            "clave TEXT PRIMARY KEY, endpoint TEXT, valor TEXT, tamaño INTEGER, "
+            "expira REAL, ultimo_acceso REAL)"
+        )
+        self._conexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_respuestas_acceso ON respuestas (ultimo_acceso)"
+        )
+        self._conexion.commit()
+        self._bytes = self._conexion.execute(
+            "SELECT COALESCE(SUM(tamaño), 0) FROM respuestas"
+        ).fetchone()[0]
+
+    def clave(self, metodo: str, ruta: str, params: Optional[Dict] = None, cuerpo: Optional[Dict] = None) -> str:
+        """Atajo a clave_peticion()"""
+        return clave_peticion(metodo, ruta, params, cuerpo)
+
+    def obtener(self, clave: str) -> Optional[Any]:
+        """
+        Busca una respuesta vigente en la caché
+
+        Args:
+            clave: Clave calculada con clave()
+
+        Returns:
+            Respuesta JSON decodificada, o None si no está o expiró
+        """
+        ahora = time.time()
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT valor, tamaño, expira FROM respuestas WHERE clave = ?", (clave,)
+            ).fetchone()
+            if fila is None:
+                self.fallos += 1
+                return None
+
+            valor, tamaño, expira = fila
+            if expira < ahora:
+                self._conexion.execute("DELETE FROM respuestas WHERE clave = ?", (clave,))
+                self._conexion.commit()
+                self._bytes -= tamaño
+                self.fallos += 1
+                return None
+
+            self._conexion.execute("UPDATE respuestas SET ultimo_acceso = ? WHERE clave = ?", (ahora, clave))
+            self._conexion.commit()
+            self.aciertos += 1
+        return json.loads(valor)
+
+    def guardar(self, clave: str, ruta: str, valor: Any):
+        """
+        Guarda una respuesta y expulsa entradas antiguas si se supera max_bytes
+
+        Args:
+            clave: Clave calculada con clave()
+            ruta: Ruta de la petición (determina el TTL)
+            valor: Respuesta JSON decodificada
+        """
+        endpoint = plantilla_endpoint(ruta)
+        ttl = self.ttl_por_endpoint.get(endpoint, self.ttl_defecto)
+        texto = json.dumps(valor, ensure_ascii=False)
+        tamaño = len(texto.encode('utf-8'))
+        if tamaño > self.max_bytes:
+            return
+
+        ahora = time.time()
+        with self._lock:
+            anterior = self._conexion.execute(
+                "SELECT tamaño FROM respuestas WHERE clave = ?", (clave,)
+            ).fetchone()
+            if anterior:
+                self._bytes -= anterior[0]
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO respuestas (clave, endpoint, valor, tamaño, expira, ultimo_acceso) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (clave, endpoint, texto, tamaño, ahora + ttl, ahora)
+            )
+            self._bytes += tamaño
+            self._expulsar()
+            self._conexion.commit()
+
+    def _expulsar(self):
+        """Elimina las entradas menos usadas recientemente hasta volver bajo max_bytes (con el lock tomado)"""
+        while self._bytes > self.max_bytes:
+            filas = self._conexion.execute(
+                "SELECT clave, tamaño FROM respuestas ORDER BY ultimo_acceso LIMIT 100"
+            ).fetchall()
+            if not filas:
+                self._bytes = 0
+                return
+            for clave, tamaño in filas:
+                self._conexion.execute("DELETE FROM respuestas WHERE clave = ?", (clave,))
+                self._bytes -= tamaño
+                if self._bytes <= self.max_bytes:
+                    return
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Devuelve contadores de uso de la caché
+
+        Returns:
+            Diccionario con aciertos, fallos, tasa de aciertos, entradas y bytes ocupados
+        """
+        with self._lock:
+            entradas = self._conexion.execute("SELECT COUNT(*) FROM respuestas").fetchone()[0]
+            consultas = self.aciertos + self.fallos
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                'entradas': entradas,
+                'bytes': self._bytes,
+            }
+
+    def limpiar(self):
+        """Elimina todas las entradas"""
+        with self._lock:
+            self._conexion.execute("DELETE FROM respuestas")
+            self._conexion.commit()
+            self._bytes = 0
+
+    def cerrar(self):
+        """Cierra el archivo de la caché"""
+        with self._lock:
+            self._conexion.close()
+
+
+class _Vuelo:
+    """Petición en curso a la que pueden esperar otros hilos"""
+
+    __slots__ = ('evento', 'valor', 'error')
+
+    def __init__(self):
+        self.evento = threading.Event()
+        self.valor = None
+        self.error: Optional[BaseException] = None
+
+
+class CacheMemoria:
+    """
+    Caché LRU en memoria con TTL y agrupación de peticiones simultáneas
+
+    Si varios hilos piden la misma clave a la vez, solo el primero ejecuta la
+    petición; el resto espera su resultado (o su excepción). Una instancia puede
+    compartirse entre varios clientes.
+    """
+
+    def __init__(self, max_entradas: int = 10000, ttl: float = 300):
+        """
+        Inicializa la caché
+
+        Args:
+            max_entradas: Número máximo de respuestas guardadas
+            ttl: Segundos que una respuesta se considera vigente
+        """
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+
+        self.aciertos = 0
+        self.fallos = 0
+        self.agrupadas = 0
+
+        self._datos: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._en_vuelo: Dict[str, _Vuelo] = {}
+        self._lock = threading.Lock()
+
+    def clave(self, metodo: str, ruta: str, params: Optional[Dict] = None, cuerpo: Optional[Dict] = None) -> str:
+        """Atajo a clave_peticion()"""
+        return clave_peticion(metodo, ruta, params, cuerpo)
+
+    def obtener_o_calcular(self, clave: str, calcular: Callable[[], Any]) -> Any:
+        """
+        Devuelve la respuesta guardada o la calcula una sola vez aunque la pidan varios hilos
+
+        Args:
+            clave: Clave calculada con clave()
+            calcular: Función sin argumentos que hace la petición real
+
+        Returns:
+            Respuesta JSON decodificada
+        """
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is not None:
+                valor, expira = entrada
+                if expira >= time.monotonic():
+                    self._datos.move_to_end(clave)
+                    self.aciertos += 1
+                    return valor
+                del self._datos[clave]
+
+            vuelo = self._en_vuelo.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = _Vuelo()
+                self._en_vuelo[clave] = vuelo
+                self.fallos += 1
+            else:
+                self.agrupadas += 1
+
+        if not lider:
+            vuelo.evento.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            return vuelo.valor
+
+        try:
+            vuelo.valor = calcular()
+        except BaseException as e:
+            vuelo.error = e
+            raise
+        else:
+            with self._lock:
+                self._datos[clave] = (vuelo.valor, time.monotonic() + self.ttl)
+                self._datos.move_to_end(clave)
+                while len(self._datos) > self.max_entradas:
+                    self._datos.popitem(last=False)
+            return vuelo.valor
+        finally:
+            with self._lock:
+                self._en_vuelo.pop(clave, None)
+            vuelo.evento.set()
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Devuelve contadores de uso de la caché
+
+        Returns:
+            Diccionario con aciertos, fallos, peticiones agrupadas y entradas
+        """
+        with self._lock:
+            consultas = self.aciertos + self.fallos + self.agrupadas
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'agrupadas': self.agrupadas,
+                'tasa_aciertos': (self.aciertos + self.agrupadas) / consultas if consultas else 0.0,
+                'entradas': len(self._datos),
+            }
+
+    def limpiar(self):
+        """Elimina todas las entradas (las peticiones en curso no se ven afectadas)"""
+        with self._lock:
+            self._datos.clear()
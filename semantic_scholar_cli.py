@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Línea de comandos no interactiva para Semantic Scholar
+Subcomandos pensados para cron, scripts y pipelines: los resultados se escriben
+en stdout o en un archivo (CSV, JSONL o SQLite) y los mensajes van a stderr.
+El código de salida es 0 si todo fue bien y 1 si hubo errores o resultados parciales.
+
+Ejemplos:
+    python semantic_scholar_cli.py search "graph neural networks" -n 500 --año-desde 2020 > gnn.jsonl
+    python semantic_scholar_cli.py search "crispr" --modo bulk --min-citas 50 -o data/crispr.sqlite
+    python semantic_scholar_cli.py author "Yoshua Bengio" --formato csv | cut -d'|' -f2
+    python semantic_scholar_cli.py title "Attention is all you need" "BERT: Pre-training of deep ..."
+    python semantic_scholar_cli.py get 649def34f8be52c8b66281af98ae884c09aef38b DOI:10.1038/nature14539
+    jq -r .paper_id gnn.jsonl | python semantic_scholar_cli.py batch-get - --campos full -o data/gnn.csv
+    python semantic_scholar_cli.py crawl 649def34f8be52c8b66281af98ae884c09aef38b --profundidad 1 > aristas.jsonl
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import requests
+
+from semantic_scholar_api import MAX_IDS_POR_LOTE, PRESETS_CAMPOS, FiltrosBusqueda, SemanticScholarAPI
+from semantic_scholar_authors import RUTA_CACHE_AUTORES, AutoresSemanticScholar
+from semantic_scholar_bulk import BusquedaMasiva
+from semantic_scholar_cache import CacheDisco
+from semantic_scholar_crawler import DIRECCIONES, CrawlerCitas
+from semantic_scholar_rate_limit import RateLimiter
+from semantic_scholar_retry import ErrorSemanticScholar, PoliticaReintentos
+from semantic_scholar_shards import BusquedaPorAños
+from semantic_scholar_sinks import SinkCSV, SinkFlujo, SinkJSONL, SinkSQLite
+from semantic_scholar_titles import COLUMNAS_RESULTADO, UMBRAL_CONFIANZA, ResolutorTitulos
+
+
+FORMATOS = ('jsonl', 'csv', 'sqlite')
+
+# Extensión del archivo de salida -> formato (si no se indica --formato)
+FORMATO_POR_EXTENSION = {
+    '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.csv': 'csv',
+    '.sqlite': 'sqlite', '.sqlite3': 'sqlite', '.db': 'sqlite',
+}
+
+SINKS_ARCHIVO = {'jsonl': SinkJSONL, 'csv': SinkCSV, 'sqlite': SinkSQLite}
+
+
+def _a_stdout(salida: Optional[str]) -> bool:
+    return salida in (None, '-')
+
+
+def formato_salida(salida: Optional[str], formato: Optional[str] = None) -> str:
+    """
+    Decide el formato de salida
+
+    Args:
+        salida: Archivo de salida (None o '-' = stdout)
+        formato: Formato pedido explícitamente (opcional)
+
+    Returns:
+        'jsonl', 'csv' o 'sqlite'
+
+    Raises:
+        ValueError: Si se pide SQLite por stdout o la extensión no es reconocible
+    """
+    if formato is None:
+        if _a_stdout(salida):
+            formato = 'jsonl'
+        else:
+            extension = os.path.splitext(salida)[1].lower()
+            if extension not in FORMATO_POR_EXTENSION:
+                raise ValueError(f"No se reconoce el formato de {salida}; indica --formato ({', '.join(FORMATOS)})")
+            formato = FORMATO_POR_EXTENSION[extension]
+    if formato == 'sqlite' and _a_stdout(salida):
+        raise ValueError("El formato sqlite necesita un archivo de salida (-o)")
+    return formato
+
+
+def abrir_sink(salida: Optional[str], formato: str, flujo: TextIO):
+    """
+    Crea el sink de artículos: el flujo (stdout) o un archivo, al que se añade
+
+    Args:
+        salida: Archivo de salida (None o '-' = el flujo)
+        formato: 'jsonl', 'csv' o 'sqlite'
+        flujo: Flujo a usar si no hay archivo
+
+    Returns:
+        Sink (ver semantic_scholar_sinks)
+    """
+    if _a_stdout(salida):
+        return SinkFlujo(flujo, formato)
+    return SINKS_ARCHIVO[formato](salida)
+
+
+def escribir_filas(filas: Iterable[Dict], columnas: List[str], salida: Optional[str], formato: str,
+                   flujo: TextIO, tabla: str) -> int:
+    """
+    Escribe registros que no son artículos (títulos resueltos, aristas del grafo)
+
+    Args:
+        filas: Registros a escribir
+        columnas: Columnas de cada registro
+        salida: Archivo de salida (None o '-' = el flujo); los archivos se amplían
+        formato: 'jsonl', 'csv' o 'sqlite'
+        flujo: Flujo a usar si no hay archivo
+        tabla: Tabla de destino en SQLite
+
+    Returns:
+        Número de registros escritos
+    """
+    escritas = 0
+    if formato == 'sqlite':
+        directorio = os.path.dirname(salida)
+        if directorio and not os.path.exists(directorio):
+            os.makedirs(directorio)
+        conexion = sqlite3.connect(salida)
+        try:
+            with conexion:
+                conexion.execute(f"CREATE TABLE IF NOT EXISTS {tabla} ({', '.join(columnas)})")
+                sql = f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({', '.join('?' for _ in columnas)})"
+                for fila in filas:
+                    conexion.execute(sql, [fila.get(columna) for columna in columnas])
+                    escritas += 1
+        finally:
+            conexion.close()
+        return escritas
+
+    with contextlib.ExitStack() as pila:
+        if _a_stdout(salida):
+            destino = flujo
+        else:
+            directorio = os.path.dirname(salida)
+            if directorio and not os.path.exists(directorio):
+                os.makedirs(directorio)
+            destino = pila.enter_context(open(salida, 'a', newline='', encoding='utf-8'))
+        if formato == 'csv':
+            writer = csv.DictWriter(destino, fieldnames=columnas, delimiter='|', extrasaction='ignore',
+                                    lineterminator='\n')
+            if _a_stdout(salida) or destino.tell() == 0:
+                writer.writeheader()
+        for fila in filas:
+            if formato == 'csv':
+                writer.writerow(fila)
+            else:
+                destino.write(json.dumps({columna: fila.get(columna) for columna in columnas}, ensure_ascii=False))
+                destino.write('\n')
+            escritas += 1
+        destino.flush()
+    return escritas
+
+
+def leer_entradas(valores: List[str], entrada: TextIO) -> Iterator[str]:
+    """
+    Recorre valores de la línea de comandos; '-' (o ninguno) lee uno por línea de la entrada
+
+    Las líneas vacías y las que empiezan por # se ignoran.
+    """
+    for valor in valores or ['-']:
+        if valor != '-':
+            yield valor
+            continue
+        for linea in entrada:
+            linea = linea.strip()
+            if linea and not linea.startswith('#'):
+                yield linea
+
+
+def _campos(valor: Optional[str]):
+    """--campos: un preset o una lista separada por comas (campos de la API o columnas de salida)"""
+    if valor is None or valor in PRESETS_CAMPOS:
+        return valor
+    return [campo.strip() for campo in valor.split(',') if campo.strip()]
+
+
+def _filtros(args) -> Optional[FiltrosBusqueda]:
+    filtros = FiltrosBusqueda(
+        año_desde=args.año_desde, año_hasta=args.año_hasta, min_citas=args.min_citas,
+        venues=args.venue, campos_estudio=args.campo_estudio, tipos_publicacion=args.tipo,
+        solo_acceso_abierto=args.acceso_abierto,
+    )
+    return filtros if filtros else None
+
+
+def crear_cliente(args) -> SemanticScholarAPI:
+    """Cliente configurado con las opciones comunes (concurrencia, caché, rate limit, reintentos)"""
+    return SemanticScholarAPI(
+        args.api_key,
+        pool_size=max(10, args.concurrencia),
+        timeout=args.timeout,
+        base_url=args.base_url,
+        rate_limiter=RateLimiter(tasa=args.tasa, capacidad=max(1.0, args.tasa)) if args.tasa else None,
+        reintentos=PoliticaReintentos(max_reintentos=args.reintentos),
+        cache=CacheDisco(args.cache) if args.cache else None,
+    )
+
+
+def _volcar(articulos: Iterable[Dict], sink) -> Tuple[int, List[Exception]]:
+    """Escribe artículos a medida que llegan; un fallo de la API corta la descarga pero conserva lo escrito"""
+    escritos = 0
+    try:
+        for articulo in articulos:
+            sink.escribir(articulo)
+            escritos += 1
+    except requests.exceptions.RequestException as e:
+        print(f"Error durante la descarga: {e}")
+        return escritos, [e]
+    return escritos, []
+
+
+# --- subcomandos ---
+# Cada uno recibe el cliente, los argumentos y el flujo de salida, y devuelve
+# (registros escritos, errores)
+
+def comando_search(api: SemanticScholarAPI, args, flujo: TextIO) -> Tuple[int, List]:
+    """Búsqueda por relevancia (máx. 1000), masiva (bulk, sin tope) o por tramos de años"""
+    filtros = _filtros(args)
+    campos = _campos(args.campos)
+    if args.modo == 'bulk':
+        articulos = BusquedaMasiva(api, args.query, campos, args.orden, filtros=filtros) \
+            .iterar_articulos(args.max_resultados)
+    elif args.modo == 'por-años':
+        busqueda = BusquedaPorAños(api, args.query, args.año_desde or 1900, args.año_hasta, campos,
+                                   max_workers=args.concurrencia, filtros=filtros)
+        articulos = busqueda.iterar(args.orden, args.max_resultados)
+    else:
+        articulos = api.iterar_articulos(args.query, args.max_resultados, campos,
+                                         filtros=filtros, prefetch=True)
+    with abrir_sink(args.salida, args.formato, flujo) as sink:
+        return _volcar(articulos, sink)
+
+
+def comando_author(api: SemanticScholarAPI, args, flujo: TextIO) -> Tuple[int, List]:
+    """Bibliografía completa de un autor (por authorId o por nombre)"""
+    autores = AutoresSemanticScholar(api, RUTA_CACHE_AUTORES)
+    try:
+        author_id = args.autor if args.autor.isdigit() else autores.resolver(args.autor)
+        if author_id is None:
+            print(f"❌ No se encontró ningún autor para '{args.autor}'")
+            return 0, [LookupError(args.autor)]
+        print(f"👤 {args.autor} -> authorId {author_id}")
+        articulos = autores.iterar_papers(author_id, args.max_resultados, _campos(args.campos),
+                                          args.año_desde, args.año_hasta)
+        with abrir_sink(args.salida, args.formato, flujo) as sink:
+            return _volcar(articulos, sink)
+    finally:
+        autores.cerrar()
+
+
+def comando_title(api: SemanticScholarAPI, args, flujo: TextIO) -> Tuple[int, List]:
+    """Resuelve títulos a paperId; con --articulos escribe los artículos completos"""
+    titulos = list(leer_entradas(args.titulos, sys.stdin))
+    with ResolutorTitulos(api, umbral=args.umbral) as resolutor:
+        resultados = resolutor.resolver_lote(titulos, args.concurrencia)
+    errores = [RuntimeError(t) for t, r in resultados.items() if r['metodo'] == 'error']
+    resueltos = sum(1 for r in resultados.values() if r['paper_id'])
+    print(f"🔎 {resueltos}/{len(resultados)} títulos resueltos")
+
+    if not args.articulos:
+        filas = (dict(resultado, titulo=titulo) for titulo, resultado in resultados.items())
+        return escribir_filas(filas, COLUMNAS_RESULTADO, args.salida, args.formato, flujo, 'titulos'), errores
+
+    ids = [r['paper_id'] for r in resultados.values() if r['paper_id']]
+    articulos = api.obtener_articulos_por_ids(ids, _campos(args.campos), args.concurrencia)
+    with abrir_sink(args.salida, args.formato, flujo) as sink:
+        escritos, _ = _volcar((a for a in articulos if a is not None), sink)
+    return escritos, errores + articulos.errores
+
+
+def comando_get(api: SemanticScholarAPI, args, flujo: TextIO) -> Tuple[int, List]:
+    """Artículos sueltos por ID (/paper/{id}); admite prefijos como DOI: o ARXIV:"""
+    campos = _campos(args.campos)
+    errores = []
+    with abrir_sink(args.salida, args.formato, flujo) as sink:
+        escritos = 0
+        for paper_id in leer_entradas(args.ids, sys.stdin):
+            try:
+                articulo = api.obtener_articulo_por_id(paper_id, campos)
+            except ErrorSemanticScholar as e:
+                print(f"Error al obtener artículo {paper_id}: {e}")
+                errores.append(e)
+                continue
+            if articulo is None:
+                print(f"⚠️  No existe el artículo {paper_id}")
+                errores.append(LookupError(paper_id))
+                continue
+            sink.escribir(articulo)
+            escritos += 1
+    return escritos, errores
+
+
+def comando_batch_get(api: SemanticScholarAPI, args, flujo: TextIO) -> Tuple[int, List]:
+    """
+    Muchos artículos por ID con POST /paper/batch
+
+    Los IDs se leen y se piden por bloques (500 por lote, `concurrencia` lotes a
+    la vez), así la memoria no depende del tamaño de la lista.
+    """
+    campos = _campos(args.campos)
+    ids = leer_entradas(args.ids, sys.stdin)
+    tamaño_bloque = MAX_IDS_POR_LOTE * max(1, args.concurrencia)
+    escritos = pedidos = 0
+    errores = []
+    with abrir_sink(args.salida, args.formato, flujo) as sink:
+        while True:
+            bloque = list(islice(ids, tamaño_bloque))
+            if not bloque:
+                break
+            pedidos += len(bloque)
+            articulos = api.obtener_articulos_por_ids(bloque, campos, args.concurrencia)
+            errores.extend(articulos.errores)
+            encontrados = [a for a in articulos if a is not None]
+            sink.escribir_lote(encontrados)
+            sink.flush()
+            escritos += len(encontrados)
+            print(f"📦 {escritos}/{pedidos} artículos obtenidos")
+    if pedidos - escritos:
+        print(f"⚠️  {pedidos - escritos} IDs sin resultado")
+    return escritos, errores
+
+
+def comando_crawl(api: SemanticScholarAPI, args, flujo: TextIO) -> Tuple[int, List]:
+    """Expande el grafo de citas (reanudable con --estado) y escribe las aristas citante -> citado"""
+    with CrawlerCitas(api, args.estado, args.direccion, args.profundidad, args.max_vecinos,
+                      args.concurrencia) as crawler:
+        resumen = crawler.ejecutar(list(leer_entradas(args.semillas, sys.stdin)) if args.semillas else (),
+                                   args.max_nodos, intervalo_progreso=0 if args.silencioso else 1.0)
+        print(f"🕸️  {resumen['expandidos']} nodos expandidos, {resumen['aristas_nuevas']} aristas nuevas, "
+              f"{resumen['pendientes']} pendientes")
+        errores = [RuntimeError(f"{resumen['errores']} nodos con error")] if resumen['errores'] else []
+        if args.sin_aristas:
+            return 0, errores
+        filas = ({'citante': citante, 'citado': citado} for citante, citado in crawler.aristas())
+        return escribir_filas(filas, ['citante', 'citado'], args.salida, args.formato, flujo, 'aristas'), errores
+
+
+COMANDOS = {
+    'search': comando_search,
+    'author': comando_author,
+    'title': comando_title,
+    'get': comando_get,
+    'batch-get': comando_batch_get,
+    'crawl': comando_crawl,
+}
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Parser con las opciones comunes y un subparser por comando"""
+    comunes = argparse.ArgumentParser(add_help=False)
+    grupo = comunes.add_argument_group("opciones comunes")
+    grupo.add_argument('-o', '--salida', default='-', help="Archivo de salida (default: stdout); los archivos se amplían")
+    grupo.add_argument('-f', '--formato', choices=FORMATOS,
+                       help="Formato de salida (default: según la extensión; jsonl en stdout)")
+    grupo.add_argument('--campos', help=f"Preset ({', '.join(PRESETS_CAMPOS)}) o lista de campos separados por comas")
+    grupo.add_argument('-c', '--concurrencia', type=int, default=4, help="Peticiones simultáneas (default: 4)")
+    grupo.add_argument('--tasa', type=float,
+                       help="Peticiones por segundo (default: 10 con API key, ~1 sin ella)")
+    grupo.add_argument('--reintentos', type=int, default=3, help="Reintentos ante 429, 5xx y fallos de conexión")
+    grupo.add_argument('--timeout', type=float, default=30, help="Segundos máximos por petición")
+    grupo.add_argument('--cache', nargs='?', const=os.path.join("data", "cache_semantic_scholar.sqlite"),
+                       help="Usar caché en disco (ruta opcional; default: data/cache_semantic_scholar.sqlite)")
+    grupo.add_argument('--metricas', help="Guardar las métricas de las peticiones al terminar (.prom o .json)")
+    grupo.add_argument('--api-key', default=os.environ.get('SEMANTIC_SCHOLAR_API_KEY'),
+                       help="API key (default: variable SEMANTIC_SCHOLAR_API_KEY)")
+    grupo.add_argument('--base-url', default="https://api.semanticscholar.org/graph/v1",
+                       help="URL base de la API (ej: un servidor local de pruebas)")
+    grupo.add_argument('-q', '--silencioso', action='store_true', help="No mostrar mensajes en stderr")
+
+    filtros = argparse.ArgumentParser(add_help=False)
+    grupo = filtros.add_argument_group("filtros")
+    grupo.add_argument('--año-desde', type=int, help="Año mínimo de publicación")
+    grupo.add_argument('--año-hasta', type=int, help="Año máximo de publicación")
+    grupo.add_argument('--min-citas', type=int, help="Citas mínimas")
+    grupo.add_argument('--venue', action='append', help="Venue (se puede repetir)")
+    grupo.add_argument('--campo-estudio', action='append', help="Campo de estudio (se puede repetir)")
+    grupo.add_argument('--tipo', action='append', help="Tipo de publicación (se puede repetir)")
+    grupo.add_argument('--acceso-abierto', action='store_true', help="Solo artículos con PDF en acceso abierto")
+
+    parser = argparse.ArgumentParser(
+        description="Semantic Scholar desde la línea de comandos (para scripts, cron y pipelines)"
+    )
+    subparsers = parser.add_subparsers(dest='comando', required=True, metavar='COMANDO')
+
+    search = subparsers.add_parser('search', parents=[comunes, filtros], help="Buscar artículos")
+    search.add_argument('query', help="Consulta")
+    search.add_argument('-n', '--max-resultados', type=int, help="Máximo de artículos (default: todos)")
+    search.add_argument('--modo', choices=['relevancia', 'bulk', 'por-años'], default='relevancia',
+                        help="relevancia (máx. 1000), bulk (todos, sin ranking) o por-años "
+                             "(relevancia por tramos de años, supera el tope de 1000)")
+    search.add_argument('--orden', help="Orden, ej: citationCount:desc (modos bulk y por-años)")
+
+    author = subparsers.add_parser('author', parents=[comunes], help="Papers de un autor")
+    author.add_argument('autor', help="authorId o nombre")
+    author.add_argument('-n', '--max-resultados', type=int, help="Máximo de papers (default: todos)")
+    author.add_argument('--año-desde', type=int, help="Año mínimo de publicación")
+    author.add_argument('--año-hasta', type=int, help="Año máximo de publicación")
+
+    title = subparsers.add_parser('title', parents=[comunes], help="Resolver títulos a paperId")
+    title.add_argument('titulos', nargs='*', help="Títulos ('-' o ninguno: uno por línea desde stdin)")
+    title.add_argument('--umbral', type=float, default=UMBRAL_CONFIANZA, help="Confianza mínima (0-1)")
+    title.add_argument('--articulos', action='store_true',
+                       help="Escribir los artículos encontrados en lugar de la tabla de resolución")
+
+    get = subparsers.add_parser('get', parents=[comunes], help="Artículos por ID, uno a uno")
+    get.add_argument('ids', nargs='*', help="IDs ('-' o ninguno: uno por línea desde stdin)")
+
+    batch_get = subparsers.add_parser('batch-get', parents=[comunes], help="Muchos artículos por ID (por lotes)")
+    batch_get.add_argument('ids', nargs='*', help="IDs ('-' o ninguno: uno por línea desde stdin)")
+
+    crawl = subparsers.add_parser('crawl', parents=[comunes], help="Expandir el grafo de citas")
+    crawl.add_argument('semillas', nargs='*', help="IDs de partida ('-': desde stdin; ninguno: reanudar)")
+    crawl.add_argument('--estado', default=os.path.join("data", "crawl_semantic_scholar.sqlite"),
+                       help="Archivo SQLite con la frontera y las aristas (permite reanudar)")
+    crawl.add_argument('--direccion', choices=list(DIRECCIONES), default='ambas')
+    crawl.add_argument('--profundidad', type=int, default=2, help="Saltos máximos desde las semillas")
+    crawl.add_argument('--max-nodos', type=int, help="Máximo de nodos a expandir en esta ejecución")
+    crawl.add_argument('--max-vecinos', type=int, default=1000, help="Referencias/citas máximas por nodo")
+    crawl.add_argument('--sin-aristas', action='store_true', help="No escribir las aristas (solo el estado)")
+    return parser
+
+
+def ejecutar(argv: Optional[List[str]] = None, flujo: TextIO = None) -> int:
+    """
+    Ejecuta un comando
+
+    Args:
+        argv: Argumentos (default: sys.argv[1:])
+        flujo: Salida de los resultados (default: sys.stdout)
+
+    Returns:
+        Código de salida: 0 sin errores, 1 con errores o resultados parciales
+    """
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    flujo = flujo or sys.stdout
+    try:
+        args.formato = formato_salida(args.salida, args.formato)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Todo lo que imprimen los módulos (progreso, errores) va a stderr para no
+    # mezclarse con los resultados
+    with contextlib.ExitStack() as pila:
+        mensajes = pila.enter_context(open(os.devnull, 'w')) if args.silencioso else sys.stderr
+        pila.enter_context(contextlib.redirect_stdout(mensajes))
+        api = pila.enter_context(crear_cliente(args))
+
+        inicio = time.perf_counter()
+        escritos, errores = COMANDOS[args.comando](api, args, flujo)
+        duracion = time.perf_counter() - inicio
+
+        destino = 'stdout' if _a_stdout(args.salida) else os.path.abspath(args.salida)
+        print(f"{'⚠️ ' if errores else '✅'} {escritos} registros escritos en {destino} ({duracion:.1f} s, "
+              f"{api.metricas.snapshot()['peticiones']} peticiones, {len(errores)} errores)")
+        if args.metricas:
+            print(f"📊 Métricas: {api.metricas.guardar(args.metricas)}")
+    return 1 if errores else 0
+
+
+def main():
+    """Punto de entrada por línea de comandos"""
+    try:
+        sys.exit(ejecutar())
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrumpido", file=sys.stderr)
+        sys.exit(130)
+    except BrokenPipeError:
+        # El comando siguiente del pipeline dejó de leer (ej: head): se descarta
+        # el resto de la salida para que Python no falle al cerrar stdout
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Crawler del grafo de citas de Semantic Scholar
+Expande vecindarios de citas en anchura (BFS) a partir de papers semilla,
+guardando la frontera y las aristas en SQLite para poder parar y reanudar
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from semantic_scholar_api import SemanticScholarAPI, resolver_campos
+
+
+# Dirección de la expansión -> endpoints que se consultan por nodo
+DIRECCIONES = {
+    'referencias': ('references',),
+    'citas': ('citations',),
+    'ambas': ('references', 'citations'),
+}
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS nodos (
+    paper_id TEXT PRIMARY KEY,
+    profundidad INTEGER NOT NULL,
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_nodos_frontera ON nodos (estado, profundidad);
+CREATE TABLE IF NOT EXISTS aristas (
+    citante TEXT NOT NULL,
+    citado TEXT NOT NULL,
+    PRIMARY KEY (citante, citado)
+) WITHOUT ROWID;
+"""
+
+
+class CrawlerCitas:
+    """
+    Expansión BFS acotada del grafo de citas con estado persistente
+
+    Cada nodo de la frontera se expande en un hilo (bajo el rate limiter del
+    cliente) y su resultado se confirma en SQLite en una sola transacción: sus
+    aristas, los vecinos nuevos y el propio nodo marcado como 'hecho'. Si el
+    proceso se corta, al reanudar se vuelven a pedir solo los nodos que no
+    llegaron a confirmarse.
+
+    Las aristas siempre van de citante a citado.
+    """
+
+    def __init__(self, api: SemanticScholarAPI,
+                 ruta: str = os.path.join("data", "crawl_semantic_scholar.sqlite"),
+                 direccion: str = 'ambas', max_profundidad: int = 2,
+                 max_vecinos: Optional[int] = 1000, max_workers: int = 8,
+                 campos=None, almacen=None):
+        """
+        Inicializa el crawler
+
+        Args:
+            api: Cliente de Semantic Scholar (su rate limiter regula todas las peticiones)
+            ruta: Archivo SQLite con la frontera y las aristas
+            direccion: 'referencias', 'citas' o 'ambas'
+            max_profundidad: Saltos máximos desde las semillas
+            max_vecinos: Máximo de referencias/citas por nodo y dirección (None = todas)
+            max_workers: Nodos expandidos simultáneamente
+            campos: Campos de cada vecino a pedir (default: 'ids-only'); solo
+                tiene sentido ampliarlos si se pasa `almacen`
+            almacen: AlmacenArticulos opcional donde guardar los metadatos de los vecinos
+        """
+        if direccion not in DIRECCIONES:
+            raise ValueError(f"Dirección no soportada: {direccion} (opciones: {', '.join(DIRECCIONES)})")
+
+        directorio = os.path.dirname(ruta)
+        if directorio and not os.path.exists(directorio):
+            os.makedirs(directorio)
+
+        self.api = api
+        self.ruta = ruta
+        self.direccion = direccion
+        self.max_profundidad = max_profundidad
+        self.max_vecinos = max_vecinos
+        self.max_workers = max_workers
+        self.campos = resolver_campos(campos if campos is not None else 'ids-only')
+        self.almacen = almacen
+
+        self._conexion = sqlite3.connect(ruta)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.executescript(_ESQUEMA)
+        self._conexion.commit()
+
+    def agregar_semillas(self, paper_ids: Iterable[str]) -> int:
+        """
+        Añade papers semilla (profundidad 0) a la frontera
+
+        Args:
+            paper_ids: IDs de los papers de partida
+
+        Returns:
+            Número de semillas nuevas
+        """
+        with self._conexion:
+            cursor = self._conexion.executemany(
+                "INSERT INTO nodos (paper_id, profundidad) VALUES (?, 0) "
+                "ON CONFLICT(paper_id) DO UPDATE SET profundidad = 0, "
+                "estado = CASE WHEN estado = 'hoja' THEN 'pendiente' ELSE estado END "
+                "WHERE nodos.profundidad > 0",
+                ((paper_id,) for paper_id in paper_ids)
+            )
+        return cursor.rowcount
+
+    def _expandir(self, paper_id: str) -> Tuple[List[Tuple[str, str]], Dict[str, List[Dict]]]:
+        """
+        Pide las referencias y/o citas de un nodo (se ejecuta en un hilo del pool)
+
+        Returns:
+            Tupla (aristas citante->citado, papers vecinos crudos por ruta consultada)
+        """
+        aristas = []
+        vecinos = {}
+        for tipo in DIRECCIONES[self.direccion]:
+            papers = vecinos[f"/paper/{paper_id}/{tipo}"] = []
+            for paper in self.api.iterar_relacionados(paper_id, tipo, self.campos, self.max_vecinos):
+                vecino = paper['paperId']
+                aristas.append((paper_id, vecino) if tipo == 'references' else (vecino, paper_id))
+                papers.append(paper)
+        return aristas, vecinos
+
+    def _confirmar(self, paper_id: str, profundidad: int, aristas: List[Tuple[str, str]],
+                   vecinos: Dict[str, List[Dict]]) -> int:
+        """
+        Guarda en una transacción el resultado de expandir un nodo
+
+        Returns:
+            Número de aristas nuevas
+        """
+        # Los vecinos más allá de max_profundidad quedan como 'hoja': forman
+        # parte del grafo pero no se expanden
+        estado_vecinos = 'pendiente' if profundidad + 1 <= self.max_profundidad else 'hoja'
+        with self._conexion:
+            antes = self._conexion.total_changes
+            self._conexion.executemany(
+                "INSERT OR IGNORE INTO aristas (citante, citado) VALUES (?, ?)", aristas
+            )
+            nuevas = self._conexion.total_changes - antes
+            self._conexion.executemany(
+                "INSERT INTO nodos (paper_id, profundidad, estado) VALUES (?, ?, ?) "
+                "ON CONFLICT(paper_id) DO UPDATE SET profundidad = excluded.profundidad, "
+                "estado = CASE WHEN nodos.estado = 'hoja' THEN excluded.estado ELSE nodos.estado END "
+                "WHERE excluded.profundidad < nodos.profundidad",
+                ((paper['paperId'], profundidad + 1, estado_vecinos)
+                 for papers in vecinos.values() for paper in papers)
+            )
+            self._conexion.execute(
+                "UPDATE nodos SET estado = 'hecho', error = NULL WHERE paper_id = ?", (paper_id,)
+            )
+        if self.almacen is not None:
+            for ruta, papers in vecinos.items():
+                articulos = self.api.normalizar_pagina(papers, self.campos, ruta)
+                self.almacen.ingerir(articulo for articulo in articulos if articulo)
+        return nuevas
+
+    def _marcar_error(self, paper_id: str, error: Exception):
+        """Marca un nodo como fallido para no repetirlo en esta ejecución"""
+        with self._conexion:
+            self._conexion.execute(
+                "UPDATE nodos SET estado = 'error', error = ? WHERE paper_id = ?", (str(error), paper_id)
+            )
+
+    def _siguientes(self, reservados: set, cantidad: int) -> List[Tuple[str, int]]:
+        """Nodos pendientes de menor profundidad que no estén ya en cola o en vuelo"""
+        filas = self._conexion.execute(
+            "SELECT paper_id, profundidad FROM nodos WHERE estado = 'pendiente' AND profundidad <= ? "
+            "ORDER BY profundidad LIMIT ?",
+            (self.max_profundidad, cantidad + len(reservados))
+        ).fetchall()
+        return [fila for fila in filas if fila[0] not in reservados][:cantidad]
+
+    def estadisticas(self) -> Dict[str, int]:
+        """
+        Cuenta nodos por estado y aristas
+
+        Returns:
+            Diccionario con hechos, pendientes, hojas, errores y aristas
+        """
+        conteos = dict(self._conexion.execute("SELECT estado, COUNT(*) FROM nodos GROUP BY estado"))
+        return {
+            'hechos': conteos.get('hecho', 0),
+            'pendientes': conteos.get('pendiente', 0),
+            'hojas': conteos.get('hoja', 0),
+            'errores': conteos.get('error', 0),
+            'aristas': self._conexion.execute("SELECT COUNT(*) FROM aristas").fetchone()[0],
+        }
+
+    def ejecutar(self, semillas: Iterable[str] = (), max_nodos: Optional[int] = None,
+                 reintentar_errores: bool = True, intervalo_progreso: float = 1.0) -> Dict:
+        """
+        Expande la frontera hasta agotarla, llegar a max_nodos o ser interrumpido
+
+        Se puede cortar con Ctrl+C en cualquier momento; la siguiente llamada
+        continúa por donde se quedó.
+
+        Args:
+            semillas: Papers de partida (se suman a los de ejecuciones anteriores)
+            max_nodos: Máximo de nodos a expandir en esta ejecución (None = sin límite)
+            reintentar_errores: Volver a poner en la frontera los nodos que fallaron antes
+            intervalo_progreso: Segundos entre actualizaciones del progreso (0 = no mostrar)
+
+        Returns:
+            Resumen con nodos expandidos, aristas nuevas, errores, duración, nodos/s
+            y el estado acumulado del crawl
+        """
+        self.agregar_semillas(semillas)
+        with self._conexion:
+            # Si se amplió max_profundidad desde la última ejecución, las hojas vuelven a la frontera
+            self._conexion.execute(
+                "UPDATE nodos SET estado = 'pendiente' WHERE estado = 'hoja' AND profundidad <= ?",
+                (self.max_profundidad,)
+            )
+            if reintentar_errores:
+                self._conexion.execute("UPDATE nodos SET estado = 'pendiente', error = NULL WHERE estado = 'error'")
+
+        expandidos = aristas_nuevas = errores = 0
+        inicio = ultimo_informe = time.perf_counter()
+        peticiones_inicio = self._peticiones()
+        cola: deque = deque()
+        en_vuelo = {}
+
+        def informar(final: bool = False):
+            duracion = time.perf_counter() - inicio
+            estado = self.estadisticas()
+            print(f"\r🕸️  {expandidos} nodos expandidos ({expandidos / duracion if duracion else 0:.1f}/s), "
+                  f"{estado['pendientes']} en frontera, {estado['aristas']} aristas, {errores} errores",
+                  end='\n' if final else '', flush=True)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while True:
+                # Mantener el pool lleno con los nodos de menor profundidad
+                limite_envio = self.max_workers * 2
+                while len(en_vuelo) < limite_envio:
+                    if max_nodos is not None and expandidos + len(en_vuelo) >= max_nodos:
+                        break
+                    if not cola:
+                        reservados = {paper_id for paper_id, _ in en_vuelo.values()}
+                        cola.extend(self._siguientes(reservados, 500))
+                        if not cola:
+                            break
+                    paper_id, profundidad = cola.popleft()
+                    en_vuelo[executor.submit(self._expandir, paper_id)] = (paper_id, profundidad)
+
+                if not en_vuelo:
+                    break
+
+                listos, _ = wait(en_vuelo, timeout=intervalo_progreso or None, return_when=FIRST_COMPLETED)
+                for futura in listos:
+                    paper_id, profundidad = en_vuelo.pop(futura)
+                    # Un nodo que falla (red, respuesta inesperada, almacén) se
+                    # marca como error y el crawl sigue con el resto
+                    try:
+                        aristas, vecinos = futura.result()
+                        aristas_nuevas += self._confirmar(paper_id, profundidad, aristas, vecinos)
+                    except Exception as e:
+                        self._marcar_error(paper_id, e)
+                        errores += 1
+                        continue
+                    expandidos += 1
+
+                if intervalo_progreso and time.perf_counter() - ultimo_informe >= intervalo_progreso:
+                    informar()
+                    ultimo_informe = time.perf_counter()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if intervalo_progreso:
+                informar(final=True)
+
+        duracion = time.perf_counter() - inicio
+        return {
+            'expandidos': expandidos,
+            'aristas_nuevas': aristas_nuevas,
+            'errores': errores,
+            'peticiones': self._peticiones() - peticiones_inicio,
+            'duracion_s': duracion,
+            'nodos_por_s': expandidos / duracion if duracion else 0.0,
+            **self.estadisticas(),
+        }
+
+    def _peticiones(self) -> int:
+        """Peticiones concedidas por el rate limiter del cliente (para el throughput)"""
+        return self.api.rate_limiter.concedidos
+
+    def aristas(self) -> Iterable[Tuple[str, str]]:
+        """
+        Recorre todas las aristas guardadas
+
+        Yields:
+            Tuplas (citante, citado)
+        """
+        yield from self._conexion.execute("SELECT citante, citado FROM aristas")
+
+    def cerrar(self):
+        """Cierra el archivo del crawl"""
+        self._conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cerrar()
+
+
+def main():
+    """Punto de entrada por línea de comandos"""
+    parser = argparse.ArgumentParser(description="Expande el grafo de citas alrededor de papers semilla")
+    parser.add_argument('semillas', nargs='*', help="IDs de los papers de partida")
+    parser.add_argument('--estado', default=os.path.join("data", "crawl_semantic_scholar.sqlite"),
+                        help="Archivo SQLite con la frontera y las aristas")
+    parser.add_argument('--direccion', choices=list(DIRECCIONES), default='ambas')
+    parser.add_argument('--profundidad', type=int, default=2, help="Saltos máximos desde las semillas")
+    parser.add_argument('--max-nodos', type=int, help="Máximo de nodos a expandir en esta ejecución")
+    parser.add_argument('--max-vecinos', type=int, default=1000, help="Referencias/citas máximas por nodo")
+    parser.add_argument('--workers', type=int, default=8, help="Nodos expandidos simultáneamente")
+    parser.add_argument('--api-key', default=os.environ.get('SEMANTIC_SCHOLAR_API_KEY'),
+                        help="API key (default: variable SEMANTIC_SCHOLAR_API_KEY)")
+    args = parser.parse_args()
+
+    with SemanticScholarAPI(args.api_key, pool_size=max(10, args.workers)) as api, \
+            CrawlerCitas(api, args.estado, args.direccion, args.profundidad,
+                         args.max_vecinos, args.workers) as crawler:
+        try:
+            resumen = crawler.ejecutar(args.semillas, args.max_nodos)
+        except KeyboardInterrupt:
+            print("\n⏸️  Crawl interrumpido; vuelve a ejecutar el mismo comando para reanudar")
+            sys.exit(130)
+    print(f"✅ {resumen['expandidos']} nodos expandidos en {resumen['duracion_s']:.1f} s "
+          f"({resumen['nodos_por_s']:.1f} nodos/s), {resumen['aristas_nuevas']} aristas nuevas")
+    print(f"📁 Estado: {os.path.abspath(args.estado)} ({resumen['aristas']} aristas, "
+          f"{resumen['pendientes']} pendientes, {resumen['errores']} errores)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""
+Servidor local que imita la API de Semantic Scholar
+Sirve respuestas sintéticas para probar y medir el cliente sin conexión a Internet
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+
+PREFIJO_API = "/graph/v1"
+
+CAMPOS_ESTUDIO = ['Computer Science', 'Medicine', 'Biology', 'Physics', 'Mathematics', 'Economics']
+VENUES = ['Nature', 'Science', 'NeurIPS', 'ICML', 'ACL', 'The Lancet', '']
+
+# El endpoint bulk real devuelve hasta 1000 artículos por página
+TAMAÑO_PAGINA_BULK = 1000
+
+# Parámetros de filtro que admiten /paper/search y /paper/search/bulk
+FILTROS_BUSQUEDA = ['year', 'publicationDateOrYear', 'minCitationCount', 'venue',
+                    'fieldsOfStudy', 'publicationTypes', 'openAccessPdf']
+
+# La búsqueda por relevancia no pagina más allá de 1000 resultados
+MAX_RESULTADOS_RELEVANCIA = 1000
+
+
+def paper_id_sintetico(indice: int) -> str:
+    """
+    Genera un paperId de 40 caracteres hexadecimales a partir de un índice
+
+    Args:
+        indice: Posición del paper en el corpus sintético
+
+    Returns:
+        ID con el mismo formato que los de Semantic Scholar
+    """
+    return f"{indice:040x}"
+
+
+def generar_paper(indice: int) -> Dict:
+    """
+    Genera un paper sintético determinista con la forma de la API real
+
+    Args:
+        indice: Posición del paper en el corpus sintético
+
+    Returns:
+        Diccionario con los campos que devuelve /paper/search
+    """
+    paper_id = paper_id_sintetico(indice)
+    year = 1990 + indice % 35
+    num_autores = 1 + indice % 6
+    return {
+        'paperId': paper_id,
+        'title': f"Synthetic paper number {indice} about topic {indice % 97}",
+        'abstract': None if indice % 11 == 0 else f"Abstract of synthetic paper {indice}. " * 4,
+        'authors': [
+            {'authorId': str(1000 + (indice + j) % 5000), 'name': f"Author {(indice + j) % 5000}"}
+            for j in range(num_autores)
+        ],
+        'year': year,
+        'citationCount': (indice * 7919) % 5000,
+        'url': f"https://www.semanticscholar.org/paper/{paper_id}",
+        'venue': VENUES[indice % len(VENUES)],
+        'publicationDate': f"{year}-{1 + indice % 12:02d}-{1 + indice % 28:02d}",
+        'publicationTypes': ['JournalArticle'] if indice % 2 else ['Conference'],
+        'fieldsOfStudy': [CAMPOS_ESTUDIO[indice % len(CAMPOS_ESTUDIO)]],
+        'openAccessPdf': {'url': f"https://example.org/{paper_id}.pdf"} if indice % 3 == 0 else None,
+    }
+
+
+# Distancias (en índice) de las referencias de cada paper: el paper i cita a
+# i - d para las primeras num_referencias(i) distancias
+_DISTANCIAS_REFERENCIA = [1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233, 377, 610, 987]
+
+
+def _num_referencias(indice: int) -> int:
+    """Número de referencias del paper sintético `indice` (entre 0 y 15)"""
+    return indice % (len(_DISTANCIAS_REFERENCIA) + 1)
+
+
+def referencias_sinteticas(indice: int) -> List[int]:
+    """
+    Índices de los papers que cita el paper sintético `indice` (grafo determinista)
+
+    Args:
+        indice: Posición del paper en el corpus sintético
+
+    Returns:
+        Lista de índices citados (todos menores que `indice`)
+    """
+    return [indice - d for d in _DISTANCIAS_REFERENCIA[:_num_referencias(indice)] if indice - d >= 0]
+
+
+def citas_sinteticas(indice: int, total_papers: int) -> List[int]:
+    """
+    Índices de los papers que citan al paper sintético `indice`
+
+    Args:
+        indice: Posición del paper en el corpus sintético
+        total_papers: Tamaño del corpus
+
+    Returns:
+        Lista de índices que lo citan (inversa de referencias_sinteticas)
+    """
+    return [
+        indice + d for k, d in enumerate(_DISTANCIAS_REFERENCIA)
+        if indice + d < total_papers and k < _num_referencias(indice + d)
+    ]
+
+
+def generar_autor(author_id: int, nombre: Optional[str], total_papers: int) -> Dict:
+    """
+    Genera un autor sintético con la forma de /author/{id}
+
+    Args:
+        author_id: ID numérico del autor
+        nombre: Nombre a usar (None = 'Author <id>')
+        total_papers: Tamaño del corpus (todos los autores firman todo el corpus)
+
+    Returns:
+        Diccionario con los campos de autor de la API
+    """
+    return {
+        'authorId': str(author_id),
+        'name': nombre or f"Author {author_id}",
+        'affiliations': [f"University {author_id % 50}"],
+        'paperCount': total_papers,
+        'citationCount': (author_id * 7919) % 100000,
+        'hIndex': author_id % 80,
+    }
+
+
+def _indice_por_titulo(query: str, total_papers: int) -> Optional[int]:
+    """Índice del paper sintético mencionado en una consulta ('... number 123 ...'), o None"""
+    encontrado = re.search(r'number (\d+)', query, re.IGNORECASE)
+    if not encontrado or int(encontrado.group(1)) >= total_papers:
+        return None
+    return int(encontrado.group(1))
+
+
+def _cumple_filtros(paper: Dict, filtros: Dict[str, str]) -> bool:
+    """Aplica los parámetros de filtro de /paper/search y /paper/search/bulk a un paper"""
+    if 'year' in filtros:
+        desde, guion, hasta = filtros['year'].partition('-')
+        minimo = int(desde) if desde else 0
+        maximo = (int(hasta) if hasta else 9999) if guion else minimo
+        if not minimo <= paper['year'] <= maximo:
+            return False
+    if 'publicationDateOrYear' in filtros:
+        desde, _, hasta = filtros['publicationDateOrYear'].partition(':')
+        fecha = paper['publicationDate']
+        if (desde and fecha[:len(desde)] < desde) or (hasta and fecha[:len(hasta)] > hasta):
+            return False
+    if 'minCitationCount' in filtros and paper['citationCount'] < int(filtros['minCitationCount']):
+        return False
+    if 'venue' in filtros and paper['venue'] not in filtros['venue'].split(','):
+        return False
+    if 'fieldsOfStudy' in filtros and not set(paper['fieldsOfStudy']) & set(filtros['fieldsOfStudy'].split(',')):
+        return False
+    if 'publicationTypes' in filtros and \
+            not set(paper['publicationTypes']) & set(filtros['publicationTypes'].split(',')):
+        return False
+    if 'openAccessPdf' in filtros and not paper['openAccessPdf']:
+        return False
+    return True
+
+
+def _proyectar(paper: Dict, fields: Optional[str]) -> Dict:
+    """Devuelve solo los campos pedidos (el ID siempre se incluye, como en la API)"""
+    if not fields:
+        return {clave: paper[clave] for clave in ('paperId', 'title', 'authorId', 'name') if clave in paper}
+    campos = set(fields.split(','))
+    campos.update(('paperId', 'authorId'))
+    return {clave: valor for clave, valor in paper.items() if clave in campos}
+
+
+class ServidorFalso:
+    """
+    Servidor HTTP local con endpoints compatibles con la Graph API de Semantic Scholar
+
+    Responde desde fixtures grabadas (ver semantic_scholar_fixtures) si las hay y,
+    si no, con el corpus sintético. Puede simular latencia, errores 5xx y 429
+    para medir el cliente en condiciones realistas sin tocar la API.
+
+    Uso:
+        with ServidorFalso(latencia=0.05, tasa_errores=0.01, tasa_429=0.05) as servidor:
+            api = SemanticScholarAPI(base_url=servidor.base_url)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", puerto: int = 0, total_papers: int = 1000,
+                 latencia: float = 0.0, jitter_latencia: float = 0.0, tasa_errores: float = 0.0,
+                 tasa_429: float = 0.0, retry_after: Optional[float] = None, fixtures=None,
+                 semilla: Optional[int] = None):
+        """
+        Inicializa el servidor (no empieza a escuchar hasta llamar a iniciar())
+
+        Args:
+            host: Dirección en la que escuchar
+            puerto: Puerto TCP (0 = elegir uno libre)
+            total_papers: Tamaño del corpus sintético
+            latencia: Segundos de retardo añadidos a cada respuesta
+            jitter_latencia: Retardo adicional aleatorio uniforme entre 0 y este valor
+            tasa_errores: Fracción de peticiones que fallan con 503
+            tasa_429: Fracción de peticiones rechazadas con 429 Too Many Requests
+            retry_after: Valor de la cabecera Retry-After de los 429 (None = sin cabecera)
+            fixtures: FixturesHTTP cuyas respuestas grabadas se sirven antes que las sintéticas
+            semilla: Semilla de la inyección de fallos y la latencia (reproducibilidad)
+        """
+        self.host = host
+        self.puerto = puerto
+        self.total_papers = total_papers
+        self.latencia = latencia
+        self.jitter_latencia = jitter_latencia
+        self.tasa_errores = tasa_errores
+        self.tasa_429 = tasa_429
+        self.retry_after = retry_after
+        self.fixtures = fixtures
+        self.peticiones = 0
+        self.errores_inyectados = 0
+        self.limites_inyectados = 0
+        self.respuestas_grabadas = 0
+        self._aleatorio = random.Random(semilla)
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._hilo: Optional[threading.Thread] = None
+        self._cache_indices: Dict[Tuple, List[int]] = {}
+
+    @property
+    def base_url(self) -> str:
+        """URL base para pasar a SemanticScholarAPI(base_url=...)"""
+        return f"http://{self.host}:{self.puerto}{PREFIJO_API}"
+
+    def iniciar(self) -> 'ServidorFalso':
+        """Empieza a atender peticiones en un hilo en segundo plano"""
+        servidor = self
+
+        class Manejador(_ManejadorFalso):
+            fake = servidor
+
+        self._httpd = ThreadingHTTPServer((self.host, self.puerto), Manejador)
+        self._httpd.daemon_threads = True
+        self.puerto = self._httpd.server_address[1]
+        self._hilo = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        """Detiene el servidor y libera el puerto"""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.detener()
+
+    def atender(self, metodo: str, ruta: str, params: Dict[str, str],
+                cuerpo: Optional[Dict]) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Responde a una petición aplicando latencia, fallos inyectados y fixtures
+
+        Args:
+            metodo: Método HTTP
+            ruta: Ruta sin el prefijo /graph/v1
+            params: Parámetros de la query string
+            cuerpo: Cuerpo JSON de la petición (si lo hay)
+
+        Returns:
+            Tupla (código de estado, cuerpo JSON o bytes que se envían tal cual,
+            cabeceras adicionales)
+        """
+        with self._lock:
+            sorteo = self._aleatorio.random()
+            retardo = self.latencia + self._aleatorio.uniform(0, self.jitter_latencia)
+        if retardo > 0:
+            time.sleep(retardo)
+
+        if sorteo < self.tasa_429:
+            with self._lock:
+                self.peticiones += 1
+                self.limites_inyectados += 1
+            cabeceras = {'Retry-After': str(self.retry_after)} if self.retry_after is not None else {}
+            return 429, {'message': 'Too Many Requests'}, cabeceras
+        if sorteo < self.tasa_429 + self.tasa_errores:
+            with self._lock:
+                self.peticiones += 1
+                self.errores_inyectados += 1
+            return 503, {'message': 'Service Unavailable (inyectado)'}, {}
+
+        if self.fixtures is not None:
+            grabada = self.fixtures.buscar(metodo, ruta, params, cuerpo)
+            if grabada is not None:
+                with self._lock:
+                    self.peticiones += 1
+                    self.respuestas_grabadas += 1
+                return grabada[0], grabada[1], {}
+
+        estado, datos = self.responder(metodo, ruta, params, cuerpo)
+        return estado, datos, {}
+
+    def responder(self, metodo: str, ruta: str, params: Dict[str, str], cuerpo: Optional[Dict]) -> Tuple[int, Any]:
+        """
+        Calcula la respuesta sintética para una petición
+
+        Args:
+            metodo: Método HTTP
+            ruta: Ruta sin el prefijo /graph/v1
+            params: Parámetros de la query string
+            cuerpo: Cuerpo JSON de la petición (si lo hay)
+
+        Returns:
+            Tupla (código de estado, cuerpo JSON)
+        """
+        with self._lock:
+            self.peticiones += 1
+
+        partes = [p for p in ruta.split('/') if p]
+        fields = params.get('fields')
+
+        if metodo == 'GET' and partes == ['paper', 'search', 'match']:
+            # Solo reconoce títulos sintéticos completos (salvo mayúsculas y puntuación)
+            indice = _indice_por_titulo(params.get('query', ''), self.total_papers)
+            if indice is None or generar_paper(indice)['title'].lower() not in params.get('query', '').lower():
+                return 404, {'error': 'Title match not found'}
+            paper = _proyectar(generar_paper(indice), fields)
+            paper['matchScore'] = 200.0
+            return 200, {'data': [paper]}
+
+        if metodo == 'GET' and partes == ['paper', 'search']:
+            offset = int(params.get('offset', 0))
+            limit = int(params.get('limit', 10))
+            if offset + limit > MAX_RESULTADOS_RELEVANCIA:
+                return 400, {'error': f'offset + limit must be <= {MAX_RESULTADOS_RELEVANCIA}'}
+            # El filtro de años puede llegar como parámetro o como sufijo 'year:' de la consulta
+            query, _, year = params.get('query', '').partition(' year:')
+            if year and not params.get('year'):
+                params = dict(params, year=year)
+            coincidencias = self._indices_ordenados(None, params)
+            fin = min(offset + limit, len(coincidencias), MAX_RESULTADOS_RELEVANCIA)
+            indices = coincidencias[offset:fin]
+            # Si la consulta menciona un paper sintético concreto, va primero
+            buscado = _indice_por_titulo(query, self.total_papers)
+            if buscado is not None and offset == 0:
+                indices = [buscado] + [i for i in indices if i != buscado][:max(0, fin - offset - 1)]
+            respuesta = {
+                'total': len(coincidencias),
+                'offset': offset,
+                'data': [_proyectar(generar_paper(i), fields) for i in indices],
+            }
+            if fin < min(len(coincidencias), MAX_RESULTADOS_RELEVANCIA):
+                respuesta['next'] = fin
+            return 200, respuesta
+
+        if metodo == 'GET' and partes == ['paper', 'search', 'bulk']:
+            indices = self._indices_ordenados(params.get('sort'), params)
+            inicio = int(params.get('token') or 0)
+            fin = min(inicio + TAMAÑO_PAGINA_BULK, len(indices))
+            respuesta = {
+                'total': len(indices),
+                'data': [_proyectar(generar_paper(i), fields) for i in indices[inicio:fin]],
+                'token': str(fin) if fin < len(indices) else None,
+            }
+            return 200, respuesta
+
+        if metodo == 'GET' and len(partes) == 3 and partes[0] == 'paper' and partes[2] in ('references', 'citations'):
+            indice = self._indice_paper(partes[1])
+            if indice is None:
+                return 404, {'error': 'Paper not found'}
+            if partes[2] == 'references':
+                relacionados, clave = referencias_sinteticas(indice), 'citedPaper'
+            else:
+                relacionados, clave = citas_sinteticas(indice, self.total_papers), 'citingPaper'
+            offset = int(params.get('offset', 0))
+            limit = int(params.get('limit', 100))
+            if limit > 1000:
+                return 400, {'error': 'Limit must be <= 1000'}
+            fin = min(offset + limit, len(relacionados))
+            respuesta = {
+                'offset': offset,
+                'data': [{clave: _proyectar(generar_paper(i), fields)} for i in relacionados[offset:fin]],
+            }
+            if fin < len(relacionados):
+                respuesta['next'] = fin
+            return 200, respuesta
+
+        if metodo == 'GET' and len(partes) == 2 and partes[0] == 'paper':
+            indice = self._indice_paper(partes[1])
+            if indice is None:
+                return 404, {'error': 'Paper not found'}
+            return 200, _proyectar(generar_paper(indice), fields)
+
+        if metodo == 'POST' and partes == ['paper', 'batch']:
+            ids = (cuerpo or {}).get('ids') or []
+            if len(ids) > 500:
+                return 400, {'error': 'Cannot process more than 500 ids'}
+            respuesta = []
+            for paper_id in ids:
+                indice = self._indice_paper(paper_id)
+                respuesta.append(None if indice is None else _proyectar(generar_paper(indice), fields))
+            return 200, respuesta
+
+        if metodo == 'GET' and partes == ['author', 'search']:
+            # Tres homónimos por nombre: el primero con el nombre exacto
+            query = params.get('query', '')
+            limit = int(params.get('limit', 100))
+            candidatos = [
+                _proyectar(generar_autor(1000 + k, query if k == 0 else f"{query} {chr(ord('A') + k)}.",
+                                         self.total_papers), fields)
+                for k in range(3)
+            ]
+            return 200, {'total': len(candidatos), 'offset': 0, 'data': candidatos[:limit]}
+
+        if metodo == 'GET' and len(partes) == 2 and partes[0] == 'author':
+            if not partes[1].isdigit():
+                return 404, {'error': 'Author not found'}
+            return 200, _proyectar(generar_autor(int(partes[1]), None, self.total_papers), fields)
+
+        if metodo == 'POST' and partes == ['author', 'batch']:
+            ids = (cuerpo or {}).get('ids') or []
+            if len(ids) > 1000:
+                return 400, {'error': 'Cannot process more than 1000 ids'}
+            return 200, [
+                _proyectar(generar_autor(int(author_id), None, self.total_papers), fields)
+                if str(author_id).isdigit() else None
+                for author_id in ids
+            ]
+
+        if metodo == 'GET' and len(partes) == 3 and partes[0] == 'author' and partes[2] == 'papers':
+            offset = int(params.get('offset', 0))
+            limit = int(params.get('limit', 100))
+            fin = min(offset + limit, self.total_papers)
+            respuesta = {
+                'offset': offset,
+                'data': [_proyectar(generar_paper(i), fields) for i in range(offset, fin)],
+            }
+            if fin < self.total_papers:
+                respuesta['next'] = fin
+            return 200, respuesta
+
+        return 404, {'error': f'Ruta no soportada: {metodo} {ruta}'}
+
+    def _indices_ordenados(self, orden: Optional[str], params: Dict[str, str]) -> List[int]:
+        """Índices del corpus que pasan los filtros de `params`, ordenados como pide `sort`"""
+        filtros = {nombre: params[nombre] for nombre in FILTROS_BUSQUEDA if nombre in params}
+        clave = (orden, tuple(sorted(filtros.items())))
+        with self._lock:
+            if clave in self._cache_indices:
+                return self._cache_indices[clave]
+
+        indices = range(self.total_papers)
+        if filtros:
+            indices = [i for i in indices if _cumple_filtros(generar_paper(i), filtros)]
+        indices = list(indices)
+
+        if orden:
+            campo, _, direccion = orden.partition(':')
+            indices.sort(key=lambda i: generar_paper(i).get(campo) or 0, reverse=direccion == 'desc')
+
+        with self._lock:
+            self._cache_indices[clave] = indices
+        return indices
+
+    def _indice_paper(self, paper_id: str) -> Optional[int]:
+        """Convierte un paperId sintético en su índice, o None si no existe"""
+        try:
+            indice = int(paper_id, 16)
+        except ValueError:
+            return None
+        if len(paper_id) != 40 or indice >= self.total_papers:
+            return None
+        return indice
+
+
+class _ManejadorFalso(BaseHTTPRequestHandler):
+    """Handler HTTP/1.1 (keep-alive) que delega en ServidorFalso.responder"""
+
+    protocol_version = 'HTTP/1.1'
+    # Cabeceras y cuerpo se escriben por separado: sin TCP_NODELAY el keep-alive
+    # sufre el retardo de Nagle + ACK diferido (~40 ms por respuesta)
+    disable_nagle_algorithm = True
+    fake: ServidorFalso = None
+
+    def do_GET(self):
+        self._atender('GET')
+
+    def do_POST(self):
+        self._atender('POST')
+
+    def _atender(self, metodo: str):
+        url = urlparse(self.path)
+        ruta = url.path
+        if ruta.startswith(PREFIJO_API):
+            ruta = ruta[len(PREFIJO_API):]
+        params = {clave: valores[-1] for clave, valores in parse_qs(url.query, keep_blank_values=True).items()}
+
+        cuerpo = None
+        longitud = int(self.headers.get('Content-Length') or 0)
+        if longitud:
+            cuerpo = json.loads(self.rfile.read(longitud))
+
+        estado, datos, cabeceras = self.fake.atender(metodo, ruta, params, cuerpo)
+        contenido = datos if isinstance(datos, bytes) else json.dumps(datos).encode('utf-8')
+        self.send_response(estado)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(contenido)))
+        for nombre, valor in cabeceras.items():
+            self.send_header(nombre, valor)
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    def log_message(self, format, *args):
+        # Silenciar el log por petición de BaseHTTPRequestHandler
+        pass
+
+
+def main():
+    """Punto de entrada por línea de comandos"""
+    parser = argparse.ArgumentParser(description="Servidor local que imita la API de Semantic Scholar")
+    parser.add_argument('puerto', type=int, nargs='?', default=8787, help="Puerto TCP (default: 8787)")
+    parser.add_argument('--papers', type=int, default=1000, help="Tamaño del corpus sintético")
+    parser.add_argument('--latencia', type=float, default=0.0, help="Segundos de retardo por respuesta")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Retardo aleatorio adicional máximo")
+    parser.add_argument('--tasa-errores', type=float, default=0.0, help="Fracción de respuestas 503")
+    parser.add_argument('--tasa-429', type=float, default=0.0, help="Fracción de respuestas 429")
+    parser.add_argument('--retry-after', type=float, default=None, help="Cabecera Retry-After de los 429")
+    parser.add_argument('--fixtures', help="Directorio de respuestas grabadas a servir")
+    parser.add_argument('--semilla', type=int, default=None, help="Semilla para la inyección de fallos")
+    args = parser.parse_args()
+
+    fixtures = None
+    if args.fixtures:
+        from semantic_scholar_fixtures import FixturesHTTP
+        fixtures = FixturesHTTP(args.fixtures, modo='reproducir')
+
+    servidor = ServidorFalso(
+        puerto=args.puerto, total_papers=args.papers, latencia=args.latencia, jitter_latencia=args.jitter,
+        tasa_errores=args.tasa_errores, tasa_429=args.tasa_429, retry_after=args.retry_after,
+        fixtures=fixtures, semilla=args.semilla
+    ).iniciar()
+    print(f"🧪 Servidor falso de Semantic Scholar escuchando en {servidor.base_url}")
+    if fixtures is not None:
+        print(f"📼 Sirviendo {len(fixtures)} respuestas grabadas de {fixtures.directorio}")
+    print("Presione Ctrl+C para detener")
+    try:
+        servidor._hilo.join()
+    except KeyboardInterrupt:
+        servidor.detener()
+
+
+if __name__ == "__main__":
+    main()
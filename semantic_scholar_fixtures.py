@@ -0,0 +1,137 @@
+"""
+Grabación y reproducción de respuestas de la API de Semantic Scholar
+Guarda en disco las respuestas reales una vez y las reproduce después sin red,
+tanto en el cliente como en el servidor falso
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from semantic_scholar_cache import clave_peticion
+from semantic_scholar_retry import error_http
+
+
+MODOS_FIXTURES = ('grabar', 'reproducir')
+
+
+class FixtureNoEncontrada(LookupError):
+    """En modo reproducir se pidió una petición que no se grabó"""
+
+
+class FixturesHTTP:
+    """
+    Directorio de respuestas grabadas, un archivo JSON por petición
+
+    El nombre de cada archivo es la clave de caché de la petición (ver
+    clave_peticion), así el orden de los parámetros o de `fields` no importa.
+    Cada archivo guarda la petición (para poder leerlo) y la respuesta con su
+    código de estado; las respuestas de error definitivas (404, 400...) también
+    se graban y se reproducen como el mismo error tipado.
+
+    Uso:
+        # Primera vez, contra la API real
+        api = SemanticScholarAPI(api_key, fixtures=FixturesHTTP("fixtures/s2", modo="grabar"))
+        # Después, sin red y de forma reproducible
+        api = SemanticScholarAPI(fixtures=FixturesHTTP("fixtures/s2", modo="reproducir"))
+    """
+
+    def __init__(self, directorio: str = os.path.join("fixtures", "semantic_scholar"), modo: str = 'reproducir'):
+        """
+        Inicializa el directorio de fixtures
+
+        Args:
+            directorio: Carpeta con los archivos JSON
+            modo: 'grabar' (las peticiones van a la red y se guardan) o
+                'reproducir' (se sirven desde disco y nunca se toca la red)
+        """
+        if modo not in MODOS_FIXTURES:
+            raise ValueError(f"Modo de fixtures no soportado: {modo} (opciones: {', '.join(MODOS_FIXTURES)})")
+        if not os.path.exists(directorio):
+            os.makedirs(directorio)
+
+        self.directorio = directorio
+        self.modo = modo
+        self.grabadas = 0
+        self.reproducidas = 0
+        self._lock = threading.Lock()
+
+    @property
+    def reproduciendo(self) -> bool:
+        return self.modo == 'reproducir'
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, f"{clave}.json")
+
+    def grabar(self, metodo: str, ruta: str, params: Optional[Dict], cuerpo: Optional[Dict],
+               estado: int, respuesta: Any):
+        """
+        Guarda una respuesta (escritura atómica: nunca queda un archivo a medias)
+
+        Args:
+            metodo: Método HTTP
+            ruta: Ruta relativa a base_url
+            params: Parámetros de la query string
+            cuerpo: Cuerpo JSON de la petición
+            estado: Código de estado HTTP
+            respuesta: Cuerpo JSON de la respuesta
+        """
+        clave = clave_peticion(metodo, ruta, params, cuerpo)
+        registro = {
+            'metodo': metodo, 'ruta': ruta, 'params': params or {}, 'cuerpo': cuerpo,
+            'estado': estado, 'respuesta': respuesta,
+        }
+        destino = self._ruta(clave)
+        temporal = f"{destino}.{threading.get_ident()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(registro, archivo, ensure_ascii=False)
+        os.replace(temporal, destino)
+        with self._lock:
+            self.grabadas += 1
+
+    def buscar(self, metodo: str, ruta: str, params: Optional[Dict] = None,
+               cuerpo: Optional[Dict] = None) -> Optional[Tuple[int, Any]]:
+        """
+        Busca la respuesta grabada de una petición
+
+        Returns:
+            Tupla (estado, respuesta), o None si no se grabó
+        """
+        try:
+            with open(self._ruta(clave_peticion(metodo, ruta, params, cuerpo)), encoding='utf-8') as archivo:
+                registro = json.load(archivo)
+        except FileNotFoundError:
+            return None
+        return registro['estado'], registro['respuesta']
+
+    def reproducir(self, metodo: str, ruta: str, params: Optional[Dict] = None, cuerpo: Optional[Dict] = None):
+        """
+        Devuelve la respuesta grabada como lo haría el cliente
+
+        Returns:
+            Respuesta JSON decodificada
+
+        Raises:
+            FixtureNoEncontrada: Si la petición no se grabó
+            ErrorHTTP: Si lo grabado fue una respuesta de error (ErrorNoEncontrado, ...)
+        """
+        encontrada = self.buscar(metodo, ruta, params, cuerpo)
+        if encontrada is None:
+            raise FixtureNoEncontrada(f"No hay respuesta grabada para {metodo} {ruta} {params or {}}")
+        with self._lock:
+            self.reproducidas += 1
+        estado, respuesta = encontrada
+        if estado >= 400:
+            raise error_http(estado, ruta, json.dumps(respuesta))
+        return respuesta
+
+    def registros(self) -> Iterator[Dict]:
+        """Recorre todas las respuestas grabadas (petición y respuesta)"""
+        for nombre in sorted(os.listdir(self.directorio)):
+            if nombre.endswith('.json'):
+                with open(os.path.join(self.directorio, nombre), encoding='utf-8') as archivo:
+                    yield json.load(archivo)
+
+    def __len__(self) -> int:
+        return sum(1 for nombre in os.listdir(self.directorio) if nombre.endswith('.json'))
@@ -0,0 +1,298 @@
+"""
+Grafo de citas en memoria compacta
+Representación CSR con arrays de NumPy para calcular PageRank, grados y
+vecindarios sobre grafos de millones de aristas
+"""
+
+import csv
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # dependencia opcional, solo necesaria para el grafo
+    np = None
+
+
+def _csr(origen: 'np.ndarray', destino: 'np.ndarray', num_nodos: int) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    Construye una matriz de adyacencia CSR sin aristas repetidas
+
+    Returns:
+        Tupla (indptr, indices): los vecinos del nodo i son indices[indptr[i]:indptr[i + 1]]
+    """
+    claves = np.unique(origen.astype(np.int64) * num_nodos + destino)
+    origen = claves // num_nodos
+    indices = (claves % num_nodos).astype(np.int32)
+    indptr = np.zeros(num_nodos + 1, dtype=np.int64)
+    np.cumsum(np.bincount(origen, minlength=num_nodos), out=indptr[1:])
+    return indptr, indices
+
+
+def _vecinos(indptr: 'np.ndarray', indices: 'np.ndarray', nodos: 'np.ndarray') -> 'np.ndarray':
+    """Concatena los vecinos CSR de varios nodos sin bucles de Python"""
+    inicios = indptr[nodos]
+    largos = indptr[nodos + 1] - inicios
+    total = int(largos.sum())
+    if total == 0:
+        return np.empty(0, dtype=indices.dtype)
+    desplazamientos = np.repeat(inicios - (np.cumsum(largos) - largos), largos)
+    return indices[desplazamientos + np.arange(total)]
+
+
+class GrafoCitas:
+    """
+    Grafo dirigido de citas (citante -> citado) indexado por paper_id
+
+    Los nodos se numeran de 0 a n-1 (`ids` e `indice` traducen entre paper_id
+    e índice) y las aristas se guardan en CSR: un array de desplazamientos y
+    otro de vecinos int32. La matriz traspuesta (quién cita a cada nodo) se
+    construye la primera vez que se necesita.
+    """
+
+    def __init__(self, ids: List[str], indptr: 'np.ndarray', indices: 'np.ndarray'):
+        """
+        Crea el grafo a partir de arrays CSR ya construidos (ver desde_aristas())
+
+        Args:
+            ids: paper_id de cada nodo, por índice
+            indptr: Desplazamientos CSR (longitud n + 1)
+            indices: Nodos citados, agrupados por citante
+        """
+        if np is None:
+            raise ImportError("GrafoCitas requiere numpy: pip install numpy")
+
+        self.ids = ids
+        self.indice: Dict[str, int] = {paper_id: i for i, paper_id in enumerate(ids)}
+        self._indptr = indptr
+        self._indices = indices
+        self._indptr_entrada: Optional['np.ndarray'] = None
+        self._indices_entrada: Optional['np.ndarray'] = None
+        self.iteraciones_pagerank = 0
+
+    @classmethod
+    def desde_aristas(cls, aristas: Iterable[Tuple[str, str]], nodos: Iterable[str] = ()) -> 'GrafoCitas':
+        """
+        Construye el grafo a partir de pares (citante, citado)
+
+        Las aristas repetidas se cuentan una sola vez.
+
+        Args:
+            aristas: Iterable de tuplas (paper_id citante, paper_id citado)
+            nodos: paper_id adicionales que deben aparecer aunque no tengan aristas
+
+        Returns:
+            GrafoCitas
+        """
+        if np is None:
+            raise ImportError("GrafoCitas requiere numpy: pip install numpy")
+
+        indice: Dict[str, int] = {}
+        ids: List[str] = []
+
+        def numerar(paper_id: str) -> int:
+            numero = indice.get(paper_id)
+            if numero is None:
+                numero = indice[paper_id] = len(ids)
+                ids.append(paper_id)
+            return numero
+
+        pares = np.fromiter(
+            (numerar(paper_id) for arista in aristas for paper_id in arista), dtype=np.int64
+        ).reshape(-1, 2)
+        for paper_id in nodos:
+            numerar(paper_id)
+
+        indptr, indices = _csr(pares[:, 0], pares[:, 1], len(ids))
+        return cls(ids, indptr, indices)
+
+    @classmethod
+    def desde_sqlite(cls, ruta: str) -> 'GrafoCitas':
+        """
+        Carga las aristas guardadas por CrawlerCitas (tabla `aristas`)
+
+        Args:
+            ruta: Archivo SQLite del crawl
+
+        Returns:
+            GrafoCitas con todos los nodos del crawl, incluidos los que no tienen aristas
+        """
+        conexion = sqlite3.connect(ruta)
+        try:
+            nodos = [fila[0] for fila in conexion.execute("SELECT paper_id FROM nodos")]
+            return cls.desde_aristas(conexion.execute("SELECT citante, citado FROM aristas"), nodos)
+        finally:
+            conexion.close()
+
+    @property
+    def num_nodos(self) -> int:
+        return len(self.ids)
+
+    @property
+    def num_aristas(self) -> int:
+        return len(self._indices)
+
+    def _entrada(self) -> Tuple['np.ndarray', 'np.ndarray']:
+        """CSR traspuesto: para cada nodo, los nodos que lo citan"""
+        if self._indptr_entrada is None:
+            origen = np.repeat(np.arange(self.num_nodos, dtype=np.int32), np.diff(self._indptr))
+            self._indptr_entrada, self._indices_entrada = _csr(self._indices, origen, self.num_nodos)
+        return self._indptr_entrada, self._indices_entrada
+
+    def grados_salida(self) -> 'np.ndarray':
+        """Número de referencias de cada nodo dentro del grafo"""
+        return np.diff(self._indptr)
+
+    def grados_entrada(self) -> 'np.ndarray':
+        """Número de citas que recibe cada nodo dentro del grafo"""
+        return np.bincount(self._indices, minlength=self.num_nodos)
+
+    def pagerank(self, amortiguacion: float = 0.85, tolerancia: float = 1e-10,
+                 max_iteraciones: int = 100) -> 'np.ndarray':
+        """
+        Calcula PageRank por iteración de potencias vectorizada
+
+        La masa de los nodos sin referencias se reparte uniformemente.
+
+        Args:
+            amortiguacion: Probabilidad de seguir una cita (factor de damping)
+            tolerancia: Cambio total (norma L1) por debajo del cual se considera convergido
+            max_iteraciones: Límite de iteraciones
+
+        Returns:
+            Array con la puntuación de cada nodo (suma 1), en el orden de `ids`
+        """
+        n = self.num_nodos
+        if n == 0:
+            return np.zeros(0)
+
+        grados = self.grados_salida()
+        origen = np.repeat(np.arange(n, dtype=np.int32), grados)
+        inverso = np.divide(1.0, grados, out=np.zeros(n), where=grados > 0)
+        colgantes = grados == 0
+
+        puntuacion = np.full(n, 1.0 / n)
+        self.iteraciones_pagerank = 0
+        for _ in range(max_iteraciones):
+            aportes = (puntuacion * inverso)[origen]
+            nueva = np.bincount(self._indices, weights=aportes, minlength=n)
+            nueva += puntuacion[colgantes].sum() / n
+            nueva = amortiguacion * nueva + (1 - amortiguacion) / n
+            cambio = np.abs(nueva - puntuacion).sum()
+            puntuacion = nueva
+            self.iteraciones_pagerank += 1
+            if cambio < tolerancia:
+                break
+        return puntuacion
+
+    def vecindario(self, paper_id: str, k: int = 1, direccion: str = 'ambas') -> Dict[str, int]:
+        """
+        Nodos alcanzables en como mucho k saltos
+
+        Args:
+            paper_id: Nodo de partida
+            k: Número máximo de saltos
+            direccion: 'referencias' (lo que cita), 'citas' (quién lo cita) o 'ambas'
+
+        Returns:
+            Diccionario paper_id -> distancia en saltos (sin incluir el nodo de partida)
+        """
+        if direccion not in ('referencias', 'citas', 'ambas'):
+            raise ValueError(f"Dirección no soportada: {direccion}")
+        matrices = []
+        if direccion in ('referencias', 'ambas'):
+            matrices.append((self._indptr, self._indices))
+        if direccion in ('citas', 'ambas'):
+            matrices.append(self._entrada())
+
+        inicio = self.indice[paper_id]
+        distancia = np.full(self.num_nodos, -1, dtype=np.int32)
+        distancia[inicio] = 0
+        frontera = np.array([inicio], dtype=np.int64)
+        for salto in range(1, k + 1):
+            alcanzados = np.unique(np.concatenate([_vecinos(indptr, indices, frontera) for indptr, indices in matrices]))
+            alcanzados = alcanzados[distancia[alcanzados] < 0]
+            if not alcanzados.size:
+                break
+            distancia[alcanzados] = salto
+            frontera = alcanzados
+
+        encontrados = np.flatnonzero(distancia > 0)
+        return {self.ids[i]: int(distancia[i]) for i in encontrados}
+
+    def mas_influyentes(self, limite: int = 20, puntuacion: Optional['np.ndarray'] = None) -> List[Tuple[str, float]]:
+        """
+        Nodos con mayor PageRank
+
+        Args:
+            limite: Número de nodos a devolver
+            puntuacion: Resultado previo de pagerank() (se calcula si es None)
+
+        Returns:
+            Lista de tuplas (paper_id, pagerank) de mayor a menor
+        """
+        if puntuacion is None:
+            puntuacion = self.pagerank()
+        limite = min(limite, self.num_nodos)
+        mejores = np.argpartition(-puntuacion, limite - 1)[:limite] if limite else []
+        mejores = sorted(mejores, key=lambda i: -puntuacion[i])
+        return [(self.ids[i], float(puntuacion[i])) for i in mejores]
+
+    def metricas(self, puntuacion: Optional['np.ndarray'] = None) -> Iterable[Tuple[str, float, int, int]]:
+        """
+        Recorre las métricas de cada nodo
+
+        Args:
+            puntuacion: Resultado previo de pagerank() (se calcula si es None)
+
+        Yields:
+            Tuplas (paper_id, pagerank, grado_entrada, grado_salida)
+        """
+        if puntuacion is None:
+            puntuacion = self.pagerank()
+        entrada = self.grados_entrada()
+        salida = self.grados_salida()
+        for i, paper_id in enumerate(self.ids):
+            yield paper_id, float(puntuacion[i]), int(entrada[i]), int(salida[i])
+
+    def exportar_csv(self, ruta: str, puntuacion: Optional['np.ndarray'] = None, almacen=None) -> str:
+        """
+        Escribe las métricas de cada nodo en un CSV separado por |
+
+        Args:
+            ruta: Archivo de salida
+            puntuacion: Resultado previo de pagerank() (se calcula si es None)
+            almacen: AlmacenArticulos opcional del que tomar título y citation_count
+
+        Returns:
+            Ruta absoluta del archivo creado
+        """
+        directorio = os.path.dirname(ruta)
+        if directorio and not os.path.exists(directorio):
+            os.makedirs(directorio)
+
+        with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+            writer = csv.writer(archivo, delimiter='|')
+            writer.writerow(['paper_id', 'pagerank', 'grado_entrada', 'grado_salida', 'citation_count', 'titulo'])
+            for paper_id, pagerank, entrada, salida in self.metricas(puntuacion):
+                articulo = almacen.obtener(paper_id) if almacen is not None else None
+                writer.writerow([
+                    paper_id, f"{pagerank:.8g}", entrada, salida,
+                    articulo.get('citation_count') if articulo else '',
+                    articulo.get('titulo') if articulo else '',
+                ])
+        return os.path.abspath(ruta)
+
+    def exportar_almacen(self, almacen, puntuacion: Optional['np.ndarray'] = None) -> int:
+        """
+        Guarda las métricas en el AlmacenArticulos, junto a los artículos
+
+        Args:
+            almacen: AlmacenArticulos de destino
+            puntuacion: Resultado previo de pagerank() (se calcula si es None)
+
+        Returns:
+            Número de nodos guardados
+        """
+        return almacen.guardar_metricas(self.metricas(puntuacion))
@@ -88,8 +88,8 @@ def busqueda_general(api_client):
         return
     
     try:
-        num_resultados = int(input("Número de resultados (1-100, default=10): ") or "10")
-        num_resultados = max(1, min(100, num_resultados))
+        num_resultados = int(input("Número de resultados (1-1000, default=10): ") or "10")
+        num_resultados = max(1, min(1000, num_resultados))
     except ValueError:
         num_resultados = 10
     
@@ -137,8 +137,8 @@ def busqueda_por_autor(api_client):
         return
     
     try:
-        num_resultados = int(input("Número de resultados (1-100, default=10): ") or "10")
-        num_resultados = max(1, min(100, num_resultados))
+        num_resultados = int(input("Número de resultados (1-10000, default=10): ") or "10")
+        num_resultados = max(1, min(10000, num_resultados))
     except ValueError:
         num_resultados = 10
     
@@ -294,7 +294,7 @@ def mostrar_info_api():
     print("\n📊 Límites:")
     print("   • Sin API Key: 1 request por segundo")
     print("   • Con API Key: 100 requests por segundo")
-    print("   • Máximo 100 resultados por búsqueda")
+    print("   • Máximo 1000 resultados por búsqueda general (páginas de 100)")
     
     print("\n🔗 Enlaces útiles:")
     print("   • Documentación: https://api.semanticscholar.org/")
@@ -0,0 +1,454 @@
+"""
+Métricas de las peticiones a la API de Semantic Scholar
+Contadores e histogramas de latencia por endpoint, tiempo de espera en el rate
+limiter, reintentos, bytes transferidos y aciertos de caché, con hooks antes y
+después de cada petición y exportación en formato Prometheus o JSON
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Límites superiores (segundos) de las cubetas del histograma de latencia
+LIMITES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Formatos de exportación soportados
+FORMATOS_EXPORTACION = ('prometheus', 'json')
+
+
+def percentil(valores: Sequence[float], q: float) -> float:
+    """
+    Calcula un percentil con interpolación lineal entre muestras
+
+    Sobre las muestras ordenadas, el percentil q está en la posición
+    (n - 1) * q / 100 (el método por defecto de NumPy). Es la definición común
+    de los lotes, los benchmarks y HistogramaLatencia.
+
+    Args:
+        valores: Muestras (no necesitan estar ordenadas)
+        q: Percentil entre 0 y 100
+
+    Returns:
+        Valor del percentil (0.0 si no hay muestras)
+    """
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    posicion = (len(ordenados) - 1) * q / 100
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicion - inferior)
+
+
+class HistogramaLatencia:
+    """
+    Histograma de cubetas fijas (como los de Prometheus)
+
+    Ocupa lo mismo con diez peticiones que con diez millones, así que se puede
+    dejar activo durante toda una descarga. Los percentiles son aproximados:
+    usan la misma posición que percentil() y se interpolan dentro de la cubeta
+    en la que cae esa posición.
+    """
+
+    def __init__(self, limites: Sequence[float] = LIMITES_LATENCIA):
+        """
+        Args:
+            limites: Límites superiores de las cubetas en segundos, ordenados
+        """
+        self.limites = tuple(limites)
+        # Una cubeta por límite más la de +Inf
+        self.cubetas = [0] * (len(self.limites) + 1)
+        self.cuenta = 0
+        self.suma = 0.0
+
+    def observar(self, segundos: float):
+        """Añade una observación"""
+        indice = len(self.limites)
+        for i, limite in enumerate(self.limites):
+            if segundos <= limite:
+                indice = i
+                break
+        self.cubetas[indice] += 1
+        self.cuenta += 1
+        self.suma += segundos
+
+    def percentil(self, q: float) -> float:
+        """
+        Estima un percentil
+
+        Args:
+            q: Percentil entre 0 y 100
+
+        Returns:
+            Segundos (0 si no hay observaciones; el último límite si cae en +Inf)
+        """
+        if not self.cuenta:
+            return 0.0
+        # Posición de percentil() contada desde 1: la muestra n-ésima es la última
+        objetivo = (self.cuenta - 1) * q / 100 + 1
+        acumulado = 0
+        for i, cantidad in enumerate(self.cubetas):
+            if acumulado + cantidad >= objetivo and cantidad:
+                if i == len(self.limites):
+                    return self.limites[-1]
+                inferior = self.limites[i - 1] if i else 0.0
+                return inferior + (self.limites[i] - inferior) * (objetivo - acumulado) / cantidad
+            acumulado += cantidad
+        return self.limites[-1]
+
+    def acumuladas(self) -> List[Tuple[str, int]]:
+        """Cubetas acumuladas como pares (le, cuenta), en el formato de Prometheus"""
+        resultado = []
+        acumulado = 0
+        for limite, cantidad in zip(self.limites + (float('inf'),), self.cubetas):
+            acumulado += cantidad
+            resultado.append(('+Inf' if limite == float('inf') else f"{limite:g}", acumulado))
+        return resultado
+
+    def como_dict(self) -> Dict:
+        return {
+            'cuenta': self.cuenta,
+            'suma_segundos': self.suma,
+            'media_segundos': self.suma / self.cuenta if self.cuenta else 0.0,
+            'p50_segundos': self.percentil(50),
+            'p95_segundos': self.percentil(95),
+            'p99_segundos': self.percentil(99),
+            'cubetas': dict(self.acumuladas()),
+        }
+
+
+class MetricasCliente:
+    """
+    Métricas de un cliente (o de varios, si comparten la instancia)
+
+    El cliente llama a los métodos registrar_* desde su punto único de
+    peticiones; cada intento enviado por la red cuenta como una petición, así
+    que los reintentos aparecen en el total y en `reintentos`. Las respuestas
+    servidas desde caché o fixtures no pasan por la red y solo cuentan como
+    aciertos de caché.
+
+    Los hooks reciben un diccionario con la petición ('metodo', 'ruta',
+    'endpoint', 'params', 'intento', 'origen'); los de después reciben además
+    'estado', 'duracion', 'bytes_enviados', 'bytes_recibidos', 'espera_limitador'
+    y 'error'. Un hook que falla no interrumpe la petición.
+
+    Uso:
+        metricas = MetricasCliente()
+        metricas.despues_de_peticion(lambda e: e['duracion'] > 5 and print("lenta:", e['ruta']))
+        api = SemanticScholarAPI(api_key, metricas=metricas)
+        ...
+        print(metricas.exportar_prometheus())
+    """
+
+    def __init__(self, limites: Sequence[float] = LIMITES_LATENCIA):
+        """
+        Args:
+            limites: Límites de las cubetas de los histogramas de latencia
+        """
+        self.limites = tuple(limites)
+        self._hooks_antes: List[Callable[[Dict], None]] = []
+        self._hooks_despues: List[Callable[[Dict], None]] = []
+        self._lock = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Pone a cero todas las métricas (los hooks se conservan)"""
+        with self._lock:
+            self.inicio = time.time()
+            # (metodo, endpoint, estado) -> peticiones; estado 'sin_respuesta' si no hubo respuesta
+            self.peticiones: Dict[Tuple[str, str, str], int] = defaultdict(int)
+            self.latencias: Dict[str, HistogramaLatencia] = {}
+            self.bytes_enviados: Dict[str, int] = defaultdict(int)
+            self.bytes_recibidos: Dict[str, int] = defaultdict(int)
+            # (endpoint, tipo de error) -> reintentos / errores definitivos
+            self.reintentos: Dict[Tuple[str, str], int] = defaultdict(int)
+            self.errores: Dict[Tuple[str, str], int] = defaultdict(int)
+            # (endpoint, origen) -> respuestas servidas sin red ('disco', 'memoria', 'fixture')
+            self.aciertos_cache: Dict[Tuple[str, str], int] = defaultdict(int)
+            self.espera_limitador = 0.0
+            self.espera_backoff = 0.0
+
+    # --- hooks ---
+
+    def antes_de_peticion(self, hook: Callable[[Dict], None]) -> Callable[[Dict], None]:
+        """Registra un hook que se llama antes de enviar cada intento (se puede usar como decorador)"""
+        self._hooks_antes.append(hook)
+        return hook
+
+    def despues_de_peticion(self, hook: Callable[[Dict], None]) -> Callable[[Dict], None]:
+        """Registra un hook que se llama al terminar cada intento (se puede usar como decorador)"""
+        self._hooks_despues.append(hook)
+        return hook
+
+    def quitar_hook(self, hook: Callable[[Dict], None]):
+        """Elimina un hook registrado con antes_de_peticion o despues_de_peticion"""
+        for hooks in (self._hooks_antes, self._hooks_despues):
+            if hook in hooks:
+                hooks.remove(hook)
+
+    def _llamar(self, hooks: List[Callable[[Dict], None]], evento: Dict):
+        for hook in list(hooks):
+            try:
+                hook(evento)
+            except Exception as e:
+                print(f"Error en hook de métricas {getattr(hook, '__name__', hook)}: {e}")
+
+    def notificar_antes(self, evento: Dict):
+        """Llama a los hooks de antes de la petición"""
+        if self._hooks_antes:
+            self._llamar(self._hooks_antes, evento)
+
+    def notificar_despues(self, evento: Dict):
+        """Llama a los hooks de después de la petición"""
+        if self._hooks_despues:
+            self._llamar(self._hooks_despues, evento)
+
+    # --- registro ---
+
+    def registrar_peticion(self, metodo: str, endpoint: str, estado: Optional[int], duracion: float,
+                           bytes_enviados: int = 0, bytes_recibidos: int = 0):
+        """
+        Registra un intento enviado por la red
+
+        Args:
+            metodo: Método HTTP
+            endpoint: Plantilla del endpoint (ej: '/paper/{id}')
+            estado: Código HTTP, o None si no hubo respuesta (conexión o timeout)
+            duracion: Segundos desde el envío hasta leer la respuesta
+            bytes_enviados: Tamaño del cuerpo enviado
+            bytes_recibidos: Tamaño del cuerpo recibido
+        """
+        with self._lock:
+            self.peticiones[(metodo, endpoint, str(estado) if estado is not None else 'sin_respuesta')] += 1
+            histograma = self.latencias.get(endpoint)
+            if histograma is None:
+                histograma = self.latencias[endpoint] = HistogramaLatencia(self.limites)
+            histograma.observar(duracion)
+            self.bytes_enviados[endpoint] += bytes_enviados
+            self.bytes_recibidos[endpoint] += bytes_recibidos
+
+    def registrar_espera_limitador(self, segundos: float):
+        """Tiempo bloqueado en el rate limiter antes de un intento"""
+        if segundos > 0:
+            with self._lock:
+                self.espera_limitador += segundos
+
+    def registrar_reintento(self, endpoint: str, error: Exception, espera: float = 0.0):
+        """Un intento fallido que se va a repetir (y los segundos de backoff antes de hacerlo)"""
+        with self._lock:
+            self.reintentos[(endpoint, type(error).__name__)] += 1
+            self.espera_backoff += espera
+
+    def registrar_error(self, endpoint: str, error: Exception):
+        """Error definitivo devuelto al llamador (ya sin reintentos)"""
+        with self._lock:
+            self.errores[(endpoint, type(error).__name__)] += 1
+
+    def registrar_cache(self, endpoint: str, origen: str):
+        """Respuesta servida sin red: 'disco', 'memoria' o 'fixture'"""
+        with self._lock:
+            self.aciertos_cache[(endpoint, origen)] += 1
+
+    # --- exportación ---
+
+    def snapshot(self) -> Dict:
+        """
+        Foto de todas las métricas
+
+        Returns:
+            Diccionario serializable a JSON, con totales y el detalle por endpoint
+        """
+        with self._lock:
+            endpoints = sorted(
+                {e for _, e, _ in self.peticiones} | {e for e, _ in self.aciertos_cache}
+                | {e for e, _ in self.errores}
+            )
+            por_endpoint = {}
+            for endpoint in endpoints:
+                estados: Dict[str, int] = defaultdict(int)
+                for (_, e, estado), cantidad in self.peticiones.items():
+                    if e == endpoint:
+                        estados[estado] += cantidad
+                histograma = self.latencias.get(endpoint)
+                por_endpoint[endpoint] = {
+                    'peticiones': sum(estados.values()),
+                    'estados': dict(estados),
+                    'latencia': histograma.como_dict() if histograma else None,
+                    'bytes_enviados': self.bytes_enviados.get(endpoint, 0),
+                    'bytes_recibidos': self.bytes_recibidos.get(endpoint, 0),
+                    'reintentos': {t: c for (e, t), c in self.reintentos.items() if e == endpoint},
+                    'errores': {t: c for (e, t), c in self.errores.items() if e == endpoint},
+                    'aciertos_cache': {o: c for (e, o), c in self.aciertos_cache.items() if e == endpoint},
+                }
+            return {
+                'inicio': self.inicio,
+                'segundos': time.time() - self.inicio,
+                'peticiones': sum(self.peticiones.values()),
+                'reintentos': sum(self.reintentos.values()),
+                'errores': sum(self.errores.values()),
+                'aciertos_cache': sum(self.aciertos_cache.values()),
+                'bytes_enviados': sum(self.bytes_enviados.values()),
+                'bytes_recibidos': sum(self.bytes_recibidos.values()),
+                'espera_limitador_segundos': self.espera_limitador,
+                'espera_backoff_segundos': self.espera_backoff,
+                'endpoints': por_endpoint,
+            }
+
+    def exportar_json(self) -> str:
+        """Snapshot en JSON"""
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2, sort_keys=True)
+
+    def exportar_prometheus(self, prefijo: str = 'semantic_scholar') -> str:
+        """
+        Métricas en el formato de texto de Prometheus (apto para el textfile collector)
+
+        Args:
+            prefijo: Prefijo de los nombres de las métricas
+
+        Returns:
+            Texto con una línea por serie
+        """
+        lineas: List[str] = []
+
+        def familia(nombre: str, tipo: str, ayuda: str, series: List[Tuple[Dict[str, str], float]]):
+            lineas.append(f"# HELP {prefijo}_{nombre} {ayuda}")
+            lineas.append(f"# TYPE {prefijo}_{nombre} {tipo}")
+            for etiquetas, valor in series:
+                lineas.append(f"{prefijo}_{nombre}{_etiquetas(etiquetas)} {_numero(valor)}")
+
+        with self._lock:
+            familia('peticiones_total', 'counter', 'Intentos enviados por la red',
+                    [({'metodo': m, 'endpoint': e, 'estado': s}, c)
+                     for (m, e, s), c in sorted(self.peticiones.items())])
+
+            lineas.append(f"# HELP {prefijo}_latencia_segundos Duración de cada intento")
+            lineas.append(f"# TYPE {prefijo}_latencia_segundos histogram")
+            for endpoint, histograma in sorted(self.latencias.items()):
+                for le, cantidad in histograma.acumuladas():
+                    lineas.append(f"{prefijo}_latencia_segundos_bucket"
+                                  f"{_etiquetas({'endpoint': endpoint, 'le': le})} {cantidad}")
+                lineas.append(f"{prefijo}_latencia_segundos_sum{_etiquetas({'endpoint': endpoint})} "
+                              f"{_numero(histograma.suma)}")
+                lineas.append(f"{prefijo}_latencia_segundos_count{_etiquetas({'endpoint': endpoint})} "
+                              f"{histograma.cuenta}")
+
+            familia('bytes_enviados_total', 'counter', 'Bytes de los cuerpos enviados',
+                    [({'endpoint': e}, c) for e, c in sorted(self.bytes_enviados.items())])
+            familia('bytes_recibidos_total', 'counter', 'Bytes de los cuerpos recibidos',
+                    [({'endpoint': e}, c) for e, c in sorted(self.bytes_recibidos.items())])
+            familia('reintentos_total', 'counter', 'Intentos fallidos que se repitieron',
+                    [({'endpoint': e, 'error': t}, c) for (e, t), c in sorted(self.reintentos.items())])
+            familia('errores_total', 'counter', 'Errores definitivos devueltos al llamador',
+                    [({'endpoint': e, 'error': t}, c) for (e, t), c in sorted(self.errores.items())])
+            familia('cache_aciertos_total', 'counter', 'Respuestas servidas sin red',
+                    [({'endpoint': e, 'origen': o}, c) for (e, o), c in sorted(self.aciertos_cache.items())])
+            familia('espera_limitador_segundos_total', 'counter', 'Tiempo bloqueado en el rate limiter',
+                    [({}, self.espera_limitador)])
+            familia('espera_backoff_segundos_total', 'counter', 'Tiempo de espera entre reintentos',
+                    [({}, self.espera_backoff)])
+        return '\n'.join(lineas) + '\n'
+
+    def guardar(self, ruta: str, formato: Optional[str] = None) -> str:
+        """
+        Escribe las métricas en un archivo (escritura atómica, se puede leer mientras se actualiza)
+
+        Args:
+            ruta: Archivo de destino
+            formato: 'prometheus' o 'json' (default: según la extensión, .json -> json)
+
+        Returns:
+            Ruta absoluta del archivo
+        """
+        formato = formato or ('json' if ruta.endswith('.json') else 'prometheus')
+        if formato not in FORMATOS_EXPORTACION:
+            raise ValueError(f"Formato no soportado: {formato} (opciones: {', '.join(FORMATOS_EXPORTACION)})")
+        contenido = self.exportar_json() if formato == 'json' else self.exportar_prometheus()
+
+        directorio = os.path.dirname(ruta)
+        if directorio and not os.path.exists(directorio):
+            os.makedirs(directorio)
+        temporal = f"{ruta}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            archivo.write(contenido)
+        os.replace(temporal, ruta)
+        return os.path.abspath(ruta)
+
+
+class ExportadorPeriodico:
+    """
+    Guarda las métricas en disco cada cierto tiempo desde un hilo en segundo plano
+
+    Pensado para descargas largas: el archivo se puede vigilar a mano o
+    publicar con el textfile collector de node_exporter.
+
+    Uso:
+        with ExportadorPeriodico(api.metricas, "data/metricas.prom", intervalo=15):
+            crawler.ejecutar()
+    """
+
+    def __init__(self, metricas: MetricasCliente, ruta: str, intervalo: float = 30.0,
+                 formato: Optional[str] = None):
+        """
+        Args:
+            metricas: Métricas a exportar
+            ruta: Archivo de destino
+            intervalo: Segundos entre escrituras
+            formato: 'prometheus' o 'json' (default: según la extensión)
+        """
+        self.metricas = metricas
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self.formato = formato
+        self._parar = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def _bucle(self):
+        while not self._parar.wait(self.intervalo):
+            try:
+                self.metricas.guardar(self.ruta, self.formato)
+            except OSError as e:
+                print(f"Error al exportar métricas: {e}")
+
+    def iniciar(self):
+        """Arranca el hilo de exportación"""
+        if self._hilo is None:
+            self._parar.clear()
+            self._hilo = threading.Thread(target=self._bucle, name="exportador-metricas", daemon=True)
+            self._hilo.start()
+
+    def detener(self):
+        """Para el hilo y escribe una última vez"""
+        if self._hilo is not None:
+            self._parar.set()
+            self._hilo.join()
+            self._hilo = None
+        self.metricas.guardar(self.ruta, self.formato)
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.detener()
+
+
+def _etiquetas(etiquetas: Dict[str, str]) -> str:
+    """Formatea las etiquetas de una serie de Prometheus escapando las comillas"""
+    if not etiquetas:
+        return ''
+    pares = []
+    for clave, valor in etiquetas.items():
+        valor = str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pares.append(f'{clave}="{valor}"')
+    return '{' + ','.join(pares) + '}'
+
+
+def _numero(valor: float) -> str:
+    """Formatea un valor de Prometheus (enteros sin decimales)"""
+    if isinstance(valor, int) or float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
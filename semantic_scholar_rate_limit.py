@@ -0,0 +1,151 @@
+"""
+Control de rate para la API de Semantic Scholar
+Token bucket adaptativo compartible entre hilos y entre varios clientes
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Token bucket con ajuste AIMD (incremento aditivo, reducción multiplicativa)
+
+    Cada petición consume un token antes de salir; los tokens se recargan a
+    `tasa` por segundo, así el tiempo que la petición pasa en vuelo ya cuenta
+    para la siguiente. Al recibir un 429 la tasa se reduce y se respeta el
+    Retry-After; cada éxito la vuelve a subir poco a poco hasta `tasa_maxima`.
+
+    Una misma instancia puede pasarse a varios SemanticScholarAPI para que
+    compartan la cuota de una API key.
+    """
+
+    def __init__(self, tasa: float, capacidad: float = 1.0, tasa_minima: Optional[float] = None,
+                 tasa_maxima: Optional[float] = None, factor_reduccion: float = 0.5,
+                 incremento: Optional[float] = None):
+        """
+        Inicializa el limitador
+
+        Args:
+            tasa: Peticiones por segundo iniciales
+            capacidad: Máximo de tokens acumulables (tamaño de ráfaga)
+            tasa_minima: Tasa mínima tras reducciones (default: tasa / 20)
+            tasa_maxima: Tasa máxima al recuperarse (default: tasa)
+            factor_reduccion: Factor multiplicativo aplicado al recibir un 429
+            incremento: Peticiones/s que se suman tras cada éxito (default: tasa_maxima / 20)
+        """
+        if tasa <= 0:
+            raise ValueError("La tasa debe ser positiva")
+
+        self.tasa = float(tasa)
+        self.capacidad = float(capacidad)
+        self.tasa_maxima = float(tasa_maxima) if tasa_maxima else self.tasa
+        self.tasa_minima = float(tasa_minima) if tasa_minima else self.tasa / 20
+        self.factor_reduccion = factor_reduccion
+        self.incremento = incremento if incremento is not None else self.tasa_maxima / 20
+
+        # Estadísticas
+        self.concedidos = 0
+        self.tiempo_esperado = 0.0
+        self.limites_recibidos = 0
+
+        self._tokens = self.capacidad
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reservar(self) -> float:
+        """
+        Reserva un token sin bloquear
+
+        Returns:
+            Segundos que hay que esperar antes de usar el token reservado
+        """
+        with self._lock:
+            ahora = time.monotonic()
+            self._tokens = min(self.capacidad, self._tokens + (ahora - self._ultimo) * self.tasa)
+            self._ultimo = ahora
+            self._tokens -= 1
+            self.concedidos += 1
+
+            espera = -self._tokens / self.tasa if self._tokens < 0 else 0.0
+            self.tiempo_esperado += espera
+            return espera
+
+    def adquirir(self) -> float:
+        """
+        Bloquea hasta que haya un token disponible
+
+        Returns:
+            Segundos esperados
+        """
+        espera = self.reservar()
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+    async def adquirir_async(self) -> float:
+        """
+        Versión para asyncio de adquirir(): espera sin bloquear el event loop
+
+        La reserva es la misma que en la versión síncrona, así un limitador
+        puede repartirse entre clientes con hilos y clientes asíncronos.
+
+        Returns:
+            Segundos esperados
+        """
+        espera = self.reservar()
+        if espera > 0:
+            await asyncio.sleep(espera)
+        return espera
+
+    def registrar_exito(self):
+        """Sube la tasa de forma aditiva tras una respuesta aceptada"""
+        with self._lock:
+            self.tasa = min(self.tasa_maxima, self.tasa + self.incremento)
+
+    def registrar_limite(self, retry_after: Optional[float] = None):
+        """
+        Reduce la tasa de forma multiplicativa tras un HTTP 429
+
+        Args:
+            retry_after: Segundos indicados por el servidor en Retry-After (opcional)
+        """
+        with self._lock:
+            ahora = time.monotonic()
+            self.limites_recibidos += 1
+            self.tasa = max(self.tasa_minima, self.tasa * self.factor_reduccion)
+            # Descartar la ráfaga acumulada: tras un 429 se vuelve a empezar desde cero.
+            # El Retry-After se aplica desplazando el bucket (una deuda de tokens
+            # equivalente a la pausa), así las peticiones en cola salen espaciadas
+            # 1/tasa al terminar la pausa en lugar de todas a la vez
+            self._tokens = min(self._tokens, 0.0) - (retry_after or 0.0) * self.tasa
+            self._ultimo = ahora
+
+
+def parsear_retry_after(valor: Optional[str]) -> Optional[float]:
+    """
+    Interpreta la cabecera Retry-After (segundos o fecha HTTP)
+
+    Args:
+        valor: Valor crudo de la cabecera
+
+    Returns:
+        Segundos a esperar, o None si la cabecera falta o no es válida
+    """
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        fecha = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return max(0.0, (fecha - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,232 @@
+"""
+Reintentos y tolerancia a fallos para la API de Semantic Scholar
+Backoff exponencial con jitter, circuit breaker, errores tipados y resultados
+parciales que conservan lo descargado antes de un fallo
+"""
+
+import random
+import threading
+import time
+from typing import Iterable, List, Optional
+
+import requests
+
+
+class ErrorSemanticScholar(requests.exceptions.RequestException):
+    """
+    Error base de las peticiones a la API
+
+    Hereda de RequestException, así el código que ya captura los errores de
+    requests sigue funcionando.
+    """
+
+    def __init__(self, mensaje: str, ruta: str = '', intentos: int = 1, **kwargs):
+        super().__init__(mensaje, **kwargs)
+        self.ruta = ruta
+        self.intentos = intentos
+
+
+class ErrorHTTP(ErrorSemanticScholar, requests.exceptions.HTTPError):
+    """La API respondió con un código de error (disponible en `codigo` y `response`)"""
+
+    def __init__(self, mensaje: str, codigo: int, **kwargs):
+        super().__init__(mensaje, **kwargs)
+        self.codigo = codigo
+
+
+class ErrorNoEncontrado(ErrorHTTP):
+    """404: el paper, autor o título no existe"""
+
+
+class ErrorLimiteTasa(ErrorHTTP):
+    """429: se superó el rate limit y se agotaron los reintentos"""
+
+
+class ErrorServidor(ErrorHTTP):
+    """5xx: fallo del servidor"""
+
+
+class ErrorConexion(ErrorSemanticScholar):
+    """No se obtuvo una respuesta válida: conexión rechazada o cortada, timeout o cuerpo que no es JSON"""
+
+
+class CircuitoAbierto(ErrorSemanticScholar):
+    """El circuit breaker está abierto: la petición ni siquiera se envió"""
+
+
+# Errores que pueden desaparecer repitiendo la misma petición
+ERRORES_TRANSITORIOS = (ErrorLimiteTasa, ErrorServidor, ErrorConexion)
+
+# Las únicas peticiones POST del cliente son consultas por lotes, que no modifican
+# nada y por tanto se pueden repetir sin riesgo
+RUTAS_POST_IDEMPOTENTES = {'/paper/batch', '/author/batch'}
+
+
+def error_http(codigo: int, ruta: str, detalle: str = '', response=None) -> ErrorHTTP:
+    """
+    Crea el error tipado que corresponde a un código HTTP
+
+    Args:
+        codigo: Código de estado de la respuesta
+        ruta: Ruta del endpoint
+        detalle: Texto adicional (ej: cuerpo de la respuesta)
+        response: Respuesta de requests (opcional, se guarda en el error)
+
+    Returns:
+        ErrorNoEncontrado, ErrorLimiteTasa, ErrorServidor o ErrorHTTP
+    """
+    if codigo == 404:
+        clase = ErrorNoEncontrado
+    elif codigo == 429:
+        clase = ErrorLimiteTasa
+    elif codigo >= 500:
+        clase = ErrorServidor
+    else:
+        clase = ErrorHTTP
+    mensaje = f"HTTP {codigo} en {ruta}" + (f": {detalle[:200]}" if detalle else '')
+    return clase(mensaje, codigo, ruta=ruta, response=response)
+
+
+class PoliticaReintentos:
+    """
+    Decide qué errores se reintentan y cuánto se espera entre intentos
+
+    Solo se reintentan errores transitorios (429, 5xx, conexión y timeouts) de
+    peticiones idempotentes. La espera sigue un backoff exponencial con "full
+    jitter": un valor aleatorio entre 0 y base * 2^intento (con tope), que evita
+    que muchos hilos reintenten a la vez tras un fallo común.
+    """
+
+    def __init__(self, max_reintentos: int = 3, espera_base: float = 0.5, espera_maxima: float = 30.0):
+        """
+        Inicializa la política
+
+        Args:
+            max_reintentos: Reintentos por petición (0 = ninguno)
+            espera_base: Espera máxima del primer reintento en segundos
+            espera_maxima: Tope de la espera entre intentos
+        """
+        self.max_reintentos = max_reintentos
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+
+    @staticmethod
+    def es_idempotente(metodo: str, ruta: str) -> bool:
+        """Indica si repetir la petición no tiene efectos secundarios"""
+        return metodo in ('GET', 'HEAD') or (metodo == 'POST' and ruta in RUTAS_POST_IDEMPOTENTES)
+
+    def debe_reintentar(self, error: Exception, intento: int, metodo: str = 'GET', ruta: str = '') -> bool:
+        """
+        Args:
+            error: Error del intento fallido
+            intento: Número del intento fallido (0 = la primera petición)
+            metodo: Método HTTP
+            ruta: Ruta del endpoint
+
+        Returns:
+            True si se debe repetir la petición
+        """
+        return (intento < self.max_reintentos and isinstance(error, ERRORES_TRANSITORIOS)
+                and self.es_idempotente(metodo, ruta))
+
+    def espera(self, intento: int) -> float:
+        """Segundos a esperar antes del reintento número intento + 1"""
+        return random.uniform(0, min(self.espera_maxima, self.espera_base * 2 ** intento))
+
+
+class CircuitBreaker:
+    """
+    Corta las peticiones cuando la API está caída
+
+    Tras `umbral_fallos` fallos seguidos (5xx o sin respuesta) el circuito se
+    abre y las peticiones fallan al instante con CircuitoAbierto, sin consumir
+    rate limit ni esperar timeouts. Pasado `tiempo_apertura` se deja pasar una
+    única petición de prueba (estado semiabierto): si funciona el circuito se
+    cierra y si falla vuelve a abrirse.
+
+    Una misma instancia puede compartirse entre varios clientes.
+    """
+
+    def __init__(self, umbral_fallos: int = 5, tiempo_apertura: float = 30.0):
+        """
+        Inicializa el circuito (cerrado)
+
+        Args:
+            umbral_fallos: Fallos consecutivos que abren el circuito
+            tiempo_apertura: Segundos que permanece abierto antes de probar de nuevo
+        """
+        self.umbral_fallos = umbral_fallos
+        self.tiempo_apertura = tiempo_apertura
+
+        self.fallos_consecutivos = 0
+        self.aperturas = 0
+        self.rechazadas = 0
+
+        self._abierto_desde: Optional[float] = None
+        self._sonda_en_curso = False
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self) -> str:
+        """'cerrado', 'abierto' o 'semiabierto'"""
+        with self._lock:
+            if self._abierto_desde is None:
+                return 'cerrado'
+            if time.monotonic() - self._abierto_desde < self.tiempo_apertura:
+                return 'abierto'
+            return 'semiabierto'
+
+    def antes(self, ruta: str = ''):
+        """
+        Comprueba si se puede enviar una petición
+
+        Raises:
+            CircuitoAbierto: Si el circuito está abierto o ya hay una petición de prueba en curso
+        """
+        with self._lock:
+            if self._abierto_desde is None:
+                return
+            restante = self.tiempo_apertura - (time.monotonic() - self._abierto_desde)
+            if restante <= 0 and not self._sonda_en_curso:
+                self._sonda_en_curso = True
+                return
+            self.rechazadas += 1
+        raise CircuitoAbierto(
+            f"Circuito abierto tras {self.fallos_consecutivos} fallos seguidos; "
+            f"siguiente prueba en {max(0.0, restante):.1f} s", ruta=ruta
+        )
+
+    def registrar_exito(self):
+        """El servidor respondió (aunque sea con un error del cliente): cierra el circuito"""
+        with self._lock:
+            self.fallos_consecutivos = 0
+            self._abierto_desde = None
+            self._sonda_en_curso = False
+
+    def registrar_fallo(self):
+        """Fallo del servidor o de conexión: puede abrir (o reabrir) el circuito"""
+        with self._lock:
+            self.fallos_consecutivos += 1
+            if self._sonda_en_curso or (self._abierto_desde is None
+                                        and self.fallos_consecutivos >= self.umbral_fallos):
+                self._abierto_desde = time.monotonic()
+                self._sonda_en_curso = False
+                self.aperturas += 1
+
+
+class ResultadoParcial(list):
+    """
+    Lista de resultados que recuerda los errores ocurridos al obtenerla
+
+    Se comporta como una lista normal; si `completo` es False, contiene lo que
+    se pudo descargar antes (o a pesar) de los errores de `errores`. Así se
+    distingue "no hay resultados" de "falló la petición".
+    """
+
+    def __init__(self, elementos: Iterable = (), errores: Iterable[Exception] = ()):
+        super().__init__(elementos)
+        self.errores: List[Exception] = list(errores)
+
+    @property
+    def completo(self) -> bool:
+        return not self.errores
@@ -0,0 +1,202 @@
+"""
+Búsqueda por relevancia repartida en tramos de años
+Divide una consulta en rangos de años que se piden en paralelo, subdivide los que
+superan la ventana de 1000 resultados y fusiona todo sin duplicados
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from semantic_scholar_api import (MAX_RESULTADOS_RELEVANCIA, FiltrosBusqueda, SemanticScholarAPI,
+                                  resolver_campos)
+
+
+def _clave_orden(orden: str):
+    """
+    Convierte 'columna[:asc|:desc]' en (función clave, descendente)
+
+    Los artículos sin valor en la columna quedan siempre al final.
+    """
+    columna, _, direccion = orden.partition(':')
+    if direccion not in ('', 'asc', 'desc'):
+        raise ValueError(f"Dirección de orden no soportada: {direccion} (opciones: asc, desc)")
+    descendente = direccion != 'asc'
+
+    def clave(articulo) -> Tuple[bool, object]:
+        valor = articulo.get(columna)
+        vacio = valor is None or valor == ''
+        # Con reverse=True los vacíos (False) quedan detrás; en ascendente se invierte la marca
+        return (not vacio if descendente else vacio), (0 if vacio else valor)
+
+    return clave, descendente
+
+
+class BusquedaPorAños:
+    """
+    Recorre /paper/search tramo a tramo de años para superar el límite de 1000 resultados
+
+    Cada tramo se sondea con su primera página, que trae el `total` de la
+    consulta en ese rango. Si el total supera la ventana de la búsqueda por
+    relevancia, el tramo se parte por la mitad y se vuelve a sondear; si no,
+    sus páginas restantes se piden en paralelo. Un tramo de un solo año que
+    sigue saturado se recorre hasta el límite y queda anotado en
+    `tramos_truncados` (para esos casos conviene BusquedaMasiva).
+    """
+
+    def __init__(self, api: SemanticScholarAPI, query: str, año_desde: int = 1900,
+                 año_hasta: Optional[int] = None, campos=None, años_por_tramo: int = 10,
+                 max_workers: int = 4, tamaño_pagina: int = 100,
+                 filtros: Optional[FiltrosBusqueda] = None):
+        """
+        Inicializa la búsqueda
+
+        Args:
+            api: Cliente de Semantic Scholar
+            query: Término de búsqueda
+            año_desde: Primer año a cubrir
+            año_hasta: Último año a cubrir (default: año actual)
+            campos: Campos a pedir: lista de campos de la API, columnas de salida o
+                preset ('ids-only', 'metadata', 'full'); ver resolver_campos()
+            años_por_tramo: Años de cada tramo inicial, antes de subdividir
+            max_workers: Peticiones simultáneas
+            tamaño_pagina: Artículos por petición (máximo 100)
+            filtros: Filtros aplicados por el servidor en cada tramo (sus años se ignoran)
+        """
+        self.api = api
+        self.query = query
+        self.año_desde = año_desde
+        self.año_hasta = año_hasta if año_hasta is not None else datetime.now().year
+        if self.año_desde > self.año_hasta:
+            raise ValueError(f"Rango de años vacío: {self.año_desde}-{self.año_hasta}")
+        self.campos = resolver_campos(campos)
+        self.años_por_tramo = max(1, años_por_tramo)
+        self.max_workers = max_workers
+        self.tamaño_pagina = max(1, min(tamaño_pagina, 100))
+        self.filtros = filtros or FiltrosBusqueda()
+
+        # Estadísticas de la última ejecución
+        self.tramos: List[Tuple[int, int, int]] = []
+        self.tramos_truncados: List[Tuple[int, int]] = []
+        self.peticiones = 0
+        self.duplicados = 0
+
+    def _pedir_pagina(self, tramo: Tuple[int, int], offset: int) -> Tuple[List[Dict], Dict]:
+        """Pide una página de la consulta restringida a un tramo de años (artículos, respuesta cruda)"""
+        params = {
+            'query': self.query,
+            'offset': offset,
+            'limit': min(self.tamaño_pagina, MAX_RESULTADOS_RELEVANCIA - offset),
+            'fields': ','.join(self.campos),
+            **self.filtros.con_años(*tramo).parametros("/paper/search"),
+        }
+        return self.api.pedir_pagina("/paper/search", params, self.campos)
+
+    def _tramos_iniciales(self) -> List[Tuple[int, int]]:
+        return [
+            (desde, min(desde + self.años_por_tramo - 1, self.año_hasta))
+            for desde in range(self.año_desde, self.año_hasta + 1, self.años_por_tramo)
+        ]
+
+    def _paginas(self) -> Iterator[List[Dict]]:
+        """
+        Pide los tramos y sus páginas en paralelo
+
+        Yields:
+            Listas de artículos normalizados, en el orden en que llegan las páginas
+        """
+        self.tramos, self.tramos_truncados = [], []
+        self.peticiones = 0
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        pendientes = {}
+
+        def sondear(tramo: Tuple[int, int]):
+            pendientes[executor.submit(self._pedir_pagina, tramo, 0)] = (tramo, 0)
+
+        try:
+            for tramo in self._tramos_iniciales():
+                sondear(tramo)
+
+            while pendientes:
+                listos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futura in listos:
+                    tramo, offset = pendientes.pop(futura)
+                    articulos, data = futura.result()
+                    self.peticiones += 1
+
+                    if offset == 0:
+                        total = data.get('total') or 0
+                        desde, hasta = tramo
+                        if total > MAX_RESULTADOS_RELEVANCIA and desde < hasta:
+                            medio = (desde + hasta) // 2
+                            sondear((desde, medio))
+                            sondear((medio + 1, hasta))
+                            continue
+                        self.tramos.append((desde, hasta, total))
+                        if total > MAX_RESULTADOS_RELEVANCIA:
+                            self.tramos_truncados.append((desde, total))
+                            print(f"⚠️ El año {desde} tiene {total} resultados; solo se obtienen "
+                                  f"{MAX_RESULTADOS_RELEVANCIA} (usa BusquedaMasiva para el resto)")
+                        limite = min(total, MAX_RESULTADOS_RELEVANCIA)
+                        for siguiente in range(self.tamaño_pagina, limite, self.tamaño_pagina):
+                            pendientes[executor.submit(self._pedir_pagina, tramo, siguiente)] = (tramo, siguiente)
+
+                    yield articulos
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iterar(self, orden: Optional[str] = None, max_resultados: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Recorre los resultados de todos los tramos sin paper_id repetidos
+
+        Args:
+            orden: Columna del artículo normalizado por la que ordenar, con ':asc' o
+                ':desc' (default desc), ej: 'citation_count', 'year:asc'. Sin orden los
+                artículos se emiten según llegan, sin esperar al resto de tramos;
+                con orden se reúnen todos antes de emitir el primero.
+            max_resultados: Máximo de artículos a devolver (None = todos)
+
+        Yields:
+            Artículos normalizados
+        """
+        if max_resultados is not None and max_resultados <= 0:
+            return
+        clave = _clave_orden(orden) if orden else None
+        self.duplicados = 0
+        vistos = set()
+        reunidos = []
+        emitidos = 0
+
+        for pagina in self._paginas():
+            for articulo in pagina:
+                paper_id = articulo.get('paper_id')
+                if paper_id in vistos:
+                    self.duplicados += 1
+                    continue
+                vistos.add(paper_id)
+                if clave is not None:
+                    reunidos.append(articulo)
+                    continue
+                yield articulo
+                emitidos += 1
+                if max_resultados is not None and emitidos >= max_resultados:
+                    return
+
+        if clave is not None:
+            funcion, descendente = clave
+            reunidos.sort(key=funcion, reverse=descendente)
+            yield from reunidos[:max_resultados]
+
+    def ejecutar(self, orden: Optional[str] = None, max_resultados: Optional[int] = None) -> List[Dict]:
+        """
+        Ejecuta la búsqueda completa y devuelve la lista fusionada
+
+        Args:
+            orden: Columna por la que ordenar (ver iterar())
+            max_resultados: Máximo de artículos a devolver (None = todos)
+
+        Returns:
+            Lista de artículos normalizados sin duplicados
+        """
+        return list(self.iterar(orden, max_resultados))
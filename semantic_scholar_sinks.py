@@ -0,0 +1,209 @@
+"""
+Destinos (sinks) para escribir artículos a medida que llegan
+Permiten volcar resultados a CSV, JSONL o SQLite sin tenerlos todos en memoria
+"""
+
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, TextIO
+
+from semantic_scholar_api import COLUMNAS_CSV, EscritorCSV, fila_csv
+
+
+COLUMNAS_ARTICULO = [
+    'paper_id', 'titulo', 'enlace', 'autores_info', 'resumen', 'citado_por',
+    'versiones', 'year', 'venue', 'campos_estudio', 'citation_count',
+    'publication_date', 'publication_types'
+]
+
+
+def _crear_directorio(ruta: str):
+    """Crea el directorio padre de la ruta si no existe"""
+    directorio = os.path.dirname(ruta)
+    if directorio and not os.path.exists(directorio):
+        os.makedirs(directorio)
+
+
+class _SinkBase:
+    """
+    Interfaz común de los sinks
+
+    posicion()/restaurar() permiten a un proceso reanudable volver al último
+    punto confirmado y descartar lo escrito después (por ejemplo tras un corte).
+    Los sinks sin posición (SQLite, flujos) devuelven None y restaurar(None) no
+    descarta nada.
+    """
+
+    def escribir(self, articulo: Dict):
+        raise NotImplementedError
+
+    def escribir_lote(self, articulos: Iterable[Dict]):
+        for articulo in articulos:
+            self.escribir(articulo)
+
+    def flush(self):
+        pass
+
+    def posicion(self) -> Optional[int]:
+        return None
+
+    def restaurar(self, posicion: Optional[int]):
+        pass
+
+    def cerrar(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cerrar()
+
+
+class _SinkArchivo(_SinkBase):
+    """Base para sinks de texto que se abren en modo append"""
+
+    def __init__(self, ruta: str):
+        _crear_directorio(ruta)
+        self.ruta = ruta
+        self._archivo = open(ruta, 'a+', newline='', encoding='utf-8')
+
+    def flush(self):
+        self._archivo.flush()
+        os.fsync(self._archivo.fileno())
+
+    def posicion(self) -> int:
+        self._archivo.flush()
+        return self._archivo.tell()
+
+    def restaurar(self, posicion: Optional[int]):
+        if posicion is None:
+            return
+        self._archivo.flush()
+        self._archivo.seek(posicion)
+        self._archivo.truncate()
+
+    def cerrar(self):
+        if not self._archivo.closed:
+            self._archivo.close()
+
+
+class SinkJSONL(_SinkArchivo):
+    """Escribe un artículo por línea en formato JSON"""
+
+    def escribir(self, articulo: Dict):
+        self._archivo.write(json.dumps(dict(articulo), ensure_ascii=False))
+        self._archivo.write('\n')
+
+
+class SinkCSV(EscritorCSV, _SinkBase):
+    """Escribe artículos en el mismo formato que guardar_articulos_csv (separado por |)"""
+
+    def __init__(self, ruta: str, columnas_extra: Optional[List[str]] = None):
+        super().__init__(ruta, modo='a', fsync=True, columnas_extra=columnas_extra)
+
+    def escribir_lote(self, articulos: Iterable[Dict]):
+        self.escribir_todos(articulos)
+
+    def posicion(self) -> int:
+        self._archivo.flush()
+        return self._archivo.tell()
+
+    def restaurar(self, posicion: Optional[int]):
+        if posicion is None:
+            return
+        self._archivo.flush()
+        self._archivo.seek(posicion)
+        self._archivo.truncate()
+        self._numero = self._filas_existentes()
+        if self._archivo.tell() == 0:
+            self._writer.writerow(self.columnas)
+
+
+class SinkSQLite(_SinkBase):
+    """
+    Guarda artículos en SQLite con el esquema de AlmacenArticulos
+
+    Es una envoltura fina sobre semantic_scholar_store.AlmacenArticulos, así el
+    archivo resultante tiene los tipos y el índice FTS5 del almacén y puede
+    abrirse después para buscar sin conexión. Las inserciones son upserts por
+    paper_id: reescribir una página tras reanudar no duplica filas.
+    """
+
+    def __init__(self, ruta: str):
+        # Import diferido: semantic_scholar_store importa este módulo
+        from semantic_scholar_store import AlmacenArticulos
+
+        self.ruta = ruta
+        self.almacen = AlmacenArticulos(ruta)
+
+    def escribir(self, articulo: Dict):
+        self.almacen.ingerir([articulo])
+
+    def escribir_lote(self, articulos: Iterable[Dict]):
+        self.almacen.ingerir(articulos)
+
+    def cerrar(self):
+        self.almacen.cerrar()
+
+
+class SinkFlujo(_SinkBase):
+    """
+    Escribe artículos en un flujo de texto ya abierto (ej: sys.stdout)
+
+    Para encadenar con otros comandos en un pipeline; el flujo no se cierra al
+    terminar. El CSV tiene las mismas columnas y separador que SinkCSV.
+    """
+
+    def __init__(self, flujo: TextIO, formato: str = 'jsonl'):
+        """
+        Args:
+            flujo: Flujo de salida
+            formato: 'jsonl' o 'csv'
+        """
+        if formato not in ('jsonl', 'csv'):
+            raise ValueError(f"Formato no soportado en un flujo: {formato} (opciones: jsonl, csv)")
+        self.flujo = flujo
+        self.formato = formato
+        self._numero = 0
+        self._writer = None
+        if formato == 'csv':
+            self._writer = csv.writer(flujo, delimiter='|', lineterminator='\n')
+            self._writer.writerow(COLUMNAS_CSV)
+
+    def escribir(self, articulo: Dict):
+        if self._writer is None:
+            self.flujo.write(json.dumps(dict(articulo), ensure_ascii=False))
+            self.flujo.write('\n')
+            return
+        self._numero += 1
+        fila = fila_csv(articulo, self._numero, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        self._writer.writerow([fila[columna] for columna in COLUMNAS_CSV])
+
+    def flush(self):
+        self.flujo.flush()
+
+    def cerrar(self):
+        self.flush()
+
+
+def crear_sink(ruta: str) -> _SinkBase:
+    """
+    Crea el sink adecuado según la extensión del archivo
+
+    Args:
+        ruta: Ruta de salida (.csv, .jsonl, .sqlite o .db)
+
+    Returns:
+        Sink listo para escribir
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == '.csv':
+        return SinkCSV(ruta)
+    if extension in ('.jsonl', '.ndjson'):
+        return SinkJSONL(ruta)
+    if extension in ('.sqlite', '.sqlite3', '.db'):
+        return SinkSQLite(ruta)
+    raise ValueError(f"Formato de salida no soportado: {extension or ruta}")
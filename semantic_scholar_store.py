@@ -0,0 +1,386 @@
+"""
+Almacén local de artículos de Semantic Scholar
+Base SQLite indexada por paper_id con índice de texto completo FTS5 para buscar
+sin conexión entre todo lo descargado
+"""
+
+import csv
+import os
+import re
+import sqlite3
+import threading
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+
+from semantic_scholar_sinks import COLUMNAS_ARTICULO
+
+
+# Columnas indexadas en FTS5
+COLUMNAS_TEXTO = ['titulo', 'resumen', 'venue', 'campos_estudio']
+
+_COLUMNAS_ENTERAS = ('year', 'citation_count')
+
+_ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS articulos (
+    paper_id TEXT PRIMARY KEY,
+    {', '.join(f"{col} INTEGER" if col in _COLUMNAS_ENTERAS else f"{col} TEXT" for col in COLUMNAS_ARTICULO[1:])}
+);
+CREATE INDEX IF NOT EXISTS idx_articulos_year ON articulos (year);
+CREATE INDEX IF NOT EXISTS idx_articulos_citas ON articulos (citation_count);
+CREATE TABLE IF NOT EXISTS metricas_grafo (
+    paper_id TEXT PRIMARY KEY,
+    pagerank REAL,
+    grado_entrada INTEGER,
+    grado_salida INTEGER
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS articulos_fts USING fts5 (
+    {', '.join(COLUMNAS_TEXTO)}, content='articulos', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS articulos_ai AFTER INSERT ON articulos BEGIN
+    INSERT INTO articulos_fts (rowid, {', '.join(COLUMNAS_TEXTO)})
+    VALUES (new.rowid, {', '.join(f'new.{col}' for col in COLUMNAS_TEXTO)});
+END;
+CREATE TRIGGER IF NOT EXISTS articulos_ad AFTER DELETE ON articulos BEGIN
+    INSERT INTO articulos_fts (articulos_fts, rowid, {', '.join(COLUMNAS_TEXTO)})
+    VALUES ('delete', old.rowid, {', '.join(f'old.{col}' for col in COLUMNAS_TEXTO)});
+END;
+CREATE TRIGGER IF NOT EXISTS articulos_au AFTER UPDATE ON articulos BEGIN
+    INSERT INTO articulos_fts (articulos_fts, rowid, {', '.join(COLUMNAS_TEXTO)})
+    VALUES ('delete', old.rowid, {', '.join(f'old.{col}' for col in COLUMNAS_TEXTO)});
+    INSERT INTO articulos_fts (rowid, {', '.join(COLUMNAS_TEXTO)})
+    VALUES (new.rowid, {', '.join(f'new.{col}' for col in COLUMNAS_TEXTO)});
+END;
+"""
+
+
+def _entero(valor) -> Optional[int]:
+    """Convierte year/citation_count a int (None si está vacío o no es numérico)"""
+    if valor is None or valor == '':
+        return None
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def consulta_fts(texto: str) -> str:
+    """
+    Convierte texto libre en una consulta FTS5 segura
+
+    Cada palabra se entrecomilla, así caracteres como '-', ':' o '+' no se
+    interpretan como operadores y todas las palabras deben aparecer (AND).
+
+    Args:
+        texto: Texto introducido por el usuario
+
+    Returns:
+        Expresión para MATCH
+    """
+    palabras = re.findall(r'\w+', texto)
+    return ' '.join(f'"{palabra}"' for palabra in palabras)
+
+
+class AlmacenArticulos:
+    """
+    Corpus local de artículos normalizados (los diccionarios de _procesar_articulo)
+
+    Las inserciones son upserts por paper_id y se agrupan en transacciones de
+    `tamaño_lote` filas. Implementa escribir/escribir_lote/flush/cerrar, así que
+    puede usarse como sink de BusquedaMasiva.ejecutar().
+    """
+
+    def __init__(self, ruta: str = os.path.join("data", "corpus_semantic_scholar.sqlite"),
+                 tamaño_lote: int = 10000):
+        """
+        Abre (o crea) el almacén
+
+        Args:
+            ruta: Archivo SQLite
+            tamaño_lote: Filas por transacción al ingerir
+        """
+        directorio = os.path.dirname(ruta)
+        if directorio and not os.path.exists(directorio):
+            os.makedirs(directorio)
+
+        self.ruta = ruta
+        self.tamaño_lote = tamaño_lote
+        # Cambios hechos al abrir un archivo con otro esquema (ver _crear_esquema)
+        self.migraciones: List[str] = []
+
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.row_factory = sqlite3.Row
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.execute("PRAGMA temp_store=MEMORY")
+        self._crear_esquema()
+
+        marcadores = ', '.join('?' for _ in COLUMNAS_ARTICULO)
+        actualizacion = ', '.join(f"{col} = excluded.{col}" for col in COLUMNAS_ARTICULO[1:])
+        self._sql_upsert = (
+            f"INSERT INTO articulos ({', '.join(COLUMNAS_ARTICULO)}) VALUES ({marcadores}) "
+            f"ON CONFLICT(paper_id) DO UPDATE SET {actualizacion}"
+        )
+
+    def _crear_esquema(self):
+        """
+        Crea las tablas y adapta una tabla `articulos` existente con otro esquema
+
+        Un archivo escrito por otra herramienta (o por versiones antiguas de
+        SinkSQLite) puede tener year/citation_count como TEXT y ningún índice
+        FTS5: las columnas se convierten a INTEGER reconstruyendo la tabla y el
+        índice de texto completo se rellena con lo que ya había. Lo hecho queda
+        descrito en self.migraciones.
+        """
+        existentes = {
+            fila[0] for fila in
+            self._conexion.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        tipos = {fila[1]: fila[2].upper() for fila in self._conexion.execute("PRAGMA table_info(articulos)")}
+        convertir = bool(tipos) and any(tipos.get(col) != 'INTEGER' for col in _COLUMNAS_ENTERAS)
+        if convertir:
+            # Los triggers e índices de la tabla vieja la seguirían al renombrarla (y los
+            # triggers seguirían escribiendo en articulos_fts): se eliminan antes
+            asociados = self._conexion.execute(
+                "SELECT type, name FROM sqlite_master "
+                "WHERE tbl_name = 'articulos' AND type IN ('trigger', 'index') AND sql IS NOT NULL"
+            ).fetchall()
+            for tipo, nombre in asociados:
+                self._conexion.execute(f'DROP {tipo.upper()} IF EXISTS "{nombre}"')
+            self._conexion.execute("DROP TABLE IF EXISTS articulos_antigua")
+            self._conexion.execute("ALTER TABLE articulos RENAME TO articulos_antigua")
+
+        self._conexion.executescript(_ESQUEMA)
+
+        if convertir:
+            filas = (
+                self._fila(dict(fila)) for fila in
+                self._conexion.execute("SELECT * FROM articulos_antigua WHERE paper_id IS NOT NULL")
+            )
+            marcadores = ', '.join('?' for _ in COLUMNAS_ARTICULO)
+            self._conexion.executemany(
+                f"INSERT OR REPLACE INTO articulos ({', '.join(COLUMNAS_ARTICULO)}) VALUES ({marcadores})",
+                filas
+            )
+            self._conexion.execute("DROP TABLE articulos_antigua")
+            self.migraciones.append("year/citation_count convertidos a INTEGER")
+        if convertir or 'articulos_fts' not in existentes:
+            # Índice recién creado sobre filas que ya existían (los triggers no las vieron)
+            # o escrito por los triggers de la tabla vieja: se reconstruye desde articulos
+            self._conexion.execute("INSERT INTO articulos_fts (articulos_fts) VALUES ('rebuild')")
+            if tipos:
+                self.migraciones.append("índice FTS5 reconstruido")
+        self._conexion.commit()
+
+    @staticmethod
+    def _fila(articulo: Dict) -> list:
+        """Ordena los valores de un artículo según COLUMNAS_ARTICULO"""
+        return [
+            _entero(articulo.get(col)) if col in _COLUMNAS_ENTERAS else articulo.get(col)
+            for col in COLUMNAS_ARTICULO
+        ]
+
+    def ingerir(self, articulos: Iterable[Dict]) -> int:
+        """
+        Inserta o actualiza artículos en transacciones de tamaño_lote filas
+
+        Los artículos sin paper_id se ignoran.
+
+        Args:
+            articulos: Cualquier iterable de artículos normalizados
+
+        Returns:
+            Número de artículos escritos
+        """
+        filas = (self._fila(articulo) for articulo in articulos if articulo and articulo.get('paper_id'))
+        total = 0
+        while True:
+            lote = list(islice(filas, self.tamaño_lote))
+            if not lote:
+                return total
+            with self._lock:
+                with self._conexion:
+                    self._conexion.executemany(self._sql_upsert, lote)
+            total += len(lote)
+
+    def importar_csv(self, ruta: str) -> int:
+        """
+        Importa un CSV generado por guardar_articulos_csv (separado por |)
+
+        Args:
+            ruta: Ruta del CSV
+
+        Returns:
+            Número de artículos importados
+        """
+        def articulos():
+            with open(ruta, newline='', encoding='utf-8') as archivo:
+                for fila in csv.DictReader(archivo, delimiter='|'):
+                    fila['versiones'] = f"Semantic Scholar ID: {fila.get('paper_id') or 'N/A'}"
+                    yield fila
+
+        return self.ingerir(articulos())
+
+    def buscar(self, texto: Optional[str] = None, año_desde: Optional[int] = None,
+               año_hasta: Optional[int] = None, min_citas: Optional[int] = None,
+               limite: int = 50, sintaxis_fts: bool = False) -> List[Dict]:
+        """
+        Busca artículos en el corpus local
+
+        Args:
+            texto: Palabras a buscar en título, resumen, venue y campos de estudio
+                (None para filtrar solo por año/citas)
+            año_desde: Año mínimo de publicación
+            año_hasta: Año máximo de publicación
+            min_citas: Número mínimo de citas
+            limite: Número máximo de resultados
+            sintaxis_fts: Pasar `texto` tal cual a FTS5 (permite OR, NEAR, prefijo*, ...)
+
+        Returns:
+            Lista de artículos; con texto, ordenados por relevancia (bm25),
+            sin texto, por número de citas
+        """
+        condiciones = []
+        params: list = []
+        if texto:
+            expresion = texto if sintaxis_fts else consulta_fts(texto)
+            if not expresion:
+                return []
+            sql = ("SELECT a.* FROM articulos_fts f JOIN articulos a ON a.rowid = f.rowid "
+                   "WHERE articulos_fts MATCH ?")
+            params.append(expresion)
+            orden = "bm25(articulos_fts)"
+        else:
+            sql = "SELECT a.* FROM articulos a WHERE 1"
+            orden = "a.citation_count DESC"
+
+        if año_desde is not None:
+            condiciones.append("a.year >= ?")
+            params.append(año_desde)
+        if año_hasta is not None:
+            condiciones.append("a.year <= ?")
+            params.append(año_hasta)
+        if min_citas is not None:
+            condiciones.append("a.citation_count >= ?")
+            params.append(min_citas)
+
+        for condicion in condiciones:
+            sql += f" AND {condicion}"
+        sql += f" ORDER BY {orden} LIMIT ?"
+        params.append(limite)
+
+        with self._lock:
+            return [dict(fila) for fila in self._conexion.execute(sql, params)]
+
+    def obtener(self, paper_id: str) -> Optional[Dict]:
+        """
+        Devuelve un artículo por su paper_id
+
+        Args:
+            paper_id: ID de Semantic Scholar
+
+        Returns:
+            Artículo o None si no está en el almacén
+        """
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT * FROM articulos WHERE paper_id = ?", (paper_id,)
+            ).fetchone()
+        return dict(fila) if fila else None
+
+    def contiene(self, paper_id: str) -> bool:
+        """Indica si el paper ya está en el almacén"""
+        with self._lock:
+            return self._conexion.execute(
+                "SELECT 1 FROM articulos WHERE paper_id = ?", (paper_id,)
+            ).fetchone() is not None
+
+    def contar(self) -> int:
+        """Número de artículos almacenados"""
+        with self._lock:
+            return self._conexion.execute("SELECT COUNT(*) FROM articulos").fetchone()[0]
+
+    def guardar_metricas(self, metricas: Iterable[tuple]) -> int:
+        """
+        Guarda métricas del grafo de citas (ver GrafoCitas.exportar_almacen)
+
+        Args:
+            metricas: Tuplas (paper_id, pagerank, grado_entrada, grado_salida)
+
+        Returns:
+            Número de filas escritas
+        """
+        metricas = iter(metricas)
+        total = 0
+        while True:
+            lote = list(islice(metricas, self.tamaño_lote))
+            if not lote:
+                return total
+            with self._lock:
+                with self._conexion:
+                    self._conexion.executemany(
+                        "INSERT OR REPLACE INTO metricas_grafo (paper_id, pagerank, grado_entrada, grado_salida) "
+                        "VALUES (?, ?, ?, ?)", lote
+                    )
+            total += len(lote)
+
+    def mas_influyentes(self, limite: int = 20, año_desde: Optional[int] = None,
+                        año_hasta: Optional[int] = None) -> List[Dict]:
+        """
+        Artículos ordenados por PageRank, con sus métricas junto a citation_count
+
+        Args:
+            limite: Número máximo de resultados
+            año_desde: Año mínimo de publicación
+            año_hasta: Año máximo de publicación
+
+        Returns:
+            Lista de artículos con las claves pagerank, grado_entrada y grado_salida añadidas
+        """
+        sql = ("SELECT a.*, m.pagerank, m.grado_entrada, m.grado_salida "
+               "FROM metricas_grafo m JOIN articulos a ON a.paper_id = m.paper_id WHERE 1")
+        params: list = []
+        if año_desde is not None:
+            sql += " AND a.year >= ?"
+            params.append(año_desde)
+        if año_hasta is not None:
+            sql += " AND a.year <= ?"
+            params.append(año_hasta)
+        sql += " ORDER BY m.pagerank DESC LIMIT ?"
+        params.append(limite)
+        with self._lock:
+            return [dict(fila) for fila in self._conexion.execute(sql, params)]
+
+    def optimizar(self):
+        """Compacta el índice FTS5 (útil tras una ingesta grande)"""
+        with self._lock:
+            self._conexion.execute("INSERT INTO articulos_fts (articulos_fts) VALUES ('optimize')")
+            self._conexion.commit()
+
+    # Interfaz de sink (ver semantic_scholar_sinks)
+
+    def escribir(self, articulo: Dict):
+        self.ingerir([articulo])
+
+    def escribir_lote(self, articulos: Iterable[Dict]):
+        self.ingerir(articulos)
+
+    def flush(self):
+        pass
+
+    def posicion(self) -> Optional[int]:
+        return None
+
+    def restaurar(self, posicion: Optional[int]):
+        pass
+
+    def cerrar(self):
+        """Cierra el archivo del almacén"""
+        with self._lock:
+            self._conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cerrar()
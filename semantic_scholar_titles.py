@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Resolución de títulos a paperId por lotes
+Convierte listas de referencias bibliográficas en IDs de Semantic Scholar
+usando el endpoint /paper/search/match, con caché local y búsqueda de respaldo
+"""
+
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, Optional
+
+import requests
+
+from semantic_scholar_api import SemanticScholarAPI
+from semantic_scholar_retry import ErrorNoEncontrado
+
+# Similitud mínima para aceptar un candidato
+UMBRAL_CONFIANZA = 0.85
+
+# Campos pedidos para cada candidato
+CAMPOS_TITULO = ['paperId', 'title', 'year']
+
+COLUMNAS_RESULTADO = ['titulo', 'paper_id', 'titulo_encontrado', 'year', 'confianza', 'metodo']
+
+
+def normalizar_titulo(titulo: str) -> str:
+    """
+    Normaliza un título para compararlo y usarlo como clave de caché
+
+    Quita acentos, puntuación y mayúsculas y colapsa espacios.
+
+    Args:
+        titulo: Título tal como aparece en la bibliografía
+
+    Returns:
+        Título normalizado
+    """
+    sin_acentos = unicodedata.normalize('NFKD', titulo).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(re.sub(r'[^\w\s]', ' ', sin_acentos.lower()).split())
+
+
+def similitud_titulos(a: str, b: str) -> float:
+    """
+    Similitud entre dos títulos (0 a 1) tras normalizarlos
+
+    Args:
+        a: Primer título
+        b: Segundo título
+
+    Returns:
+        Ratio de SequenceMatcher sobre los títulos normalizados
+    """
+    a, b = normalizar_titulo(a or ''), normalizar_titulo(b or '')
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+class ResolutorTitulos:
+    """
+    Resuelve títulos a paperId en paralelo bajo el rate limiter del cliente
+
+    Orden de consulta para cada título:
+        1. caché propia (SQLite) de resoluciones anteriores
+        2. almacén local opcional (AlmacenArticulos) por búsqueda de texto completo
+        3. /paper/search/match (mejor coincidencia de la API)
+        4. /paper/search como respaldo, quedándose con el candidato más parecido
+
+    Cada resultado lleva una confianza (similitud entre el título pedido y el
+    encontrado); por debajo de `umbral` el paper_id queda vacío.
+    """
+
+    def __init__(self, api: SemanticScholarAPI,
+                 ruta_cache: str = os.path.join("data", "titulos_semantic_scholar.sqlite"),
+                 almacen=None, umbral: float = UMBRAL_CONFIANZA, candidatos_respaldo: int = 5,
+                 ttl_sin_resultado: float = 7 * 24 * 3600):
+        """
+        Inicializa el resolutor
+
+        Args:
+            api: Cliente de Semantic Scholar
+            ruta_cache: Archivo SQLite donde se guardan las resoluciones
+            almacen: AlmacenArticulos opcional a consultar antes que la API
+            umbral: Confianza mínima para aceptar una coincidencia
+            candidatos_respaldo: Resultados a pedir en la búsqueda de respaldo
+            ttl_sin_resultado: Segundos antes de volver a intentar un título sin coincidencia
+        """
+        directorio = os.path.dirname(ruta_cache)
+        if directorio and not os.path.exists(directorio):
+            os.makedirs(directorio)
+
+        self.api = api
+        self.almacen = almacen
+        self.umbral = umbral
+        self.candidatos_respaldo = candidatos_respaldo
+        self.ttl_sin_resultado = ttl_sin_resultado
+
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta_cache, check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS titulos (titulo_normalizado TEXT PRIMARY KEY, paper_id TEXT, "
+            "titulo_encontrado TEXT, year INTEGER, confianza REAL, metodo TEXT, expira REAL)"
+        )
+        self._conexion.commit()
+
+    def _desde_cache(self, clave: str) -> Optional[Dict]:
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT paper_id, titulo_encontrado, year, confianza, metodo, expira "
+                "FROM titulos WHERE titulo_normalizado = ?", (clave,)
+            ).fetchone()
+        if fila is None or (fila[5] is not None and fila[5] < time.time()):
+            return None
+        return {'paper_id': fila[0], 'titulo_encontrado': fila[1], 'year': fila[2],
+                'confianza': fila[3], 'metodo': 'cache'}
+
+    def _guardar_cache(self, clave: str, resultado: Dict):
+        expira = None if resultado['paper_id'] else time.time() + self.ttl_sin_resultado
+        with self._lock:
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO titulos VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (clave, resultado['paper_id'], resultado['titulo_encontrado'], resultado['year'],
+                 resultado['confianza'], resultado['metodo'], expira)
+            )
+            self._conexion.commit()
+
+    def _mejor(self, titulo: str, candidatos: Iterable[Dict], metodo: str) -> Optional[Dict]:
+        """Candidato más parecido al título (con claves de la API o del almacén)"""
+        mejor = None
+        for candidato in candidatos:
+            encontrado = candidato.get('title', candidato.get('titulo'))
+            confianza = similitud_titulos(titulo, encontrado)
+            if mejor is None or confianza > mejor['confianza']:
+                mejor = {
+                    'paper_id': candidato.get('paperId', candidato.get('paper_id')),
+                    'titulo_encontrado': encontrado,
+                    'year': candidato.get('year') or None,
+                    'confianza': round(confianza, 4),
+                    'metodo': metodo,
+                }
+        return mejor
+
+    def resolver(self, titulo: str) -> Dict:
+        """
+        Resuelve un título
+
+        Args:
+            titulo: Título a buscar
+
+        Returns:
+            Diccionario con paper_id (None si no se alcanzó el umbral), titulo_encontrado,
+            year, confianza y metodo ('cache', 'almacen', 'match', 'busqueda', 'sin_resultado'
+            o 'error')
+        """
+        clave = normalizar_titulo(titulo)
+        vacio = {'paper_id': None, 'titulo_encontrado': None, 'year': None, 'confianza': 0.0,
+                 'metodo': 'sin_resultado'}
+        if not clave:
+            return vacio
+
+        resultado = self._desde_cache(clave)
+        if resultado is not None:
+            return resultado
+
+        if self.almacen is not None:
+            resultado = self._mejor(titulo, self.almacen.buscar(titulo, limite=5), 'almacen')
+            if resultado and resultado['confianza'] >= self.umbral:
+                self._guardar_cache(clave, resultado)
+                return resultado
+
+        mejor = None
+        try:
+            try:
+                data = self.api.consultar("/paper/search/match", {'query': titulo, 'fields': ','.join(CAMPOS_TITULO)})
+                mejor = self._mejor(titulo, data.get('data') or [], 'match')
+            except ErrorNoEncontrado:
+                # 404 = la API no encontró una coincidencia clara (también si viene de fixtures)
+                pass
+
+            if mejor is None or mejor['confianza'] < self.umbral:
+                data = self.api.consultar("/paper/search", {
+                    'query': titulo, 'limit': self.candidatos_respaldo, 'fields': ','.join(CAMPOS_TITULO)
+                })
+                respaldo = self._mejor(titulo, data.get('data') or [], 'busqueda')
+                if respaldo and (mejor is None or respaldo['confianza'] > mejor['confianza']):
+                    mejor = respaldo
+        except requests.exceptions.RequestException as e:
+            return dict(vacio, metodo='error', error=str(e))
+
+        if mejor is None:
+            resultado = vacio
+        elif mejor['confianza'] < self.umbral:
+            resultado = dict(mejor, paper_id=None, metodo='sin_resultado')
+        else:
+            resultado = mejor
+        self._guardar_cache(clave, resultado)
+        return resultado
+
+    def resolver_lote(self, titulos: Iterable[str], max_workers: int = 8) -> Dict[str, Dict]:
+        """
+        Resuelve muchos títulos en paralelo
+
+        Los títulos que solo difieren en mayúsculas, acentos o puntuación se
+        resuelven una sola vez.
+
+        Args:
+            titulos: Títulos a resolver
+            max_workers: Títulos resueltos simultáneamente
+
+        Returns:
+            Diccionario título original -> resultado de resolver()
+        """
+        titulos = [titulo.strip() for titulo in titulos if titulo and titulo.strip()]
+        unicos: Dict[str, str] = {}
+        for titulo in titulos:
+            unicos.setdefault(normalizar_titulo(titulo), titulo)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            resueltos = dict(zip(unicos, executor.map(self.resolver, unicos.values())))
+        return {titulo: resueltos[normalizar_titulo(titulo)] for titulo in titulos}
+
+    def cerrar(self):
+        """Cierra el archivo de la caché"""
+        with self._lock:
+            self._conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cerrar()
+
+
+def guardar_resultados_csv(resultados: Dict[str, Dict], ruta: str) -> str:
+    """
+    Guarda el resultado de resolver_lote() en un CSV separado por |
+
+    Args:
+        resultados: Diccionario título -> resultado
+        ruta: Archivo de salida
+
+    Returns:
+        Ruta absoluta del archivo creado
+    """
+    directorio = os.path.dirname(ruta)
+    if directorio and not os.path.exists(directorio):
+        os.makedirs(directorio)
+    with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+        writer = csv.DictWriter(archivo, fieldnames=COLUMNAS_RESULTADO, delimiter='|', extrasaction='ignore')
+        writer.writeheader()
+        for titulo, resultado in resultados.items():
+            writer.writerow(dict(resultado, titulo=titulo))
+    return os.path.abspath(ruta)
+
+
+def main():
+    """Punto de entrada por línea de comandos"""
+    parser = argparse.ArgumentParser(description="Resuelve una lista de títulos a paperId de Semantic Scholar")
+    parser.add_argument('titulos', help="Archivo de texto con un título por línea")
+    parser.add_argument('-o', '--salida', default=os.path.join("data", "titulos_resueltos.csv"),
+                        help="CSV de salida (separado por |)")
+    parser.add_argument('--workers', type=int, default=8, help="Títulos resueltos simultáneamente")
+    parser.add_argument('--umbral', type=float, default=UMBRAL_CONFIANZA, help="Confianza mínima (0-1)")
+    parser.add_argument('--api-key', default=os.environ.get('SEMANTIC_SCHOLAR_API_KEY'),
+                        help="API key (default: variable SEMANTIC_SCHOLAR_API_KEY)")
+    args = parser.parse_args()
+
+    with open(args.titulos, encoding='utf-8') as archivo:
+        titulos = [linea.strip() for linea in archivo if linea.strip() and not linea.startswith('#')]
+
+    print(f"🔎 Resolviendo {len(titulos)} títulos con {args.workers} workers...")
+    inicio = time.perf_counter()
+    with SemanticScholarAPI(args.api_key, pool_size=max(10, args.workers)) as api, \
+            ResolutorTitulos(api, umbral=args.umbral) as resolutor:
+        resultados = resolutor.resolver_lote(titulos, args.workers)
+    duracion = time.perf_counter() - inicio
+
+    resueltos = sum(1 for resultado in resultados.values() if resultado['paper_id'])
+    print(f"✅ {resueltos}/{len(resultados)} títulos resueltos en {duracion:.1f} s")
+    print(f"📁 Archivo: {guardar_resultados_csv(resultados, args.salida)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Fixtures comunes: servidor falso local y clientes configurados para tests rápidos
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from semantic_scholar_api import SemanticScholarAPI  # noqa: E402
+from semantic_scholar_fake_server import ServidorFalso  # noqa: E402
+from semantic_scholar_rate_limit import RateLimiter  # noqa: E402
+from semantic_scholar_retry import PoliticaReintentos  # noqa: E402
+
+
+class ServidorInstrumentado(ServidorFalso):
+    """
+    ServidorFalso que además mide la concurrencia y permite fallos dirigidos
+
+    `fallar` es una función (metodo, ruta, params) -> código de estado o None;
+    si devuelve un código, esa petición responde con él en lugar de la respuesta
+    sintética (útil para romper una página concreta). También puede devolver
+    una tupla (código, cuerpo) con un cuerpo propio, p. ej. bytes que no son JSON.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fallar = None
+        self.en_vuelo = 0
+        self.max_en_vuelo = 0
+        self._lock_vuelo = threading.Lock()
+
+    def atender(self, metodo, ruta, params, cuerpo):
+        with self._lock_vuelo:
+            self.en_vuelo += 1
+            self.max_en_vuelo = max(self.max_en_vuelo, self.en_vuelo)
+        try:
+            fallo = self.fallar(metodo, ruta, params) if self.fallar else None
+            if fallo is not None:
+                estado, cuerpo = fallo if isinstance(fallo, tuple) else (fallo, {'message': f'Fallo dirigido {fallo}'})
+                return estado, cuerpo, {'Retry-After': '0'}
+            return super().atender(metodo, ruta, params, cuerpo)
+        finally:
+            with self._lock_vuelo:
+                self.en_vuelo -= 1
+
+
+@pytest.fixture
+def servidor():
+    with ServidorInstrumentado(total_papers=3000, semilla=1) as servidor:
+        yield servidor
+
+
+@pytest.fixture
+def crear_api(servidor):
+    """Fábrica de clientes síncronos contra el servidor falso (sin esperas ni reintentos por defecto)"""
+    clientes = []
+
+    def crear(**kwargs):
+        kwargs.setdefault('base_url', servidor.base_url)
+        kwargs.setdefault('rate_limiter', RateLimiter(1e6, 1e6))
+        kwargs.setdefault('reintentos', PoliticaReintentos(0))
+        api = SemanticScholarAPI(**kwargs)
+        clientes.append(api)
+        return api
+
+    yield crear
+    for api in clientes:
+        api.close()
@@ -0,0 +1,68 @@
+"""
+Registro compacto Articulo: mismas claves y valores que procesar_articulo, sin __dict__
+"""
+
+import csv
+import os
+
+import pytest
+
+from semantic_scholar_api import Articulo, guardar_articulos_csv, procesar_articulo
+
+PAPER = {
+    'paperId': 'abc', 'title': 'Attention is all you need', 'url': '',
+    'authors': [{'name': 'A. Vaswani'}, {'name': 'N. Shazeer'}, {'name': 'N. Parmar'}, {'name': 'J. Uszkoreit'}],
+    'year': 2017, 'venue': 'NeurIPS', 'abstract': None, 'citationCount': 123456,
+    'publicationDate': '2017-06-12', 'publicationTypes': ['Conference'], 'fieldsOfStudy': ['Computer Science'],
+}
+
+
+@pytest.mark.parametrize('paper', [
+    PAPER,
+    {'paperId': 'xyz', 'title': 'Solo título'},
+    dict(PAPER, authors=PAPER['authors'][:2], venue='', citationCount=0, fieldsOfStudy=None),
+])
+def test_misma_vista_que_procesar_articulo(paper):
+    articulo = Articulo.desde_paper(paper)
+
+    assert dict(articulo) == procesar_articulo(paper)
+    assert list(articulo) == list(procesar_articulo(paper))
+
+
+def test_textos_de_presentacion():
+    articulo = Articulo.desde_paper(PAPER)
+
+    assert articulo['autores_info'] == "A. Vaswani, N. Shazeer, N. Parmar et al. - NeurIPS - 2017"
+    assert articulo['citado_por'] == "Citado por 123,456"
+    assert articulo['enlace'] == "https://www.semanticscholar.org/paper/abc"
+    assert articulo['resumen'] == "Resumen no disponible"
+    assert articulo.year == 2017 and articulo.autores[0] == 'A. Vaswani'
+
+
+def test_es_compacto_y_de_solo_lectura():
+    articulo = Articulo.desde_paper(PAPER)
+
+    assert not hasattr(articulo, '__dict__')
+    with pytest.raises(TypeError):
+        articulo['titulo'] = 'otro'
+    with pytest.raises(KeyError):
+        articulo['no_existe']
+    assert articulo.get('no_existe', 1) == 1
+
+
+def test_cliente_con_registros_compactos(crear_api, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    compactos = crear_api(registros_compactos=True).buscar_articulos("paper", 20)
+    diccionarios = crear_api().buscar_articulos("paper", 20)
+
+    assert all(isinstance(articulo, Articulo) for articulo in compactos)
+    assert [dict(a) for a in compactos] == diccionarios
+
+    def leer(ruta):
+        with open(ruta, newline='', encoding='utf-8') as archivo:
+            return [fila[:-1] for fila in csv.reader(archivo, delimiter='|')]  # sin fecha_extraccion
+
+    ruta_compactos = guardar_articulos_csv(compactos, nombre_archivo="compactos.csv")
+    ruta_dicts = guardar_articulos_csv(diccionarios, nombre_archivo="dicts.csv")
+    assert os.path.exists(ruta_compactos)
+    assert leer(ruta_compactos) == leer(ruta_dicts)
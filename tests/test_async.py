@@ -0,0 +1,68 @@
+"""
+Cliente asíncrono: paginación en paralelo, resultados parciales y 404
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from semantic_scholar_async import AsyncSemanticScholarAPI  # noqa: E402
+from semantic_scholar_rate_limit import RateLimiter  # noqa: E402
+from semantic_scholar_retry import ErrorConexion, ErrorServidor, PoliticaReintentos  # noqa: E402
+
+
+def _ejecutar(servidor, corrutina, **kwargs):
+    """Ejecuta corrutina(api) con un cliente asíncrono contra el servidor falso"""
+    async def principal():
+        async with AsyncSemanticScholarAPI(base_url=servidor.base_url, rate_limiter=RateLimiter(1e6, 1e6),
+                                           reintentos=PoliticaReintentos(0), **kwargs) as api:
+            return await corrutina(api)
+    return asyncio.run(principal())
+
+
+def test_buscar_articulos_pagina_en_paralelo(servidor):
+    servidor.latencia = 0.05
+    articulos = _ejecutar(servidor, lambda api: api.buscar_articulos("paper", 1000), max_concurrencia=4)
+
+    assert len(articulos) == 1000
+    assert articulos.completo
+    assert len({a['paper_id'] for a in articulos}) == 1000
+    # 10 páginas: la primera sola y las otras 9 solapadas, sin pasar del límite del cliente
+    assert servidor.peticiones == 10
+    assert 1 < servidor.max_en_vuelo <= 4
+
+
+def test_buscar_articulos_conserva_las_paginas_correctas(servidor):
+    servidor.fallar = lambda metodo, ruta, params: 503 if params.get('offset') == '300' else None
+    articulos = _ejecutar(servidor, lambda api: api.buscar_articulos("paper", 500))
+
+    assert len(articulos) == 400
+    assert not articulos.completo
+    assert [type(e) for e in articulos.errores] == [ErrorServidor]
+
+
+def test_pagina_que_no_es_json_queda_en_errores(servidor):
+    servidor.fallar = lambda metodo, ruta, params: (200, b'<html>Bad gateway</html>') \
+        if params.get('offset') == '200' else None
+    articulos = _ejecutar(servidor, lambda api: api.buscar_articulos("paper", 500))
+
+    assert len(articulos) == 400
+    assert [type(e) for e in articulos.errores] == [ErrorConexion]
+
+
+def test_buscar_articulos_falla_la_primera_pagina(servidor):
+    servidor.fallar = lambda metodo, ruta, params: 503
+    articulos = _ejecutar(servidor, lambda api: api.buscar_articulos("paper", 500))
+
+    assert articulos == []
+    assert len(articulos.errores) == 1
+
+
+def test_obtener_articulo_por_id_404_y_5xx(servidor):
+    assert _ejecutar(servidor, lambda api: api.obtener_articulo_por_id("no-existe")) is None
+
+    servidor.tasa_errores = 1.0
+    with pytest.raises(ErrorServidor):
+        _ejecutar(servidor, lambda api: api.obtener_articulo_por_id("0" * 40))
@@ -0,0 +1,95 @@
+"""
+Autores: elección entre homónimos, caché de nombres (en memoria u opcionalmente en disco)
+y paridad del cliente asíncrono con el síncrono
+"""
+
+import asyncio
+
+import pytest
+
+from semantic_scholar_authors import AutoresSemanticScholar, elegir_autor
+from semantic_scholar_rate_limit import RateLimiter
+from semantic_scholar_retry import PoliticaReintentos
+
+
+def _registrar_rutas(servidor):
+    rutas = []
+
+    def registrar(metodo, ruta, params):
+        rutas.append(ruta.split('?')[0])
+        return None
+
+    servidor.fallar = registrar
+    return rutas
+
+
+def test_elegir_autor_prefiere_el_nombre_exacto_con_mas_papers():
+    candidatos = [
+        {'authorId': '1', 'name': 'J. García', 'paperCount': 900},
+        {'authorId': '2', 'name': 'José García', 'paperCount': 10},
+        {'authorId': '3', 'name': 'Jose  Garcia', 'paperCount': 40},
+    ]
+
+    assert elegir_autor("José García", candidatos) == '3'
+    assert elegir_autor("Ana Pérez", candidatos) == '1'
+    assert elegir_autor("Ana Pérez", []) is None
+
+
+def test_cache_en_memoria_por_defecto(servidor, crear_api, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rutas = _registrar_rutas(servidor)
+    api = crear_api()
+
+    primera = api.buscar_por_autor("Ada Lovelace", 250)
+    segunda = api.buscar_por_autor("ada lovelace", 5)
+
+    assert len(primera) == 250 and primera.completo
+    assert segunda == primera[:5]
+    assert rutas.count('/author/search') == 1
+    assert api.autores.ruta_cache is None
+    assert not (tmp_path / "data").exists()
+
+
+def test_cache_persistente_y_fijaciones(servidor, crear_api, tmp_path):
+    ruta = str(tmp_path / "autores.sqlite")
+    with AutoresSemanticScholar(crear_api(), ruta) as autores:
+        assert [c['authorId'] for c in autores.candidatos("Ada Lovelace")] == ['1000', '1001', '1002']
+        assert autores.resolver("Ada Lovelace") == '1000'
+        autores.fijar("Ada Lovelace", '1002')
+
+    rutas = _registrar_rutas(servidor)
+    api = crear_api(ruta_cache_autores=ruta)
+    api.buscar_por_autor("Ada Lovelace", 1)
+
+    assert api.autores.resolver("ADA LOVELACE") == '1002'
+    assert '/author/search' not in rutas
+    assert '/author/1002/papers' in rutas
+
+
+def test_obtener_autores_por_lotes(crear_api):
+    with AutoresSemanticScholar(crear_api()) as autores:
+        resultado = autores.obtener_autores(['1000', 'no-existe', '42'])
+
+    assert [a and a['authorId'] for a in resultado] == ['1000', None, '42']
+
+
+def test_cliente_asincrono_resuelve_igual_y_pagina(servidor, crear_api):
+    pytest.importorskip("aiohttp")
+    from semantic_scholar_async import AsyncSemanticScholarAPI
+
+    async def principal():
+        async with AsyncSemanticScholarAPI(base_url=servidor.base_url, rate_limiter=RateLimiter(1e6, 1e6),
+                                           reintentos=PoliticaReintentos(0)) as api:
+            primera = await api.buscar_por_autor("Ada Lovelace", 1500)
+            segunda = await api.buscar_por_autor("Ada  Lovelace", 3)
+            return primera, segunda, await api.resolver_autor("Ada Lovelace")
+
+    rutas = _registrar_rutas(servidor)
+    primera, segunda, author_id = asyncio.run(principal())
+
+    assert len(primera) == 1500 and primera.completo
+    assert segunda == primera[:3]
+    assert rutas.count('/author/search') == 1
+    assert rutas.count('/author/1000/papers') == 3  # 1000 + 500 y la segunda búsqueda
+    with AutoresSemanticScholar(crear_api()) as autores:
+        assert author_id == autores.resolver("Ada Lovelace") == '1000'
@@ -0,0 +1,79 @@
+"""
+Lotes de consultas: lectura del archivo, escritura en streaming y errores por consulta
+"""
+
+import csv
+
+from semantic_scholar_batch import cargar_consultas, ejecutar_lote
+
+
+def _filas(ruta):
+    with open(ruta, newline='', encoding='utf-8') as archivo:
+        return list(csv.DictReader(archivo, delimiter='|'))
+
+
+def _consultas(*queries, num_resultados=150):
+    return [{'query': q, 'num_resultados': num_resultados, 'año_desde': None, 'año_hasta': None}
+            for q in queries]
+
+
+def test_cargar_consultas_txt(tmp_path):
+    ruta = tmp_path / "consultas.txt"
+    ruta.write_text("# comentario\nmachine learning | 2020-2024 | 200\n\ncrispr | 2018-\ngraphene\n",
+                    encoding='utf-8')
+
+    consultas = cargar_consultas(str(ruta))
+
+    assert consultas == [
+        {'query': 'machine learning', 'año_desde': 2020, 'año_hasta': 2024, 'num_resultados': 200},
+        {'query': 'crispr', 'año_desde': 2018, 'año_hasta': None, 'num_resultados': 10},
+        {'query': 'graphene', 'año_desde': None, 'año_hasta': None, 'num_resultados': 10},
+    ]
+
+
+def test_combinado_identifica_la_consulta_de_cada_fila(crear_api, tmp_path):
+    ruta = str(tmp_path / "todo.csv")
+
+    resumen = ejecutar_lote(crear_api(), _consultas("paper", "topic"), max_workers=2, archivo_combinado=ruta)
+
+    filas = _filas(ruta)
+    assert resumen['errores'] == 0
+    assert resumen['articulos'] == len(filas) == 300
+    assert sorted({fila['consulta'] for fila in filas}) == ["paper", "topic"]
+    assert sum(1 for fila in filas if fila['consulta'] == "paper") == 150
+
+
+def test_error_en_una_consulta_no_para_el_lote_y_conserva_lo_descargado(crear_api, tmp_path):
+    api = crear_api()
+    ruta = str(tmp_path / "todo.csv")
+    original = api.iterar_articulos
+    escritas_a_mitad = []
+
+    def iterar(query, *args, **kwargs):
+        for numero, articulo in enumerate(original(query, *args, **kwargs), 1):
+            if query == "roto" and numero == 130:
+                # Las páginas anteriores ya tienen que estar en disco
+                escritas_a_mitad.append(len(_filas(ruta)))
+                raise ValueError("paper mal formado")
+            yield articulo
+
+    api.iterar_articulos = iterar
+    resumen = ejecutar_lote(api, _consultas("paper", "roto"), max_workers=2, archivo_combinado=ruta)
+
+    detalle = {d['query']: d for d in resumen['detalle']}
+    assert resumen['errores'] == 1
+    assert detalle['roto']['error'] == "paper mal formado"
+    assert detalle['roto']['articulos'] == 129
+    assert detalle['paper']['error'] is None
+    assert escritas_a_mitad and escritas_a_mitad[0] >= 100
+    assert sum(1 for fila in _filas(ruta) if fila['consulta'] == "roto") == 129
+
+
+def test_un_csv_por_consulta(crear_api, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    resumen = ejecutar_lote(crear_api(), _consultas("paper", num_resultados=20))
+
+    archivos = {d['query']: d['archivo'] for d in resumen['detalle']}
+    assert len(_filas(archivos["paper"])) == 20
+    assert 'consulta' not in _filas(archivos["paper"])[0]
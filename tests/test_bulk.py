@@ -0,0 +1,92 @@
+"""
+Búsqueda masiva: reanudación desde el archivo de estado
+"""
+
+import json
+
+import pytest
+
+from semantic_scholar_api import FiltrosBusqueda
+from semantic_scholar_bulk import BusquedaMasiva
+from semantic_scholar_retry import ErrorServidor
+from semantic_scholar_sinks import SinkJSONL
+
+
+def _ids(ruta):
+    with open(ruta, encoding='utf-8') as archivo:
+        return [json.loads(linea)['paper_id'] for linea in archivo]
+
+
+def test_reanuda_desde_el_token_guardado(servidor, crear_api, tmp_path):
+    api = crear_api()
+    ruta_estado = tmp_path / "estado.json"
+    ruta_salida = tmp_path / "salida.jsonl"
+
+    # Corte en la tercera página: quedan guardadas las dos primeras y su token
+    servidor.fallar = lambda metodo, ruta, params: 503 if params.get('token') == '2000' else None
+    with SinkJSONL(str(ruta_salida)) as sink:
+        with pytest.raises(ErrorServidor):
+            BusquedaMasiva(api, "paper", ruta_estado=str(ruta_estado)).ejecutar(sink)
+    estado = json.loads(ruta_estado.read_text(encoding='utf-8'))
+    assert (estado['token'], estado['escritos'], estado['terminado']) == ('2000', 2000, False)
+
+    servidor.fallar = None
+    peticiones_antes = servidor.peticiones
+    with SinkJSONL(str(ruta_salida)) as sink:
+        escritos = BusquedaMasiva(api, "paper", ruta_estado=str(ruta_estado)).ejecutar(sink)
+
+    assert escritos == 3000
+    assert servidor.peticiones - peticiones_antes == 1  # solo la página que faltaba
+    ids = _ids(ruta_salida)
+    assert len(ids) == len(set(ids)) == 3000
+    assert json.loads(ruta_estado.read_text(encoding='utf-8'))['terminado']
+
+
+def test_no_reutiliza_el_token_si_cambian_los_filtros(servidor, crear_api, tmp_path):
+    api = crear_api()
+    ruta_estado = str(tmp_path / "estado.json")
+    original = BusquedaMasiva(api, "paper", ruta_estado=ruta_estado, filtros=FiltrosBusqueda(min_citas=1))
+    with SinkJSONL(str(tmp_path / "a.jsonl")) as sink:
+        original.ejecutar(sink, max_resultados=1000)
+
+    assert original._cargar_estado(1000) is not None
+    otra = BusquedaMasiva(api, "paper", ruta_estado=ruta_estado, filtros=FiltrosBusqueda(min_citas=10))
+    assert otra._cargar_estado(1000) is None
+
+
+def test_ejecucion_nueva_no_borra_lo_que_habia(crear_api, tmp_path):
+    ruta_salida = tmp_path / "salida.jsonl"
+    ruta_salida.write_text('{"previo": 1}\n', encoding='utf-8')
+
+    with SinkJSONL(str(ruta_salida)) as sink:
+        escritos = BusquedaMasiva(crear_api(), "paper").ejecutar(sink, max_resultados=10, reanudar=False)
+
+    lineas = ruta_salida.read_text(encoding='utf-8').splitlines()
+    assert escritos == 10
+    assert lineas[0] == '{"previo": 1}'
+    assert len(lineas) == 11
+
+
+def test_reanudar_sin_posicion_guardada_no_trunca(crear_api, tmp_path):
+    api = crear_api()
+    ruta_estado = str(tmp_path / "estado.json")
+    ruta_salida = tmp_path / "salida.jsonl"
+    ruta_salida.write_text('{"previo": 1}\n', encoding='utf-8')
+    busqueda = BusquedaMasiva(api, "paper", ruta_estado=ruta_estado)
+    # Estado escrito con un sink sin posición (SinkSQLite)
+    busqueda._guardar_estado({'query': "paper", 'params': busqueda._params(None), 'max_resultados': None,
+                              'token': '2000', 'escritos': 2000, 'posicion': None, 'terminado': False})
+
+    with SinkJSONL(str(ruta_salida)) as sink:
+        assert busqueda.ejecutar(sink) == 3000
+
+    assert len(ruta_salida.read_text(encoding='utf-8').splitlines()) == 1 + 1000
+
+
+def test_estado_terminado_con_otro_limite_no_se_reutiliza(crear_api, tmp_path):
+    api = crear_api()
+    ruta_estado = str(tmp_path / "estado.json")
+    with SinkJSONL(str(tmp_path / "a.jsonl")) as sink:
+        assert BusquedaMasiva(api, "paper", ruta_estado=ruta_estado).ejecutar(sink, max_resultados=5) == 5
+    with SinkJSONL(str(tmp_path / "a.jsonl")) as sink:
+        assert BusquedaMasiva(api, "paper", ruta_estado=ruta_estado).ejecutar(sink, max_resultados=20) == 20
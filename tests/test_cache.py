@@ -0,0 +1,82 @@
+"""
+Caché en disco: claves, TTL por endpoint, persistencia y expulsión por tamaño
+"""
+
+import time
+
+import pytest
+
+from semantic_scholar_cache import CacheDisco, clave_peticion
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CacheDisco(str(tmp_path / "cache.sqlite"))
+    yield cache
+    cache.cerrar()
+
+
+def test_clave_ignora_el_orden_de_fields_y_params():
+    assert (clave_peticion('GET', '/paper/search', {'query': 'x', 'fields': 'title,year'}) ==
+            clave_peticion('get', '/paper/search', {'fields': 'year,title,year', 'query': 'x'}))
+    assert clave_peticion('GET', '/paper/search', {'query': 'x'}) != clave_peticion('GET', '/paper/search', {'query': 'y'})
+
+
+def test_guarda_y_expira_segun_el_endpoint(tmp_path):
+    cache = CacheDisco(str(tmp_path / "cache.sqlite"), ttl_por_endpoint={'/paper/{id}': 0.05})
+    try:
+        cache.guardar('a', '/paper/abc', {'paperId': 'abc'})
+        cache.guardar('b', '/paper/search', {'data': []})
+        assert cache.obtener('a') == {'paperId': 'abc'}
+
+        time.sleep(0.1)
+        assert cache.obtener('a') is None
+        assert cache.obtener('b') == {'data': []}
+        assert cache.estadisticas()['entradas'] == 1
+    finally:
+        cache.cerrar()
+
+
+def test_persiste_entre_aperturas(tmp_path):
+    ruta = str(tmp_path / "cache.sqlite")
+    cache = CacheDisco(ruta)
+    cache.guardar('a', '/paper/abc', {'paperId': 'abc'})
+    cache.cerrar()
+
+    cache = CacheDisco(ruta)
+    try:
+        assert cache.obtener('a') == {'paperId': 'abc'}
+        assert cache.estadisticas()['bytes'] > 0
+    finally:
+        cache.cerrar()
+
+
+def test_expulsa_las_menos_usadas_al_superar_el_tamaño(tmp_path):
+    cache = CacheDisco(str(tmp_path / "cache.sqlite"), max_bytes=250)
+    try:
+        valor = {'texto': 'x' * 90}
+        cache.guardar('vieja', '/paper/a', valor)
+        time.sleep(0.01)
+        cache.guardar('usada', '/paper/b', valor)
+        time.sleep(0.01)
+        assert cache.obtener('vieja') == valor  # pasa a ser la más reciente
+        time.sleep(0.01)
+        cache.guardar('nueva', '/paper/c', valor)
+
+        assert cache.obtener('usada') is None
+        assert cache.obtener('vieja') == valor
+        assert cache.obtener('nueva') == valor
+        assert cache.estadisticas()['bytes'] <= 250
+    finally:
+        cache.cerrar()
+
+
+def test_cliente_no_repite_peticiones_cacheadas(servidor, crear_api, cache):
+    api = crear_api(cache=cache)
+    primero = api.obtener_articulo_por_id("0" * 40)
+    peticiones = servidor.peticiones
+
+    assert api.obtener_articulo_por_id("0" * 40) == primero
+    assert servidor.peticiones == peticiones
+    assert api.metricas.snapshot()['aciertos_cache'] == 1
+
@@ -0,0 +1,74 @@
+"""
+Caché en memoria: LRU, TTL y agrupación de peticiones simultáneas (single-flight)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from semantic_scholar_cache import CacheMemoria
+
+
+def test_memoria_agrupa_peticiones_simultaneas():
+    cache = CacheMemoria()
+    llamadas = []
+    liberar = threading.Event()
+
+    def calcular():
+        llamadas.append(1)
+        liberar.wait(1)
+        return {'ok': True}
+
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(cache.obtener_o_calcular('k', calcular)))
+             for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    time.sleep(0.05)
+    liberar.set()
+    for hilo in hilos:
+        hilo.join()
+
+    assert llamadas == [1]
+    assert resultados == [{'ok': True}] * 8
+    assert cache.estadisticas()['agrupadas'] == 7
+    assert cache.obtener_o_calcular('k', calcular) == {'ok': True}
+    assert llamadas == [1]
+
+
+def test_memoria_propaga_el_error_a_todos_y_no_lo_guarda():
+    cache = CacheMemoria()
+
+    def fallar():
+        raise ValueError("caído")
+
+    with pytest.raises(ValueError):
+        cache.obtener_o_calcular('k', fallar)
+    assert cache.obtener_o_calcular('k', lambda: 42) == 42
+
+
+def test_memoria_lru_y_ttl():
+    cache = CacheMemoria(max_entradas=2, ttl=0.05)
+    cache.obtener_o_calcular('a', lambda: 1)
+    cache.obtener_o_calcular('b', lambda: 2)
+    cache.obtener_o_calcular('a', lambda: 0)  # acierto: 'a' pasa a ser la más reciente
+    cache.obtener_o_calcular('c', lambda: 3)  # expulsa 'b'
+
+    assert cache.obtener_o_calcular('a', lambda: 0) == 1
+    assert cache.obtener_o_calcular('b', lambda: 20) == 20
+    time.sleep(0.1)
+    assert cache.obtener_o_calcular('a', lambda: 10) == 10
+
+
+def test_cliente_agrupa_lookups_simultaneos(servidor, crear_api):
+    servidor.latencia = 0.1
+    api = crear_api(cache_memoria=CacheMemoria())
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        articulos = list(executor.map(lambda _: api.obtener_articulo_por_id("0" * 40), range(6)))
+
+    assert servidor.peticiones == 1
+    assert all(articulo == articulos[0] for articulo in articulos)
+    assert api.cache_memoria.estadisticas()['agrupadas'] == 5
@@ -0,0 +1,49 @@
+"""
+Campos a pedir a la API (presets y columnas) y plantillas de endpoint
+"""
+
+import pytest
+
+from semantic_scholar_api import COLUMNAS_CSV, PRESETS_CAMPOS, plantilla_endpoint, resolver_campos
+from semantic_scholar_cache import TTL_POR_ENDPOINT, CacheDisco
+
+
+def test_presets_y_columnas():
+    assert resolver_campos('ids-only') == ['paperId']
+    assert resolver_campos('metadata') == PRESETS_CAMPOS['metadata']
+    assert resolver_campos(['titulo', 'year', 'autores_info']) == ['paperId', 'title', 'year', 'authors', 'venue']
+    assert set(resolver_campos(COLUMNAS_CSV)) <= set(resolver_campos('full'))
+    assert resolver_campos(['externalIds', 'title']) == ['paperId', 'externalIds', 'title']
+    with pytest.raises(ValueError):
+        resolver_campos('todo')
+
+
+@pytest.mark.parametrize('ruta, plantilla', [
+    ('/paper/search', '/paper/search'),
+    ('/paper/search/bulk', '/paper/search/bulk'),
+    ('/paper/batch', '/paper/batch'),
+    ('/paper/649def34f8be52c8b66281af98ae884c09aef38b', '/paper/{id}'),
+    ('/paper/DOI:10.1038/nature14539', '/paper/{id}'),
+    ('/paper/DOI:10.1038/nature14539/citations', '/paper/{id}/citations'),
+    ('/paper/ARXIV:2106.15928/references', '/paper/{id}/references'),
+    ('/paper/URL:https://arxiv.org/abs/2106.15928v1/authors', '/paper/{id}/authors'),
+    ('/author/search', '/author/search'),
+    ('/author/1741101', '/author/{id}'),
+    ('/author/1741101/papers', '/author/{id}/papers'),
+])
+def test_plantilla_endpoint(ruta, plantilla):
+    assert plantilla_endpoint(ruta) == plantilla
+
+
+def test_ttl_y_metricas_de_ids_con_barras(servidor, crear_api, tmp_path):
+    cache = CacheDisco(str(tmp_path / "cache.sqlite"), ttl_defecto=0)
+    try:
+        cache.guardar('doi', '/paper/DOI:10.1038/nature14539/references', {'data': []})
+        assert cache.obtener('doi') == {'data': []}
+        assert TTL_POR_ENDPOINT['/paper/{id}/references'] > 0
+    finally:
+        cache.cerrar()
+
+    api = crear_api()
+    assert api.obtener_articulo_por_id("DOI:10.1038/nature14539") is None
+    assert set(api.metricas.snapshot()['endpoints']) == {'/paper/{id}'}
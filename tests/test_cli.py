@@ -0,0 +1,101 @@
+"""
+Línea de comandos: cada subcomando contra el servidor falso, formatos de salida,
+lectura desde stdin y código de salida
+"""
+
+import io
+import json
+import sqlite3
+
+import pytest
+
+import semantic_scholar_cli
+from semantic_scholar_fake_server import paper_id_sintetico
+
+
+@pytest.fixture
+def cli(servidor, tmp_path, monkeypatch):
+    """Ejecuta la CLI contra el servidor falso; devuelve (código de salida, líneas escritas)"""
+    # Las cachés por defecto (títulos, autores) se crean en ./data
+    monkeypatch.chdir(tmp_path)
+
+    def ejecutar(*argv, entrada=''):
+        monkeypatch.setattr('sys.stdin', io.StringIO(entrada))
+        flujo = io.StringIO()
+        codigo = semantic_scholar_cli.ejecutar(
+            [*argv, '--base-url', servidor.base_url, '--tasa', '1000', '--reintentos', '0', '-q'], flujo)
+        return codigo, flujo.getvalue().splitlines()
+
+    return ejecutar
+
+
+def test_search_escribe_jsonl_en_stdout(cli):
+    codigo, lineas = cli('search', 'paper', '-n', '25', '--año-desde', '2015', '--min-citas', '1000')
+
+    articulos = [json.loads(linea) for linea in lineas]
+    assert codigo == 0 and len(articulos) == 25
+    assert all(a['year'] >= 2015 and a['citation_count'] >= 1000 for a in articulos)
+
+
+def test_search_bulk_a_csv(cli, tmp_path):
+    salida = tmp_path / "bulk.csv"
+
+    codigo, lineas = cli('search', 'paper', '--modo', 'bulk', '-n', '1500', '-o', str(salida))
+
+    assert codigo == 0 and lineas == []
+    with open(salida, encoding='utf-8') as archivo:
+        assert len(archivo.read().splitlines()) == 1 + 1500
+
+
+def test_get_marca_los_ids_inexistentes(cli):
+    codigo, lineas = cli('get', paper_id_sintetico(5), 'no-existe', '--campos', 'paperId,title')
+
+    assert codigo == 1
+    assert [json.loads(linea)['paper_id'] for linea in lineas] == [paper_id_sintetico(5)]
+
+
+def test_batch_get_desde_stdin_a_sqlite(cli, tmp_path):
+    ids = [paper_id_sintetico(i) for i in range(1200)]
+    salida = tmp_path / "articulos.sqlite"
+
+    codigo, _ = cli('batch-get', '-', '-o', str(salida), '-c', '2', entrada='# IDs\n' + '\n'.join(ids) + '\n')
+
+    conexion = sqlite3.connect(salida)
+    try:
+        assert conexion.execute("SELECT COUNT(*) FROM articulos").fetchone()[0] == 1200
+    finally:
+        conexion.close()
+    assert codigo == 0
+
+
+def test_author_por_id_con_años(cli):
+    codigo, lineas = cli('author', '1000', '-n', '40', '--año-desde', '2020', '--formato', 'csv')
+
+    assert codigo == 0 and len(lineas) == 1 + 40
+
+
+def test_title_resuelve_y_guarda_metricas(cli, tmp_path):
+    metricas = tmp_path / "metricas.json"
+
+    codigo, lineas = cli('title', 'Synthetic paper number 9 about topic 9', '--metricas', str(metricas))
+
+    assert codigo == 0
+    assert json.loads(lineas[0])['paper_id'] == paper_id_sintetico(9)
+    with open(metricas, encoding='utf-8') as archivo:
+        assert json.load(archivo)['peticiones'] >= 1
+
+
+def test_crawl_escribe_aristas(cli, tmp_path):
+    codigo, lineas = cli('crawl', paper_id_sintetico(1500), '--estado', str(tmp_path / "crawl.sqlite"),
+                         '--profundidad', '0', '--max-vecinos', '5', '--direccion', 'referencias')
+
+    aristas = [json.loads(linea) for linea in lineas]
+    assert codigo == 0 and aristas
+    assert len(aristas) <= 5 and all(a['citante'] == paper_id_sintetico(1500) for a in aristas)
+
+
+def test_sqlite_necesita_archivo(cli):
+    with pytest.raises(SystemExit) as salida:
+        cli('search', 'paper', '--formato', 'sqlite')
+
+    assert salida.value.code == 2
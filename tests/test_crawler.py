@@ -0,0 +1,80 @@
+"""
+Crawler del grafo de citas: expansión BFS, reanudación y errores por nodo
+"""
+
+import pytest
+
+from semantic_scholar_crawler import CrawlerCitas
+from semantic_scholar_fake_server import paper_id_sintetico
+from semantic_scholar_store import AlmacenArticulos
+
+SEMILLA = paper_id_sintetico(1500)
+
+
+@pytest.fixture
+def crawler(crear_api, tmp_path):
+    def crear(**kwargs):
+        kwargs.setdefault('max_workers', 4)
+        return CrawlerCitas(crear_api(), str(tmp_path / "crawl.sqlite"), **kwargs)
+    return crear
+
+
+def test_aristas_van_de_citante_a_citado(crawler):
+    with crawler(direccion='ambas', max_profundidad=0, max_vecinos=5) as crawl:
+        resumen = crawl.ejecutar([SEMILLA], intervalo_progreso=0)
+        aristas = set(crawl.aristas())
+
+    assert resumen['expandidos'] == 1 and resumen['errores'] == 0
+    assert {citante for citante, _ in aristas if citante != SEMILLA}
+    assert all(SEMILLA in arista for arista in aristas)
+    # Con profundidad 0 los vecinos quedan como hojas
+    assert resumen['hojas'] == len({p for arista in aristas for p in arista} - {SEMILLA})
+
+
+def test_reanuda_donde_se_quedo(crawler):
+    with crawler(direccion='referencias', max_profundidad=1, max_vecinos=3) as crawl:
+        primero = crawl.ejecutar([SEMILLA], max_nodos=1, intervalo_progreso=0)
+        segundo = crawl.ejecutar(intervalo_progreso=0)
+
+    assert primero['expandidos'] == 1 and primero['pendientes'] > 0
+    assert segundo['expandidos'] == primero['pendientes']
+    assert segundo['pendientes'] == 0
+
+
+def test_un_nodo_que_falla_no_para_el_crawl(crawler):
+    with crawler(direccion='referencias', max_profundidad=1, max_vecinos=3) as crawl:
+        original = crawl.api.iterar_relacionados
+        roto = next(iter(original(SEMILLA, 'references', max_resultados=1)))['paperId']
+
+        def iterar(paper_id, *args, **kwargs):
+            if paper_id == roto:
+                raise KeyError('paperId')
+            return original(paper_id, *args, **kwargs)
+
+        crawl.api.iterar_relacionados = iterar
+        resumen = crawl.ejecutar([SEMILLA], intervalo_progreso=0)
+        estado = crawl._conexion.execute("SELECT estado, error FROM nodos WHERE paper_id = ?", (roto,)).fetchone()
+
+    assert resumen['errores'] == 1
+    assert resumen['expandidos'] == resumen['hechos'] > 1
+    assert estado == ('error', "'paperId'")
+
+
+def test_guarda_los_vecinos_con_la_ruta_consultada(crawler, tmp_path):
+    with AlmacenArticulos(str(tmp_path / "corpus.sqlite")) as almacen, \
+            crawler(direccion='ambas', max_profundidad=0, max_vecinos=4,
+                    campos='metadata', almacen=almacen) as crawl:
+        rutas = []
+        normalizar = crawl.api.normalizar_pagina
+
+        def registrar(papers, campos, ruta):
+            rutas.append(ruta)
+            return normalizar(papers, campos, ruta)
+
+        crawl.api.normalizar_pagina = registrar
+        crawl.ejecutar([SEMILLA], intervalo_progreso=0)
+        vecinos = {p for arista in crawl.aristas() for p in arista} - {SEMILLA}
+
+        assert sorted(rutas) == [f"/paper/{SEMILLA}/citations", f"/paper/{SEMILLA}/references"]
+        assert almacen.contar() == len(vecinos)
+        assert all(almacen.obtener(paper_id)['titulo'] for paper_id in vecinos)
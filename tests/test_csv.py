@@ -0,0 +1,70 @@
+"""
+Escritura de CSV en streaming y modo append
+"""
+
+import csv
+import os
+
+import pytest
+
+from semantic_scholar_api import COLUMNAS_CSV, EscritorCSV, guardar_articulos_csv
+
+
+def _articulos(n, desde=0):
+    for i in range(desde, desde + n):
+        yield {'paper_id': f"p{i}", 'titulo': f"  Título {i} ", 'year': 2000 + i, 'citation_count': i}
+
+
+def _leer(ruta):
+    with open(ruta, newline='', encoding='utf-8') as archivo:
+        return list(csv.reader(archivo, delimiter='|'))
+
+
+def test_escribe_desde_un_generador(tmp_path):
+    ruta = str(tmp_path / "salida.csv")
+    with EscritorCSV(ruta) as escritor:
+        assert escritor.escribir_todos(_articulos(3)) == 3
+
+    filas = _leer(ruta)
+    assert filas[0] == COLUMNAS_CSV
+    fila = dict(zip(COLUMNAS_CSV, filas[1]))
+    assert (fila['numero'], fila['titulo'], fila['paper_id'], fila['year']) == ('1', 'Título 0', 'p0', '2000')
+    assert len(filas) == 4
+
+
+def test_append_continua_la_numeracion_sin_repetir_cabecera(tmp_path):
+    ruta = str(tmp_path / "salida.csv")
+    with EscritorCSV(ruta) as escritor:
+        escritor.escribir_todos(_articulos(2))
+    with EscritorCSV(ruta, modo='a') as escritor:
+        escritor.escribir_todos(_articulos(2, desde=2))
+
+    filas = _leer(ruta)
+    assert [fila[0] for fila in filas] == ['numero', '1', '2', '3', '4']
+
+
+def test_append_rechaza_otra_cabecera(tmp_path):
+    ruta = tmp_path / "otro.csv"
+    ruta.write_text("a|b\n1|2\n", encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        EscritorCSV(str(ruta), modo='a')
+
+
+def test_vuelca_a_disco_cada_n_filas(tmp_path):
+    ruta = str(tmp_path / "salida.csv")
+    with EscritorCSV(ruta, filas_por_flush=2, segundos_por_flush=3600) as escritor:
+        escritor.escribir_todos(_articulos(2))
+        assert len(_leer(ruta)) == 3
+        escritor.escribir_todos(_articulos(1, desde=2))
+        assert len(_leer(ruta)) == 3  # aún en el buffer
+
+
+def test_guardar_articulos_csv_en_data(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ruta = guardar_articulos_csv(_articulos(5), query="machine learning")
+    ruta = guardar_articulos_csv(_articulos(5, desde=5), nombre_archivo=os.path.basename(ruta), append=True)
+
+    assert ruta.startswith(str(tmp_path / "data"))
+    assert "machine_learning" in ruta
+    assert len(_leer(ruta)) == 11
@@ -0,0 +1,79 @@
+"""
+Filtros de búsqueda: parámetros por endpoint, comprobación local y mismo resultado
+en el cliente síncrono y el asíncrono
+"""
+
+import asyncio
+
+import pytest
+
+from semantic_scholar_api import FiltrosBusqueda, combinar_filtros
+from semantic_scholar_rate_limit import RateLimiter
+from semantic_scholar_retry import PoliticaReintentos
+
+FILTROS = FiltrosBusqueda(año_desde=2000, min_citas=2500, venues=['Nature', 'Cell'], solo_acceso_abierto=True)
+
+
+def test_parametros_y_filtros_locales_por_endpoint():
+    assert FILTROS.parametros('/paper/search') == {
+        'year': '2000-', 'minCitationCount': '2500', 'venue': 'Nature,Cell', 'openAccessPdf': ''}
+    assert FILTROS.parametros('/author/{id}/papers') == {'year': '2000-'}
+    assert FILTROS.locales('/author/{id}/papers') == ['minCitationCount', 'venue', 'openAccessPdf']
+    assert set(FILTROS.campos_locales('/author/{id}/papers')) == {'citationCount', 'venue', 'openAccessPdf'}
+    assert FILTROS.parametros('/paper/{id}/citations') == {}
+    assert not FiltrosBusqueda() and FILTROS
+
+
+def test_cumple():
+    paper = {'year': 2010, 'citationCount': 3000, 'venue': 'nature', 'openAccessPdf': {'url': 'x'}}
+
+    assert FILTROS.cumple(paper)
+    assert not FILTROS.cumple(dict(paper, openAccessPdf=None))
+    assert not FILTROS.cumple(dict(paper, year=1999))
+    assert not FILTROS.cumple(dict(paper, venue='Science'))
+    # Con endpoint solo se comprueba lo que ese endpoint no filtra en el servidor
+    assert FILTROS.cumple(dict(paper, year=1999), '/author/{id}/papers')
+    assert FiltrosBusqueda(fecha_desde='2010-05').cumple({'publicationDate': '2010-06-01'})
+    assert not FiltrosBusqueda(fecha_desde='2010-05').cumple({'year': 2010})
+    assert not FILTROS.cumple(None)
+
+
+def test_combinar_filtros_da_prioridad_a_los_años_explicitos():
+    combinados = combinar_filtros(FILTROS, año_hasta=2020)
+
+    assert (combinados.año_desde, combinados.año_hasta, combinados.min_citas) == (2000, 2020, 2500)
+    assert FILTROS.año_hasta is None
+    assert combinar_filtros(FILTROS) is FILTROS
+    assert combinar_filtros(None, 2001).parametros('/paper/search') == {'year': '2001-'}
+
+
+def _async(servidor, corrutina):
+    pytest.importorskip("aiohttp")
+    from semantic_scholar_async import AsyncSemanticScholarAPI
+
+    async def principal():
+        async with AsyncSemanticScholarAPI(base_url=servidor.base_url, rate_limiter=RateLimiter(1e6, 1e6),
+                                           reintentos=PoliticaReintentos(0)) as api:
+            return await corrutina(api)
+    return asyncio.run(principal())
+
+
+def test_autor_con_filtros_locales_igual_en_ambos_clientes(servidor, crear_api):
+    filtros = FiltrosBusqueda(min_citas=4000, venues=['Nature'])
+
+    sincrono = crear_api().buscar_por_autor("Ada Lovelace", 30, filtros=filtros)
+    asincrono = _async(servidor, lambda api: api.buscar_por_autor("Ada Lovelace", 30, filtros=filtros))
+
+    assert len(sincrono) == 30
+    assert all(a['citation_count'] >= 4000 and a['venue'] == 'Nature' for a in sincrono)
+    assert asincrono == sincrono
+
+
+def test_titulo_con_filtros_igual_en_ambos_clientes(servidor, crear_api):
+    filtros = FiltrosBusqueda(min_citas=1000, solo_acceso_abierto=True)
+
+    sincrono = crear_api().buscar_por_titulo("paper", 50, año_desde=2010, filtros=filtros)
+    asincrono = _async(servidor, lambda api: api.buscar_por_titulo("paper", 50, año_desde=2010, filtros=filtros))
+
+    assert sincrono and asincrono == sincrono
+    assert all(a['citation_count'] >= 1000 and a['year'] >= 2010 for a in sincrono)
@@ -0,0 +1,43 @@
+"""
+Grabación y reproducción de respuestas, incluidos los 404
+"""
+
+import pytest
+
+from semantic_scholar_api import SemanticScholarAPI
+from semantic_scholar_fixtures import FixturesHTTP
+from semantic_scholar_retry import ErrorNoEncontrado
+from semantic_scholar_titles import ResolutorTitulos
+
+TITULO_INEXISTENTE = "zzz qqq un título que no existe"
+
+
+def test_reproduce_un_404_grabado(servidor, crear_api, tmp_path):
+    directorio = str(tmp_path / "fixtures")
+    grabando = crear_api(fixtures=FixturesHTTP(directorio, modo='grabar'))
+    assert grabando.obtener_articulo_por_id("no-existe") is None
+    servidor.detener()
+
+    fixtures = FixturesHTTP(directorio, modo='reproducir')
+    assert [registro['estado'] for registro in fixtures.registros()] == [404]
+    registro = next(fixtures.registros())
+    with pytest.raises(ErrorNoEncontrado):
+        fixtures.reproducir(registro['metodo'], registro['ruta'], registro['params'])
+
+    # Sin red: la respuesta sale del disco y se interpreta igual que el 404 real
+    api = SemanticScholarAPI(fixtures=fixtures)
+    assert api.obtener_articulo_por_id("no-existe") is None
+
+
+def test_resolutor_de_titulos_con_404_reproducido(crear_api, tmp_path):
+    directorio = str(tmp_path / "fixtures")
+    grabando = crear_api(fixtures=FixturesHTTP(directorio, modo='grabar'))
+    with ResolutorTitulos(grabando, ruta_cache=str(tmp_path / "grabado.sqlite")) as resolutor:
+        grabado = resolutor.resolver(TITULO_INEXISTENTE)
+
+    api = SemanticScholarAPI(fixtures=FixturesHTTP(directorio, modo='reproducir'))
+    with ResolutorTitulos(api, ruta_cache=str(tmp_path / "reproducido.sqlite")) as resolutor:
+        reproducido = resolutor.resolver(TITULO_INEXISTENTE)
+
+    assert grabado['metodo'] == reproducido['metodo'] == 'sin_resultado'
+    assert reproducido['paper_id'] is None
@@ -0,0 +1,88 @@
+"""
+Grafo de citas en CSR: construcción, grados, PageRank, vecindarios y exportación
+"""
+
+import csv
+import sqlite3
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from semantic_scholar_graph import GrafoCitas  # noqa: E402
+from semantic_scholar_store import AlmacenArticulos  # noqa: E402
+
+# a y b citan a c; c cita a d; d no cita a nadie; e está aislado
+ARISTAS = [('a', 'c'), ('b', 'c'), ('c', 'd'), ('a', 'c')]
+
+
+def _pagerank_referencia(nodos, aristas, d=0.85, iteraciones=200):
+    """PageRank directo sobre diccionarios, para comparar con la versión vectorizada"""
+    salida = {n: sorted({citado for citante, citado in aristas if citante == n}) for n in nodos}
+    pr = {n: 1 / len(nodos) for n in nodos}
+    for _ in range(iteraciones):
+        colgante = sum(pr[n] for n in nodos if not salida[n])
+        pr = {n: (1 - d) / len(nodos) + d * (colgante / len(nodos) + sum(
+            pr[m] / len(salida[m]) for m in nodos if n in salida[m])) for n in nodos}
+    return pr
+
+
+@pytest.fixture
+def grafo():
+    return GrafoCitas.desde_aristas(ARISTAS, nodos=['e'])
+
+
+def test_construccion_y_grados(grafo):
+    assert grafo.num_nodos == 5
+    assert grafo.num_aristas == 3  # la arista repetida cuenta una vez
+    entrada = dict(zip(grafo.ids, grafo.grados_entrada()))
+    salida = dict(zip(grafo.ids, grafo.grados_salida()))
+    assert entrada == {'a': 0, 'b': 0, 'c': 2, 'd': 1, 'e': 0}
+    assert salida == {'a': 1, 'b': 1, 'c': 1, 'd': 0, 'e': 0}
+
+
+def test_pagerank_coincide_con_la_definicion(grafo):
+    puntuacion = grafo.pagerank()
+    referencia = _pagerank_referencia(grafo.ids, set(ARISTAS))
+
+    assert puntuacion.sum() == pytest.approx(1.0)
+    for paper_id, valor in zip(grafo.ids, puntuacion):
+        assert valor == pytest.approx(referencia[paper_id], abs=1e-8)
+    assert [paper_id for paper_id, _ in grafo.mas_influyentes(2, puntuacion)] == ['d', 'c']
+    assert 0 < grafo.iteraciones_pagerank < 100
+
+
+def test_vecindario_por_direccion(grafo):
+    assert grafo.vecindario('c', 1, 'referencias') == {'d': 1}
+    assert grafo.vecindario('c', 1, 'citas') == {'a': 1, 'b': 1}
+    assert grafo.vecindario('a', 2, 'ambas') == {'c': 1, 'b': 2, 'd': 2}
+    assert grafo.vecindario('e', 3) == {}
+    with pytest.raises(ValueError):
+        grafo.vecindario('a', 1, 'lateral')
+
+
+def test_carga_el_crawl_y_exporta(tmp_path):
+    ruta = str(tmp_path / "crawl.sqlite")
+    conexion = sqlite3.connect(ruta)
+    conexion.executescript("""
+        CREATE TABLE nodos (paper_id TEXT PRIMARY KEY, profundidad INTEGER, estado TEXT, error TEXT);
+        CREATE TABLE aristas (citante TEXT, citado TEXT);
+    """)
+    conexion.executemany("INSERT INTO nodos (paper_id) VALUES (?)", [(n,) for n in 'abcde'])
+    conexion.executemany("INSERT INTO aristas VALUES (?, ?)", set(ARISTAS))
+    conexion.commit()
+    conexion.close()
+
+    grafo = GrafoCitas.desde_sqlite(ruta)
+    assert (grafo.num_nodos, grafo.num_aristas) == (5, 3)
+
+    with AlmacenArticulos(str(tmp_path / "corpus.sqlite")) as almacen:
+        almacen.ingerir([{'paper_id': 'd', 'titulo': 'Fundacional', 'citation_count': 900}])
+        salida = grafo.exportar_csv(str(tmp_path / "metricas.csv"), almacen=almacen)
+        assert grafo.exportar_almacen(almacen) == 5
+        assert [a['paper_id'] for a in almacen.mas_influyentes()] == ['d']
+
+    with open(salida, newline='', encoding='utf-8') as archivo:
+        filas = {fila['paper_id']: fila for fila in csv.DictReader(archivo, delimiter='|')}
+    assert filas['d']['titulo'] == 'Fundacional' and filas['d']['grado_entrada'] == '1'
+    assert filas['e']['titulo'] == ''
@@ -0,0 +1,145 @@
+"""
+Métricas: percentiles comunes a lotes, benchmarks e histogramas; registro por endpoint,
+hooks y exportación en JSON y Prometheus
+"""
+
+import json
+
+import pytest
+
+from semantic_scholar_batch import percentil as percentil_lote
+from semantic_scholar_bench import percentiles
+from semantic_scholar_cache import CacheMemoria
+from semantic_scholar_fake_server import paper_id_sintetico
+from semantic_scholar_metrics import ExportadorPeriodico, HistogramaLatencia, MetricasCliente, percentil
+from semantic_scholar_retry import ErrorNoEncontrado, PoliticaReintentos
+
+
+def test_percentil_interpola_entre_muestras():
+    assert percentil([4, 1, 3, 2], 50) == 2.5
+    assert percentil([1, 2, 3, 4], 95) == pytest.approx(3.85)
+    assert (percentil([1, 2, 3, 4], 0), percentil([1, 2, 3, 4], 100)) == (1, 4)
+    assert percentil([7], 99) == 7
+    assert percentil([], 50) == 0.0
+
+
+def test_lotes_y_benchmarks_usan_la_misma_definicion():
+    muestras = [0.3, 0.01, 0.2, 0.9, 0.05, 0.4, 0.07]
+
+    assert percentil_lote is percentil
+    assert percentiles(muestras) == {f"p{q}": percentil(muestras, q) for q in (50, 95, 99)}
+
+
+def test_histograma_usa_la_misma_posicion_que_percentil():
+    # Una muestra en el límite superior de cada cubeta: el histograma no pierde información
+    limites = (1.0, 2.0, 3.0, 4.0)
+    histograma = HistogramaLatencia(limites)
+    for valor in limites:
+        histograma.observar(valor)
+
+    for q in (0, 25, 50, 90, 95, 99, 100):
+        assert histograma.percentil(q) == pytest.approx(percentil(limites, q))
+
+
+def test_histograma_interpola_dentro_de_la_cubeta():
+    histograma = HistogramaLatencia((0.1, 1.0))
+    for _ in range(9):
+        histograma.observar(0.05)
+    histograma.observar(0.5)
+
+    assert histograma.percentil(50) == pytest.approx(0.1 * 5.5 / 9)
+    assert histograma.percentil(100) == 1.0
+    histograma.observar(60.0)
+    assert histograma.percentil(100) == 1.0  # la cubeta +Inf devuelve el último límite
+
+
+def test_cliente_registra_cada_intento_por_endpoint(servidor, crear_api):
+    api = crear_api(reintentos=PoliticaReintentos(2, espera_base=0.0))
+    fallos = []
+
+    def fallar_una_vez(metodo, ruta, params):
+        if ruta.startswith('/paper/') and not fallos:
+            fallos.append(ruta)
+            return 503
+        return None
+
+    servidor.fallar = fallar_una_vez
+    api.consultar(f"/paper/{paper_id_sintetico(1)}", {'fields': 'title'})
+    api.consultar(f"/paper/{paper_id_sintetico(2)}", {'fields': 'title'})
+    with pytest.raises(ErrorNoEncontrado):
+        api.consultar("/paper/no-existe", {'fields': 'title'})
+
+    foto = api.metricas.snapshot()
+    paper = foto['endpoints']['/paper/{id}']
+    assert foto['peticiones'] == 4
+    assert paper['estados'] == {'503': 1, '200': 2, '404': 1}
+    assert paper['latencia']['cuenta'] == 4
+    assert paper['bytes_recibidos'] > 0 and paper['bytes_enviados'] == 0
+    assert paper['reintentos'] == {'ErrorServidor': 1}
+    assert paper['errores'] == {'ErrorNoEncontrado': 1}
+    assert foto['reintentos'] == 1 and foto['errores'] == 1
+
+
+def test_aciertos_de_cache_no_cuentan_como_peticiones(servidor, crear_api):
+    api = crear_api(cache_memoria=CacheMemoria())
+    ruta = f"/paper/{paper_id_sintetico(3)}"
+
+    for _ in range(3):
+        api.consultar(ruta, {'fields': 'title'})
+
+    foto = api.metricas.snapshot()
+    assert (foto['peticiones'], foto['aciertos_cache']) == (1, 2)
+    assert foto['endpoints']['/paper/{id}']['aciertos_cache'] == {'memoria': 2}
+
+
+def test_hooks_antes_y_despues(crear_api):
+    metricas = MetricasCliente()
+    eventos = []
+    metricas.antes_de_peticion(lambda evento: eventos.append(('antes', dict(evento))))
+
+    @metricas.despues_de_peticion
+    def despues(evento):
+        eventos.append(('despues', dict(evento)))
+
+    @metricas.despues_de_peticion
+    def roto(evento):
+        raise RuntimeError("el hook falla")
+
+    crear_api(metricas=metricas).consultar(f"/paper/{paper_id_sintetico(4)}", {'fields': 'title'})
+
+    assert [momento for momento, _ in eventos] == ['antes', 'despues']
+    antes, despues_ = eventos[0][1], eventos[1][1]
+    assert (antes['endpoint'], antes['origen'], antes['intento']) == ('/paper/{id}', 'red', 0)
+    assert 'estado' not in antes
+    assert despues_['estado'] == 200 and despues_['error'] is None and despues_['duracion'] > 0
+    metricas.quitar_hook(despues)
+    metricas.notificar_despues({})
+    assert len(eventos) == 2
+
+
+def test_exportar_json_y_prometheus(tmp_path):
+    metricas = MetricasCliente(limites=(0.1, 1.0))
+    metricas.registrar_peticion('GET', '/paper/{id}', 200, 0.05, 0, 120)
+    metricas.registrar_peticion('GET', '/paper/{id}', None, 2.0)
+    metricas.registrar_espera_limitador(0.5)
+    metricas.registrar_cache('/author/{id}', 'disco')
+
+    foto = json.loads(metricas.exportar_json())
+    assert foto['peticiones'] == 2 and foto['espera_limitador_segundos'] == 0.5
+    assert foto['endpoints']['/paper/{id}']['estados'] == {'200': 1, 'sin_respuesta': 1}
+
+    texto = metricas.exportar_prometheus()
+    assert 'semantic_scholar_peticiones_total{metodo="GET",endpoint="/paper/{id}",estado="200"} 1' in texto
+    assert 'semantic_scholar_latencia_segundos_bucket{endpoint="/paper/{id}",le="0.1"} 1' in texto
+    assert 'semantic_scholar_latencia_segundos_bucket{endpoint="/paper/{id}",le="+Inf"} 2' in texto
+    assert 'semantic_scholar_latencia_segundos_count{endpoint="/paper/{id}"} 2' in texto
+    assert 'semantic_scholar_bytes_recibidos_total{endpoint="/paper/{id}"} 120' in texto
+    assert 'semantic_scholar_cache_aciertos_total{endpoint="/author/{id}",origen="disco"} 1' in texto
+    assert 'semantic_scholar_espera_limitador_segundos_total 0.5' in texto
+
+    with ExportadorPeriodico(metricas, str(tmp_path / "metricas.json"), intervalo=60) as exportador:
+        metricas.reiniciar()
+    with open(exportador.ruta, encoding='utf-8') as archivo:
+        assert json.load(archivo)['peticiones'] == 0
+    with pytest.raises(ValueError):
+        metricas.guardar(str(tmp_path / "metricas.txt"), 'csv')
@@ -0,0 +1,71 @@
+"""
+Normalización de papers: un paper suelto, una página y el registro compacto dan lo mismo
+"""
+
+import pytest
+
+from semantic_scholar_api import normalizar_articulos, procesar_articulo, procesar_articulo_compacto
+
+COMPLETO = {
+    'paperId': 'abc', 'title': 'Deep residual learning', 'url': 'https://example.org/abc',
+    'authors': [{'authorId': '1', 'name': 'K. He'}, {'authorId': '2', 'name': 'X. Zhang'}],
+    'year': 2016, 'venue': 'CVPR', 'abstract': 'Residual nets', 'citationCount': 1000,
+    'publicationDate': '2016-06-27', 'publicationTypes': ['Conference'], 'fieldsOfStudy': ['Computer Science'],
+    'externalIds': {'DOI': '10.1109/CVPR.2016.90'}, 'openAccessPdf': {'url': 'https://example.org/abc.pdf'},
+}
+
+BORDES = {
+    'completo': COMPLETO,
+    'autores_nulos': dict(COMPLETO, authors=None),
+    'sin_external_ids': {k: v for k, v in COMPLETO.items() if k != 'externalIds'},
+    'open_access_nulo': dict(COMPLETO, openAccessPdf=None),
+    'campos_nulos': dict(COMPLETO, venue=None, year=None, abstract=None, citationCount=None,
+                         publicationDate=None, publicationTypes=None, fieldsOfStudy=None),
+    'autor_sin_nombre': dict(COMPLETO, authors=[{'authorId': '1', 'name': None}, {'authorId': '2'}]),
+    'solo_id': {'paperId': 'xyz'},
+}
+
+
+@pytest.mark.parametrize('paper', BORDES.values(), ids=BORDES.keys())
+def test_paridad_entre_implementaciones(paper):
+    uno = procesar_articulo(paper)
+    (pagina,), errores = normalizar_articulos([paper])
+    (compacto,), _ = normalizar_articulos([paper], compacto=True)
+
+    assert errores == []
+    assert uno is not None
+    assert uno == pagina == dict(compacto) == dict(procesar_articulo_compacto(paper))
+
+
+def test_valores_por_defecto_de_los_bordes():
+    nulos = procesar_articulo(BORDES['campos_nulos'])
+    sin_autores = procesar_articulo(BORDES['autores_nulos'])
+
+    assert sin_autores['autores_info'] == " - CVPR - 2016"
+    assert procesar_articulo(BORDES['autor_sin_nombre'])['autores_info'].startswith(
+        "Autor desconocido, Autor desconocido")
+    assert nulos['citation_count'] == 0 and nulos['citado_por'] == "Sin citaciones"
+    assert (nulos['resumen'], nulos['year'], nulos['venue']) == ('Resumen no disponible', '', '')
+    assert (nulos['publication_types'], nulos['campos_estudio']) == ('', '')
+
+
+def test_campos_no_pedidos_toman_su_valor_por_defecto():
+    (articulo,), _ = normalizar_articulos([COMPLETO], campos=['title', 'year'])
+
+    assert articulo['titulo'] == 'Deep residual learning'
+    assert articulo['autores_info'] == ' - 2016'
+    assert articulo['citation_count'] == 0
+    assert articulo['resumen'] == 'Resumen no disponible'
+    assert articulo['enlace'] == "https://www.semanticscholar.org/paper/abc"
+
+
+def test_pagina_con_nulos_y_papers_mal_formados(capsys):
+    roto = dict(COMPLETO, paperId='roto', authors=5)
+
+    articulos, errores = normalizar_articulos([COMPLETO, None, roto])
+
+    assert articulos[0]['paper_id'] == 'abc' and articulos[1:] == [None, None]
+    assert [(e['indice'], e['paper_id']) for e in errores] == [(2, 'roto')]
+    assert capsys.readouterr().out == ''
+    assert procesar_articulo(roto) is None
+    assert "Error al procesar artículo" in capsys.readouterr().out
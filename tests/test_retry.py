@@ -0,0 +1,100 @@
+"""
+Reintentos y circuit breaker ante 429/503 inyectados por el servidor falso
+"""
+
+import time
+
+import pytest
+
+from semantic_scholar_retry import (CircuitBreaker, CircuitoAbierto, ErrorConexion, ErrorLimiteTasa,
+                                    ErrorServidor, PoliticaReintentos)
+
+ID_PAPER = "0" * 40
+
+
+def test_503_se_reintenta_hasta_agotar_la_politica(servidor, crear_api):
+    servidor.tasa_errores = 1.0
+    api = crear_api(reintentos=PoliticaReintentos(2, espera_base=0.0))
+
+    with pytest.raises(ErrorServidor) as info:
+        api.obtener_articulo_por_id(ID_PAPER)
+
+    assert info.value.intentos == 3
+    assert servidor.errores_inyectados == 3
+
+
+def test_429_reduce_la_tasa_y_acaba_en_error_limite(servidor, crear_api):
+    servidor.tasa_429 = 1.0
+    servidor.retry_after = 0
+    api = crear_api(reintentos=PoliticaReintentos(1, espera_base=0.0))
+    tasa_inicial = api.rate_limiter.tasa
+
+    with pytest.raises(ErrorLimiteTasa):
+        api.obtener_articulo_por_id(ID_PAPER)
+
+    assert servidor.limites_inyectados == 2
+    assert api.rate_limiter.limites_recibidos == 2
+    assert api.rate_limiter.tasa < tasa_inicial
+
+
+def test_fallo_transitorio_se_recupera_con_reintentos(servidor, crear_api):
+    fallos = [503, 429]
+    servidor.fallar = lambda metodo, ruta, params: fallos.pop(0) if fallos else None
+    api = crear_api(reintentos=PoliticaReintentos(3, espera_base=0.0))
+
+    articulo = api.obtener_articulo_por_id(ID_PAPER)
+
+    assert articulo['paper_id'] == ID_PAPER
+    assert api.reintentos_realizados == 2
+    assert api.circuito.estado == 'cerrado'
+
+
+def test_cuerpo_que_no_es_json_es_un_error_de_conexion_reintentable(servidor, crear_api):
+    respuestas = [(200, b'<html>Bad gateway</html>')]
+    servidor.fallar = lambda metodo, ruta, params: respuestas.pop(0) if respuestas else None
+
+    articulo = crear_api(reintentos=PoliticaReintentos(1, espera_base=0.0)).obtener_articulo_por_id(ID_PAPER)
+    assert articulo['paper_id'] == ID_PAPER
+
+    servidor.fallar = lambda metodo, ruta, params: (200, b'{"paperId": ')
+    api = crear_api()
+    with pytest.raises(ErrorConexion):
+        api.obtener_articulo_por_id(ID_PAPER)
+    assert api.circuito.fallos_consecutivos == 1
+
+
+def test_circuito_se_abre_y_se_cierra_tras_la_sonda(servidor, crear_api):
+    servidor.tasa_errores = 1.0
+    api = crear_api(circuito=CircuitBreaker(umbral_fallos=2, tiempo_apertura=0.1))
+
+    for _ in range(2):
+        with pytest.raises(ErrorServidor):
+            api.obtener_articulo_por_id(ID_PAPER)
+    assert api.circuito.estado == 'abierto'
+
+    # Con el circuito abierto la petición ni siquiera llega al servidor
+    peticiones = servidor.peticiones
+    with pytest.raises(CircuitoAbierto):
+        api.obtener_articulo_por_id(ID_PAPER)
+    assert servidor.peticiones == peticiones
+
+    # La sonda falla: vuelve a abrirse
+    time.sleep(0.15)
+    with pytest.raises(ErrorServidor):
+        api.obtener_articulo_por_id(ID_PAPER)
+    assert api.circuito.estado == 'abierto'
+
+    # La siguiente sonda funciona: se cierra
+    servidor.tasa_errores = 0.0
+    time.sleep(0.15)
+    assert api.obtener_articulo_por_id(ID_PAPER) is not None
+    assert api.circuito.estado == 'cerrado'
+
+
+def test_404_no_cuenta_como_fallo_del_circuito(servidor, crear_api):
+    api = crear_api(circuito=CircuitBreaker(umbral_fallos=1, tiempo_apertura=60))
+
+    for _ in range(3):
+        assert api.obtener_articulo_por_id("no-existe") is None
+
+    assert api.circuito.estado == 'cerrado'
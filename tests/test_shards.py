@@ -0,0 +1,44 @@
+"""
+Búsqueda por tramos de años: subdivisión de tramos saturados, fusión sin duplicados y orden
+"""
+
+import pytest
+
+from semantic_scholar_api import MAX_RESULTADOS_RELEVANCIA, FiltrosBusqueda
+from semantic_scholar_shards import BusquedaPorAños
+
+
+def test_supera_la_ventana_de_relevancia_partiendo_tramos(crear_api):
+    busqueda = BusquedaPorAños(crear_api(), "paper", 1990, 2024, años_por_tramo=20, max_workers=4)
+
+    articulos = busqueda.ejecutar()
+
+    assert len(articulos) == len({a['paper_id'] for a in articulos}) == 3000 > MAX_RESULTADOS_RELEVANCIA
+    # 1990-2009 tenía más de 1000 resultados y se partió en dos
+    assert sorted((desde, hasta) for desde, hasta, _ in busqueda.tramos) == [
+        (1990, 1999), (2000, 2009), (2010, 2017), (2018, 2024)]
+    assert all(total <= MAX_RESULTADOS_RELEVANCIA for _, _, total in busqueda.tramos)
+    assert busqueda.tramos_truncados == [] and busqueda.duplicados == 0
+
+
+def test_orden_y_maximo(crear_api):
+    busqueda = BusquedaPorAños(crear_api(), "paper", 2015, 2024, max_workers=4)
+
+    articulos = busqueda.ejecutar('citation_count', 50)
+    antiguos = busqueda.ejecutar('year:asc', 5)
+
+    citas = [a['citation_count'] for a in articulos]
+    assert len(citas) == 50 and citas == sorted(citas, reverse=True)
+    assert [a['year'] for a in antiguos] == [2015] * 5
+    with pytest.raises(ValueError):
+        busqueda.ejecutar('year:lateral')
+
+
+def test_filtros_en_cada_tramo(crear_api):
+    filtros = FiltrosBusqueda(año_desde=1800, min_citas=4000)
+    busqueda = BusquedaPorAños(crear_api(), "paper", 2000, 2024, años_por_tramo=5, filtros=filtros)
+
+    articulos = busqueda.ejecutar()
+
+    assert articulos and all(a['citation_count'] >= 4000 for a in articulos)
+    assert all(2000 <= a['year'] <= 2024 for a in articulos)
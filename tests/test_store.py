@@ -0,0 +1,115 @@
+"""
+Almacén local: upserts, búsqueda FTS5, importación de CSV y migración de esquemas ajenos
+"""
+
+import sqlite3
+
+import pytest
+
+from semantic_scholar_api import guardar_articulos_csv
+from semantic_scholar_sinks import COLUMNAS_ARTICULO, SinkSQLite
+from semantic_scholar_store import AlmacenArticulos, consulta_fts
+
+ARTICULOS = [
+    {'paper_id': 'a', 'titulo': 'Graphene batteries', 'resumen': 'Energy storage with graphene',
+     'year': 2021, 'citation_count': 50, 'venue': 'Nature'},
+    {'paper_id': 'b', 'titulo': 'CRISPR screens', 'resumen': 'Gene editing at scale',
+     'year': 2018, 'citation_count': 300, 'venue': 'Cell'},
+    {'paper_id': 'c', 'titulo': 'Graphene oxide membranes', 'resumen': 'Filtration',
+     'year': '2015', 'citation_count': '7', 'venue': 'Science'},
+]
+
+
+@pytest.fixture
+def almacen(tmp_path):
+    almacen = AlmacenArticulos(str(tmp_path / "corpus.sqlite"), tamaño_lote=2)
+    yield almacen
+    almacen.cerrar()
+
+
+def test_ingerir_es_upsert_y_convierte_enteros(almacen):
+    assert almacen.ingerir(ARTICULOS + [{'titulo': 'sin id'}, None]) == 3
+    almacen.ingerir([dict(ARTICULOS[0], citation_count=51)])
+
+    assert almacen.contar() == 3
+    assert almacen.obtener('a')['citation_count'] == 51
+    assert almacen.obtener('c')['year'] == 2015
+
+
+def test_buscar_texto_completo_y_filtros(almacen):
+    almacen.ingerir(ARTICULOS)
+
+    assert {a['paper_id'] for a in almacen.buscar("graphene")} == {'a', 'c'}
+    assert [a['paper_id'] for a in almacen.buscar("graphene", año_desde=2020)] == ['a']
+    assert [a['paper_id'] for a in almacen.buscar(min_citas=10)] == ['b', 'a']
+    # Los operadores de FTS5 en texto libre no rompen la consulta
+    assert almacen.buscar("gene-editing: scale") == almacen.buscar("gene editing scale")
+    assert consulta_fts("a-b") == '"a" "b"'
+
+
+def test_actualizar_mantiene_el_indice(almacen):
+    almacen.ingerir(ARTICULOS)
+    almacen.ingerir([dict(ARTICULOS[0], titulo='Lithium batteries', resumen='')])
+
+    assert [a['paper_id'] for a in almacen.buscar("graphene")] == ['c']
+    assert [a['paper_id'] for a in almacen.buscar("lithium")] == ['a']
+
+
+def test_importar_csv(almacen, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ruta = guardar_articulos_csv(ARTICULOS, nombre_archivo="corpus.csv")
+
+    assert almacen.importar_csv(ruta) == 3
+    assert almacen.obtener('b')['year'] == 2018
+    assert almacen.buscar("crispr")[0]['paper_id'] == 'b'
+
+
+def test_sink_sqlite_escribe_con_el_esquema_del_almacen(tmp_path):
+    ruta = str(tmp_path / "salida.sqlite")
+    with SinkSQLite(ruta) as sink:
+        sink.escribir_lote(ARTICULOS)
+
+    with AlmacenArticulos(ruta) as almacen:
+        assert almacen.migraciones == []
+        assert {a['paper_id'] for a in almacen.buscar("graphene")} == {'a', 'c'}
+
+
+def test_migra_una_tabla_ajena_sin_arrastrar_sus_triggers(tmp_path):
+    ruta = str(tmp_path / "ajeno.sqlite")
+    conexion = sqlite3.connect(ruta)
+    columnas = ', '.join(f"{col} TEXT" for col in COLUMNAS_ARTICULO[1:])
+    conexion.executescript(f"""
+        CREATE TABLE articulos (paper_id TEXT PRIMARY KEY, {columnas});
+        CREATE INDEX idx_articulos_year ON articulos (year);
+        CREATE TABLE registro (paper_id TEXT);
+        CREATE TRIGGER articulos_ai AFTER INSERT ON articulos BEGIN
+            INSERT INTO registro VALUES (new.paper_id);
+        END;
+    """)
+    conexion.execute("INSERT INTO articulos (paper_id, titulo, year, citation_count) "
+                     "VALUES ('x', 'Quantum walks', '2019', '12')")
+    conexion.commit()
+    conexion.close()
+
+    with AlmacenArticulos(ruta) as almacen:
+        assert almacen.migraciones
+        assert almacen.obtener('x')['year'] == 2019
+        assert [a['paper_id'] for a in almacen.buscar("quantum")] == ['x']
+        almacen.ingerir([{'paper_id': 'y', 'titulo': 'Quantum error correction'}])
+        assert {a['paper_id'] for a in almacen.buscar("quantum")} == {'x', 'y'}
+
+    conexion = sqlite3.connect(ruta)
+    try:
+        # Solo el INSERT previo a la migración pasó por el trigger ajeno
+        assert conexion.execute("SELECT COUNT(*) FROM registro").fetchone()[0] == 1
+        esquema = ' '.join(sql for (sql,) in conexion.execute("SELECT sql FROM sqlite_master WHERE sql IS NOT NULL"))
+        assert 'articulos_antigua' not in esquema
+        indices = {nombre for (nombre,) in conexion.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'articulos'")}
+        assert 'idx_articulos_citas' in indices and 'idx_articulos_year' in indices
+    finally:
+        conexion.close()
+
+    # Abrirlo de nuevo no vuelve a migrar
+    with AlmacenArticulos(ruta) as almacen:
+        assert almacen.migraciones == []
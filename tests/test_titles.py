@@ -0,0 +1,63 @@
+"""
+Resolución de títulos: match exacto, respaldo por búsqueda, umbral, caché y errores
+"""
+
+import pytest
+
+from semantic_scholar_fake_server import paper_id_sintetico
+from semantic_scholar_titles import ResolutorTitulos, normalizar_titulo
+
+
+@pytest.fixture
+def resolutor(crear_api, tmp_path):
+    resolutores = []
+
+    def crear(**kwargs):
+        resolutor = ResolutorTitulos(crear_api(), ruta_cache=str(tmp_path / "titulos.sqlite"), **kwargs)
+        resolutores.append(resolutor)
+        return resolutor
+
+    yield crear
+    for resolutor in resolutores:
+        resolutor.cerrar()
+
+
+def test_normalizar_titulo():
+    assert normalizar_titulo("  Deep  Learning: A Review. ") == normalizar_titulo("deep learning a review")
+
+
+def test_match_y_cache(servidor, resolutor):
+    titulos = resolutor()
+    resultado = titulos.resolver("Synthetic paper number 12 about topic 12")
+    peticiones = servidor.peticiones
+
+    assert resultado['paper_id'] == paper_id_sintetico(12)
+    assert (resultado['metodo'], resultado['confianza']) == ('match', 1.0)
+    assert titulos.resolver("synthetic paper number 12, about topic 12")['paper_id'] == paper_id_sintetico(12)
+    assert servidor.peticiones == peticiones
+
+
+def test_sin_coincidencia_clara_queda_sin_paper_id(resolutor):
+    resultado = resolutor(umbral=0.99).resolver("A title that is not in the corpus at all")
+
+    assert resultado['paper_id'] is None
+    assert resultado['metodo'] == 'sin_resultado'
+
+
+def test_error_de_red_no_se_guarda_en_cache(servidor, resolutor):
+    titulos = resolutor()
+    servidor.fallar = lambda metodo, ruta, params: 503
+
+    assert titulos.resolver("Synthetic paper number 7 about topic 7")['metodo'] == 'error'
+    servidor.fallar = None
+    assert titulos.resolver("Synthetic paper number 7 about topic 7")['paper_id'] == paper_id_sintetico(7)
+
+
+def test_resolver_lote_agrupa_titulos_equivalentes(servidor, resolutor):
+    resultados = resolutor().resolver_lote([
+        "Synthetic paper number 3 about topic 3", "SYNTHETIC PAPER NUMBER 3 ABOUT TOPIC 3", "  ",
+    ])
+
+    assert len(resultados) == 2
+    assert {r['paper_id'] for r in resultados.values()} == {paper_id_sintetico(3)}
+    assert servidor.peticiones == 1